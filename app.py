@@ -4,6 +4,7 @@ from flask_jwt_extended import JWTManager
 from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 import os
+import multiprocessing
 from datetime import timedelta, datetime
 from dotenv import load_dotenv
 
@@ -33,6 +34,85 @@ def create_app():
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'fallback-jwt-secret-key')
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
     
+    # List endpoints: hard cap on per_page (keyset ?after= cursors keep deep pages cheap)
+    app.config['MAX_PAGE_SIZE'] = int(os.getenv('MAX_PAGE_SIZE', '100'))
+    
+    # Password hashing - one algorithm/cost for every stored hash, bounded worker pool
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'bcrypt')
+    app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', '12'))
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', '2'))
+    app.config['PASSWORD_HASH_MAX_QUEUE'] = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '16'))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_TIMEOUT', '10'))
+    
+    # Login rate limiting - limits live in SystemSetting (auth.login_*), buckets in memory or redis://
+    app.config['RATE_LIMIT_BACKEND_URL'] = os.getenv('RATE_LIMIT_BACKEND_URL', '')
+    app.config['RATE_LIMIT_MAX_KEYS'] = int(os.getenv('RATE_LIMIT_MAX_KEYS', '10000'))
+    # Reverse proxies in front of the app; X-Forwarded-For is ignored unless this is > 0
+    app.config['TRUSTED_PROXY_COUNT'] = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+    
+    # JWT revocation (logout) - in-process store, optionally shared through redis://
+    app.config['TOKEN_REVOCATION_BACKEND_URL'] = os.getenv('TOKEN_REVOCATION_BACKEND_URL', '')
+    app.config['TOKEN_REVOCATION_CAPACITY'] = int(os.getenv('TOKEN_REVOCATION_CAPACITY', '100000'))
+    app.config['TOKEN_REVOCATION_SYNC_SECONDS'] = float(os.getenv('TOKEN_REVOCATION_SYNC_SECONDS', '5'))
+    
+    # Outbound email/SMS - queued and delivered by background workers ('local' = record only)
+    app.config['DELIVERY_TRANSPORT'] = os.getenv('DELIVERY_TRANSPORT', 'auto')
+    app.config['DELIVERY_EMAIL_WORKERS'] = int(os.getenv('DELIVERY_EMAIL_WORKERS', '2'))
+    app.config['DELIVERY_SMS_WORKERS'] = int(os.getenv('DELIVERY_SMS_WORKERS', '1'))
+    app.config['DELIVERY_MAX_QUEUE'] = int(os.getenv('DELIVERY_MAX_QUEUE', '1000'))
+    app.config['BULK_EMAIL_CONCURRENCY'] = int(os.getenv('BULK_EMAIL_CONCURRENCY', '4'))
+    app.config['BULK_EMAIL_MAX_RETRIES'] = int(os.getenv('BULK_EMAIL_MAX_RETRIES', '3'))
+    app.config['BULK_EMAIL_RETRY_BACKOFF'] = float(os.getenv('BULK_EMAIL_RETRY_BACKOFF', '1.0'))
+    
+    # Notification push (SSE / long-poll) - bridged across workers with Postgres LISTEN/NOTIFY
+    app.config['NOTIFICATION_BUS_BRIDGE'] = os.getenv('NOTIFICATION_BUS_BRIDGE', 'true').lower() == 'true'
+    app.config['NOTIFICATION_STREAM_HEARTBEAT_SECONDS'] = int(os.getenv('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', '15'))
+    app.config['NOTIFICATION_STREAM_MAX_SECONDS'] = int(os.getenv('NOTIFICATION_STREAM_MAX_SECONDS', '300'))
+    
+    # Admin dashboard counters
+    app.config['DASHBOARD_CACHE_SECONDS'] = int(os.getenv('DASHBOARD_CACHE_SECONDS', '30'))
+    app.config['DASHBOARD_APPROXIMATE_COUNTS'] = os.getenv('DASHBOARD_APPROXIMATE_COUNTS', 'false').lower() == 'true'
+    app.config['DASHBOARD_READ_MODELS'] = os.getenv('DASHBOARD_READ_MODELS', 'true').lower() == 'true'
+    app.config['DASHBOARD_REFRESH_DEBOUNCE_SECONDS'] = int(os.getenv('DASHBOARD_REFRESH_DEBOUNCE_SECONDS', '5'))
+    app.config['DASHBOARD_REFRESH_MAX_DELAY_SECONDS'] = int(os.getenv('DASHBOARD_REFRESH_MAX_DELAY_SECONDS', '60'))
+    app.config['DASHBOARD_REFRESH_INTERVAL_MINUTES'] = int(os.getenv('DASHBOARD_REFRESH_INTERVAL_MINUTES', '30'))
+    
+    # Conditional GET (ETag / 304) for read-mostly reference data
+    app.config['HTTP_CACHE_ENABLED'] = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+    app.config['HTTP_CACHE_PUBLIC_MAX_AGE'] = int(os.getenv('HTTP_CACHE_PUBLIC_MAX_AGE', '300'))
+    
+    # SystemSetting cache - other workers' writes are noticed within this many seconds
+    app.config['SETTINGS_CACHE_CHECK_SECONDS'] = int(os.getenv('SETTINGS_CACHE_CHECK_SECONDS', '5'))
+    
+    # Reference data (departments, courses, semesters, ...) cache - cross-worker staleness bound
+    app.config['REFERENCE_CACHE_CHECK_SECONDS'] = int(os.getenv('REFERENCE_CACHE_CHECK_SECONDS', '5'))
+    
+    # Optional in-memory per-department student typeahead (GET /api/students/search)
+    app.config['STUDENT_SEARCH_INDEX_ENABLED'] = os.getenv('STUDENT_SEARCH_INDEX_ENABLED', 'false').lower() == 'true'
+    app.config['STUDENT_SEARCH_INDEX_CHECK_SECONDS'] = int(os.getenv('STUDENT_SEARCH_INDEX_CHECK_SECONDS', '30'))
+    app.config['STUDENT_SEARCH_INDEX_MAX_AGE_SECONDS'] = int(os.getenv('STUDENT_SEARCH_INDEX_MAX_AGE_SECONDS', '300'))
+    
+    # CSV roster imports are merged and committed every this many rows
+    app.config['ROSTER_IMPORT_CHUNK_SIZE'] = int(os.getenv('ROSTER_IMPORT_CHUNK_SIZE', '1000'))
+    
+    # Admin bulk provisioning (POST /api/users/bulk-provision); 0 processes = one per core.
+    # Hashing runs inside the request: about max users x 0.3 s (bcrypt cost 12) / cores,
+    # so the default 500 takes roughly 40 s on 4 cores.
+    app.config['BULK_PROVISION_MAX_USERS'] = int(os.getenv('BULK_PROVISION_MAX_USERS', '500'))
+    app.config['BULK_PROVISION_HASH_PROCESSES'] = int(os.getenv('BULK_PROVISION_HASH_PROCESSES', '0'))
+    
+    # 'orjson' (falls back to Flask's provider when orjson is not installed) or 'default'
+    app.config['JSON_PROVIDER'] = os.getenv('JSON_PROVIDER', 'orjson')
+    
+    # Background maintenance jobs
+    app.config['SCHEDULER_ENABLED'] = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+    app.config['MAINTENANCE_INTERVAL_MINUTES'] = int(os.getenv('MAINTENANCE_INTERVAL_MINUTES', '60'))
+    app.config['PURGE_BATCH_SIZE'] = int(os.getenv('PURGE_BATCH_SIZE', '1000'))
+    app.config['VERIFICATION_CODE_RETENTION_HOURS'] = int(os.getenv('VERIFICATION_CODE_RETENTION_HOURS', '24'))
+    app.config['NOTIFICATION_COUNTER_RECONCILE_MINUTES'] = int(os.getenv('NOTIFICATION_COUNTER_RECONCILE_MINUTES', '15'))
+    app.config['AUTO_END_INTERVAL_MINUTES'] = int(os.getenv('AUTO_END_INTERVAL_MINUTES', '1'))
+    app.config['ACTIVE_SESSION_RECONCILE_MINUTES'] = int(os.getenv('ACTIVE_SESSION_RECONCILE_MINUTES', '5'))
+    
     # Debug: Print configuration info
     print(f"🔧 SECRET_KEY: {'✅ Set' if os.getenv('SECRET_KEY') else '❌ Using fallback'}")
     print(f"🔧 JWT_SECRET_KEY: {'✅ Set' if os.getenv('JWT_SECRET_KEY') else '❌ Using fallback'}")
@@ -44,6 +124,49 @@ def create_app():
         jwt.init_app(app)
         bcrypt.init_app(app)
         CORS(app)
+        
+        if app.config['TRUSTED_PROXY_COUNT'] > 0:
+            # Only the hops appended by our own proxies are trusted for request.remote_addr
+            from werkzeug.middleware.proxy_fix import ProxyFix
+            app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_COUNT'])
+        
+        from utils.serialization import init_json_provider
+        init_json_provider(app)
+        
+        from utils.password_hasher import password_hasher
+        password_hasher.init_app(app)
+        
+        from utils.rate_limiter import login_rate_limiter
+        login_rate_limiter.init_app(app)
+        
+        from utils.token_revocation import token_revocation_store
+        token_revocation_store.init_app(app, jwt)
+        
+        from utils.delivery_queue import delivery_queue
+        delivery_queue.init_app(app)
+        
+        from utils.bulk_mailer import bulk_mailer
+        bulk_mailer.init_app(app)
+        
+        from utils.notification_bus import notification_bus
+        notification_bus.init_app(app, db)
+        
+        from utils.dashboard_stats import dashboard_stats
+        dashboard_stats.init_app(app)
+        
+        from utils import read_models
+        read_models.init_app(app)
+        
+        from utils.settings_cache import settings_cache
+        settings_cache.init_app(app)
+        
+        from utils.reference_cache import reference_cache
+        reference_cache.init_app(app)
+        
+        from utils.search_index import student_directory
+        student_directory.init_app(app)
+        
+        import utils.http_cache  # registers the session hooks that version tracked tables
         print("✅ Flask extensions initialized successfully")
     except Exception as e:
         print(f"❌ Error initializing Flask extensions: {e}")
@@ -72,6 +195,11 @@ def create_app():
             from models.two_factor_auth import TwoFactorAuth
             from models.audit_log import AuditLog
             from models.verification_code import VerificationCode  # New model
+            from models.broadcast_notification import BroadcastNotification
+            from models.broadcast_receipt import BroadcastReceipt
+            from models.notification_counter import NotificationCounter
+            from models.table_version import TableVersion
+            from models.roster_import import RosterImport
             print("✅ Models imported successfully")
             
             # Try to create tables
@@ -103,6 +231,7 @@ def create_app():
         from routes.dashboard import dashboard_bp
         from routes.reports import reports_bp
         from routes.ub_setup import ub_setup_bp
+        from routes.roster_imports import roster_imports_bp
         
         # Register all blueprints with /api prefix
         app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -124,11 +253,19 @@ def create_app():
         app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
         app.register_blueprint(reports_bp, url_prefix='/api/reports')
         app.register_blueprint(ub_setup_bp, url_prefix='/api/ub-setup')
+        app.register_blueprint(roster_imports_bp, url_prefix='/api/roster-imports')
         print("✅ All routes registered successfully")
         
     except Exception as e:
         print(f"❌ Error registering routes: {e}")
     
+    # Start periodic maintenance jobs
+    try:
+        from utils.scheduler import init_scheduler
+        init_scheduler(app)
+    except Exception as e:
+        print(f"⚠️  Scheduler warning: {e}")
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -155,6 +292,27 @@ def create_app():
             }
         }
         
+        # Outbound delivery queue depth and throughput per channel
+        try:
+            from utils.delivery_queue import delivery_queue
+            health_info['delivery'] = delivery_queue.get_metrics()
+        except Exception as e:
+            health_info['delivery'] = f'error: {str(e)}'
+        
+        # Reference data cache hit/miss counters
+        try:
+            from utils.reference_cache import reference_cache
+            health_info['reference_cache'] = reference_cache.get_stats()
+        except Exception as e:
+            health_info['reference_cache'] = f'error: {str(e)}'
+        
+        try:
+            from utils.search_index import course_code_index, student_directory
+            health_info['course_code_index'] = course_code_index.get_stats()
+            health_info['student_directory'] = student_directory.get_stats()
+        except Exception as e:
+            health_info['course_code_index'] = f'error: {str(e)}'
+        
         # Test database connection
         try:
             from sqlalchemy import text
@@ -214,8 +372,10 @@ def create_app():
     print("🚀 Flask app created successfully!")
     return app
 
-# Create the app instance
-app = create_app()
+# Create the app instance. Skipped in multiprocessing workers (bulk password
+# hashing), which re-import the entry module but never need the app.
+if multiprocessing.current_process().name == 'MainProcess':
+    app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True)
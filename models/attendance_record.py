@@ -38,9 +38,9 @@ class AttendanceRecord(db.Model):
             'check_in_time': self.check_in_time.isoformat() if self.check_in_time else None,
             'attendance_status': self.attendance_status,
             'check_in_method': self.check_in_method,
-            'face_match_confidence': float(self.face_match_confidence) if self.face_match_confidence else None,
-            'location_latitude': float(self.location_latitude) if self.location_latitude else None,
-            'location_longitude': float(self.location_longitude) if self.location_longitude else None,
+            'face_match_confidence': float(self.face_match_confidence) if self.face_match_confidence is not None else None,
+            'location_latitude': float(self.location_latitude) if self.location_latitude is not None else None,
+            'location_longitude': float(self.location_longitude) if self.location_longitude is not None else None,
             'device_info': self.device_info,
             'is_verified': self.is_verified,
             'verified_by': str(self.verified_by) if self.verified_by else None,
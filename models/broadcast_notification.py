@@ -0,0 +1,62 @@
+from app import db
+from models import notification_type_enum
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+class BroadcastNotification(db.Model):
+    """
+    One row per broadcast, read by every matching user (fan-out on read).
+    Per-user read/dismiss state lives in BroadcastReceipt, only for users who acted.
+    """
+    __tablename__ = 'broadcast_notifications'
+    
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sender_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'))
+    target_user_type = db.Column(db.String(20), nullable=False, default='all')  # 'all' or a user_type
+    notification_type = db.Column(notification_type_enum, nullable=False)
+    title = db.Column(db.String(255), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    data = db.Column(JSONB)
+    expires_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    receipts = db.relationship('BroadcastReceipt', backref='broadcast', cascade='all, delete-orphan', passive_deletes=True)
+    
+    __table_args__ = (
+        db.Index('idx_broadcast_notifications_target_created', 'target_user_type', 'created_at'),
+    )
+    
+    @staticmethod
+    def visible_to(user, now=None):
+        """Filter for broadcasts a user should see: their audience, sent since they joined, not expired"""
+        now = now or datetime.utcnow()
+        condition = db.and_(
+            BroadcastNotification.target_user_type.in_(['all', user.user_type]),
+            db.or_(
+                BroadcastNotification.expires_at.is_(None),
+                BroadcastNotification.expires_at > now
+            )
+        )
+        if user.created_at:
+            condition = db.and_(condition, BroadcastNotification.created_at >= user.created_at)
+        return condition
+    
+    def to_dict(self, recipient_id=None, receipt=None):
+        return {
+            'id': str(self.id),
+            'recipient_id': str(recipient_id) if recipient_id else None,
+            'sender_id': str(self.sender_id) if self.sender_id else None,
+            'notification_type': self.notification_type,
+            'title': self.title,
+            'message': self.message,
+            'data': self.data,
+            'is_read': receipt is not None,
+            'is_sent': True,
+            'sent_at': self.created_at.isoformat() if self.created_at else None,
+            'read_at': receipt.read_at.isoformat() if receipt and receipt.read_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'target_user_type': self.target_user_type,
+            'is_broadcast': True
+        }
@@ -0,0 +1,27 @@
+from app import db
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID
+
+class BroadcastReceipt(db.Model):
+    """
+    Sparse per-user state for a broadcast: a row exists only once the user has
+    read (or dismissed, which implies read) it. No row means unread.
+    """
+    __tablename__ = 'broadcast_receipts'
+    
+    broadcast_id = db.Column(UUID(as_uuid=True), db.ForeignKey('broadcast_notifications.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    read_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    dismissed_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('idx_broadcast_receipts_user', 'user_id'),
+    )
+    
+    def to_dict(self):
+        return {
+            'broadcast_id': str(self.broadcast_id),
+            'user_id': str(self.user_id),
+            'read_at': self.read_at.isoformat() if self.read_at else None,
+            'dismissed_at': self.dismissed_at.isoformat() if self.dismissed_at else None
+        }
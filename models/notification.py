@@ -1,6 +1,7 @@
 from app import db
 from models import notification_type_enum
 from datetime import datetime
+from sqlalchemy import select, insert, literal, cast, func
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 
@@ -36,4 +37,47 @@ class Notification(db.Model):
             'read_at': self.read_at.isoformat() if self.read_at else None,
             'expires_at': self.expires_at.isoformat() if self.expires_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def fan_out(user_filter, sender_id, notification_type, title, message, data=None, expires_at=None):
+        """
+        Create one notification per user matching `user_filter` in a single
+        INSERT ... SELECT, so no User or Notification objects are loaded.
+        Returns the number of rows inserted (caller commits).
+        """
+        from models.user import User
+        
+        created_at = datetime.utcnow()
+        columns = ['recipient_id', 'sender_id', 'notification_type', 'title', 'message',
+                   'data', 'is_read', 'is_sent', 'expires_at', 'created_at']
+        # Explicit casts: Postgres would otherwise type the SELECT list as text
+        values = [
+            cast(literal(sender_id), UUID(as_uuid=True)),
+            cast(literal(notification_type), notification_type_enum),
+            cast(literal(title), db.String(255)),
+            cast(literal(message), db.Text),
+            cast(literal(data, JSONB), JSONB),
+            literal(False),
+            literal(False),
+            cast(literal(expires_at), db.DateTime),
+            cast(literal(created_at), db.DateTime)
+        ]
+        
+        if db.engine.dialect.name == 'postgresql':
+            stmt = insert(Notification.__table__).from_select(
+                ['id'] + columns,
+                select(func.gen_random_uuid(), User.id, *values).where(user_filter)
+            )
+            return db.session.execute(stmt).rowcount
+        
+        # Databases without server-side UUIDs: ids only, inserted as one executemany
+        recipient_ids = db.session.execute(select(User.id).where(user_filter)).scalars().all()
+        if recipient_ids:
+            db.session.execute(insert(Notification.__table__), [{
+                'id': uuid.uuid4(), 'recipient_id': recipient_id, 'sender_id': sender_id,
+                'notification_type': notification_type, 'title': title, 'message': message,
+                'data': data, 'is_read': False, 'is_sent': False,
+                'expires_at': expires_at, 'created_at': created_at
+            } for recipient_id in recipient_ids])
+        return len(recipient_ids)
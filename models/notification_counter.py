@@ -0,0 +1,102 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import select, update, func, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import UUID
+
+class NotificationCounter(db.Model):
+    """
+    Per-user count of unread direct notifications, kept in step with writes so
+    the badge never needs a COUNT(*). Rows are created lazily on first read;
+    until then increments are no-ops and the first read seeds the true count.
+    A scheduled reconcile() corrects any drift (e.g. notifications expiring).
+    """
+    __tablename__ = 'notification_counters'
+    
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    unread_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    @staticmethod
+    def _unread_direct(user_id, now=None):
+        from models.notification import Notification
+        now = now or datetime.utcnow()
+        return select(func.count(Notification.id)).where(
+            Notification.recipient_id == user_id,
+            Notification.is_read == False,
+            db.or_(Notification.expires_at.is_(None), Notification.expires_at > now)
+        )
+    
+    @staticmethod
+    def _shifted(delta):
+        """unread_count + delta, floored at zero"""
+        shifted = NotificationCounter.unread_count + delta
+        return case((shifted < 0, 0), else_=shifted)
+    
+    @staticmethod
+    def adjust(user_id, delta):
+        """Add delta to one user's counter (caller commits)"""
+        db.session.execute(
+            update(NotificationCounter.__table__)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=NotificationCounter._shifted(delta),
+                    updated_at=datetime.utcnow())
+        )
+    
+    @staticmethod
+    def adjust_where(user_filter, delta):
+        """Add delta to the counters of every user matching a User filter, in one UPDATE"""
+        from models.user import User
+        db.session.execute(
+            update(NotificationCounter.__table__)
+            .where(NotificationCounter.user_id.in_(select(User.id).where(user_filter)))
+            .values(unread_count=NotificationCounter._shifted(delta),
+                    updated_at=datetime.utcnow())
+        )
+    
+    @staticmethod
+    def reset(user_id):
+        db.session.execute(
+            update(NotificationCounter.__table__)
+            .where(NotificationCounter.user_id == user_id)
+            .values(unread_count=0, updated_at=datetime.utcnow())
+        )
+    
+    @staticmethod
+    def get_unread(user_id):
+        """Counter value, seeding the row from the notifications table on first use"""
+        count = db.session.execute(
+            select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+        ).scalar()
+        if count is not None:
+            return count
+        
+        count = db.session.execute(NotificationCounter._unread_direct(user_id)).scalar()
+        try:
+            db.session.add(NotificationCounter(user_id=user_id, unread_count=count))
+            db.session.commit()
+        except IntegrityError:
+            # Seeded concurrently by another request
+            db.session.rollback()
+        return count
+    
+    @staticmethod
+    def reconcile():
+        """Reset every counter that disagrees with the notifications table; returns rows fixed"""
+        from models.notification import Notification
+        now = datetime.utcnow()
+        actual = select(func.count(Notification.id)).where(
+            Notification.recipient_id == NotificationCounter.user_id,
+            Notification.is_read == False,
+            db.or_(Notification.expires_at.is_(None), Notification.expires_at > now)
+        ).scalar_subquery()
+        
+        fixed = db.session.execute(
+            update(NotificationCounter.__table__)
+            .where(NotificationCounter.unread_count != actual)
+            .values(unread_count=actual, updated_at=now)
+        ).rowcount
+        db.session.commit()
+        if fixed:
+            print(f"🔢 Reconciled {fixed} notification counters")
+        return fixed
@@ -0,0 +1,50 @@
+from app import db
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+class RosterImport(db.Model):
+    """
+    One CSV roster upload. Counters are committed with every merged chunk, so
+    GET /api/roster-imports/<id> shows progress while the upload is running.
+    """
+    __tablename__ = 'roster_imports'
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = db.Column(db.String(20), nullable=False, default='running')  # running, completed, failed
+    filename = db.Column(db.String(255))
+    semester_id = db.Column(UUID(as_uuid=True), db.ForeignKey('semesters.id'))
+    created_by = db.Column(UUID(as_uuid=True), db.ForeignKey('users.id'))
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    rows_failed = db.Column(db.Integer, nullable=False, default=0)
+    users_created = db.Column(db.Integer, nullable=False, default=0)
+    students_created = db.Column(db.Integer, nullable=False, default=0)
+    students_existing = db.Column(db.Integer, nullable=False, default=0)
+    enrollments_created = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(JSONB)  # first MAX_STORED_ERRORS row errors; rows_failed counts them all
+    error_message = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    finished_at = db.Column(db.DateTime)
+
+    MAX_STORED_ERRORS = 500
+
+    def to_dict(self, include_errors=False):
+        data = {
+            'id': str(self.id),
+            'status': self.status,
+            'filename': self.filename,
+            'semester_id': str(self.semester_id) if self.semester_id else None,
+            'created_by': str(self.created_by) if self.created_by else None,
+            'rows_processed': self.rows_processed,
+            'rows_failed': self.rows_failed,
+            'users_created': self.users_created,
+            'students_created': self.students_created,
+            'students_existing': self.students_existing,
+            'enrollments_created': self.enrollments_created,
+            'error_message': self.error_message,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+        if include_errors:
+            data['errors'] = self.errors or []
+        return data
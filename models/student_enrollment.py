@@ -23,6 +23,39 @@ class StudentEnrollment(db.Model):
         db.UniqueConstraint('student_id', 'course_id', 'semester_id', name='unique_enrollment'),
     )
     
+    @staticmethod
+    def insert_missing(student_ids, course_id, semester_id, enrolled_by=None, batch_size=1000):
+        """
+        Enroll many students in one course/semester with INSERT ... ON CONFLICT
+        (student_id, course_id, semester_id) DO NOTHING RETURNING student_id.
+        Returns the set of student ids that were actually inserted; ids that
+        were already enrolled are skipped by the database, not by a lookup.
+        """
+        table = StudentEnrollment.__table__
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.utcnow()
+        student_ids = list(student_ids)
+        inserted = set()
+        # Batches keep each statement under the driver's bind-parameter limit
+        for start in range(0, len(student_ids), batch_size):
+            values = [{
+                'id': uuid.uuid4(),
+                'student_id': student_id,
+                'course_id': course_id,
+                'semester_id': semester_id,
+                'enrollment_date': now,
+                'enrollment_status': 'enrolled',
+                'enrolled_by': enrolled_by
+            } for student_id in student_ids[start:start + batch_size]]
+            statement = insert(table).values(values).on_conflict_do_nothing(
+                index_elements=[table.c.student_id, table.c.course_id, table.c.semester_id]
+            ).returning(table.c.student_id)
+            inserted.update(db.session.execute(statement).scalars())
+        return inserted
+    
     def to_dict(self):
         return {
             'id': str(self.id),
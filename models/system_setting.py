@@ -16,6 +16,38 @@ class SystemSetting(db.Model):
     updated_by = db.Column(UUID(as_uuid=True), db.ForeignKey('admins.id'))
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @staticmethod
+    def upsert(rows, update_columns=('setting_value', 'updated_by', 'updated_at')):
+        """
+        Insert or update many settings in one INSERT ... ON CONFLICT (setting_key).
+        Existing rows only get `update_columns` overwritten; type, description
+        and visibility of existing settings are left alone.
+        """
+        if not rows:
+            return
+        table = SystemSetting.__table__
+        now = datetime.utcnow()
+        values = [{
+            'id': uuid.uuid4(),
+            'setting_key': row['setting_key'],
+            'setting_value': row['setting_value'],
+            'setting_type': row.get('setting_type', 'string'),
+            'description': row.get('description'),
+            'is_public': row.get('is_public', False),
+            'updated_by': row.get('updated_by'),
+            'updated_at': now
+        } for row in rows]
+        if db.engine.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(table).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.setting_key],
+            set_={column: statement.excluded[column] for column in update_columns}
+        )
+        db.session.execute(statement)
+    
     def to_dict(self):
         return {
             'id': str(self.id),
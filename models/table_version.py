@@ -0,0 +1,41 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import select
+
+class TableVersion(db.Model):
+    """
+    Monotonic data version per table, bumped in the same transaction as every
+    write to a tracked table (see utils/http_cache.py). Shared by all worker
+    processes, so an ETag built from it is valid whichever worker answers.
+    """
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @staticmethod
+    def bump(connection, table_names):
+        """Increment (creating if needed) the version of each table, on the caller's connection"""
+        table = TableVersion.__table__
+        rows = [{'table_name': name, 'version': 1, 'updated_at': datetime.utcnow()} for name in sorted(table_names)]
+        if connection.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.table_name],
+            set_={'version': table.c.version + 1, 'updated_at': statement.excluded.updated_at}
+        )
+        connection.execute(statement)
+
+    @staticmethod
+    def get_versions(table_names):
+        """{table_name: version} for the given tables; tables never written report 0"""
+        rows = db.session.execute(
+            select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(table_names))
+        ).all()
+        versions = dict.fromkeys(table_names, 0)
+        versions.update({name: version for name, version in rows})
+        return versions
@@ -99,17 +99,10 @@ class UserSession(db.Model):
     
     @staticmethod
     def cleanup_expired_sessions():
-        """Remove expired sessions"""
+        """Remove expired sessions (batched set-based DELETE)"""
+        from utils.maintenance import purge_expired_sessions
         try:
-            expired_sessions = UserSession.query.filter(
-                UserSession.expires_at < datetime.utcnow()
-            ).all()
-            
-            for session in expired_sessions:
-                db.session.delete(session)
-            
-            db.session.commit()
-            return len(expired_sessions)
+            return purge_expired_sessions()
         except Exception as e:
             db.session.rollback()
             print(f"Error cleaning up expired sessions: {e}")
@@ -4,12 +4,15 @@ from app import db
 from models.academic_year import AcademicYear
 from utils.decorators import admin_required
 from utils.validators import validate_required_fields, ValidationError
+from utils.http_cache import conditional_get
+from utils.reference_cache import reference_cache
 from datetime import datetime
 
 academic_years_bp = Blueprint('academic_years', __name__)
 
 @academic_years_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get('academic_years')
 def get_all_academic_years():
     try:
         years = AcademicYear.query.order_by(AcademicYear.start_date.desc()).all()
@@ -23,9 +26,10 @@ def get_all_academic_years():
 
 @academic_years_bp.route('/current', methods=['GET'])
 @jwt_required()
+@conditional_get('academic_years')
 def get_current_academic_year():
     try:
-        current_year = AcademicYear.query.filter_by(is_current=True).first()
+        current_year = reference_cache.current_academic_year()
         
         if not current_year:
             return jsonify({'error': 'No current academic year set'}), 404
@@ -37,6 +41,7 @@ def get_current_academic_year():
 
 @academic_years_bp.route('/<year_id>', methods=['GET'])
 @jwt_required()
+@conditional_get('academic_years')
 def get_academic_year(year_id):
     try:
         year = AcademicYear.query.get(year_id)
@@ -85,6 +90,7 @@ def create_academic_year():
         
         db.session.add(academic_year)
         db.session.commit()
+        reference_cache.invalidate('academic_years')
         
         return jsonify({
             'message': 'Academic year created successfully',
@@ -140,6 +146,7 @@ def update_academic_year(year_id):
             academic_year.is_current = data['is_current']
         
         db.session.commit()
+        reference_cache.invalidate('academic_years')
         
         return jsonify({
             'message': 'Academic year updated successfully',
@@ -169,6 +176,7 @@ def delete_academic_year(year_id):
         
         db.session.delete(academic_year)
         db.session.commit()
+        reference_cache.invalidate('academic_years')
         
         return jsonify({'message': 'Academic year deleted successfully'}), 200
         
@@ -192,6 +200,7 @@ def set_current_academic_year(year_id):
         academic_year.is_current = True
         
         db.session.commit()
+        reference_cache.invalidate('academic_years')
         
         return jsonify({
             'message': 'Academic year set as current successfully',
@@ -5,6 +5,7 @@ from models.admin import Admin
 from models.user import User
 from utils.decorators import admin_required, get_current_user
 from utils.validators import validate_required_fields, validate_phone_number, ValidationError
+from utils.pagination import paginate, CursorError
 
 admins_bp = Blueprint('admins', __name__)
 
@@ -12,8 +13,6 @@ admins_bp = Blueprint('admins', __name__)
 @admin_required
 def get_all_admins():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         search = request.args.get('search')
         
         query = Admin.query.join(User).filter(User.is_active == True)
@@ -27,22 +26,15 @@ def get_all_admins():
                 )
             )
         
-        admins = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        admins, pagination = paginate(query, Admin.created_at, Admin.id)
         
         return jsonify({
-            'admins': [admin.to_dict() for admin in admins.items],
-            'pagination': {
-                'page': admins.page,
-                'pages': admins.pages,
-                'per_page': admins.per_page,
-                'total': admins.total,
-                'has_next': admins.has_next,
-                'has_prev': admins.has_prev
-            }
+            'admins': [admin.to_dict() for admin in admins],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
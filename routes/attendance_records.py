@@ -7,6 +7,8 @@ from models.student import Student
 from models.lecturer import Lecturer
 from utils.decorators import student_required, lecturer_required, get_current_user
 from utils.validators import validate_required_fields, validate_coordinates, ValidationError
+from utils.pagination import paginate, CursorError
+from utils.serialization import model_serializer
 from datetime import datetime
 
 attendance_records_bp = Blueprint('attendance_records', __name__)
@@ -16,8 +18,6 @@ attendance_records_bp = Blueprint('attendance_records', __name__)
 def get_all_attendance_records():
     try:
         current_user = get_current_user()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         session_id = request.args.get('session_id')
         student_id = request.args.get('student_id')
         status = request.args.get('status')
@@ -39,22 +39,15 @@ def get_all_attendance_records():
         if status:
             query = query.filter(AttendanceRecord.attendance_status == status)
         
-        records = query.order_by(AttendanceRecord.check_in_time.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        records, pagination = paginate(query, AttendanceRecord.check_in_time, AttendanceRecord.id)
         
         return jsonify({
-            'attendance_records': [record.to_dict() for record in records.items],
-            'pagination': {
-                'page': records.page,
-                'pages': records.pages,
-                'per_page': records.per_page,
-                'total': records.total,
-                'has_next': records.has_next,
-                'has_prev': records.has_prev
-            }
+            'attendance_records': [record.to_dict() for record in records],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -241,12 +234,14 @@ def get_session_attendance_records(session_id):
             if lecturer_profile and session.started_by != lecturer_profile.id:
                 return jsonify({'error': 'Access denied'}), 403
         
-        records = AttendanceRecord.query.filter_by(
-            session_id=session_id
-        ).order_by(AttendanceRecord.check_in_time).all()
+        # Whole-session listings can be large: serialize column tuples instead of ORM rows
+        serializer = model_serializer(AttendanceRecord)
+        records = serializer.all(serializer.select().where(
+            AttendanceRecord.session_id == session.id
+        ).order_by(AttendanceRecord.check_in_time))
         
         return jsonify({
-            'attendance_records': [record.to_dict() for record in records],
+            'attendance_records': records,
             'session': session.to_dict()
         }), 200
         
@@ -265,8 +260,6 @@ def get_student_attendance_history(student_id):
             if student_profile and str(student_profile.id) != student_id:
                 return jsonify({'error': 'Access denied'}), 403
         
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         course_id = request.args.get('course_id')
         
         query = AttendanceRecord.query.filter_by(student_id=student_id)
@@ -277,22 +270,15 @@ def get_student_attendance_history(student_id):
                 CourseAssignment.course_id == course_id
             )
         
-        records = query.order_by(AttendanceRecord.check_in_time.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        records, pagination = paginate(query, AttendanceRecord.check_in_time, AttendanceRecord.id)
         
         return jsonify({
-            'attendance_history': [record.to_dict() for record in records.items],
-            'pagination': {
-                'page': records.page,
-                'pages': records.pages,
-                'per_page': records.per_page,
-                'total': records.total,
-                'has_next': records.has_next,
-                'has_prev': records.has_prev
-            }
+            'attendance_history': [record.to_dict() for record in records],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -3,11 +3,14 @@ from flask_jwt_extended import jwt_required
 from app import db
 from models.attendance_session import AttendanceSession
 from models.course_assignment import CourseAssignment
-from models.geofence_area import GeofenceArea
 from models.lecturer import Lecturer
 from models.student_enrollment import StudentEnrollment
 from utils.decorators import lecturer_required, get_current_user
 from utils.validators import validate_required_fields, ValidationError
+from utils.pagination import paginate, CursorError
+from utils.dashboard_stats import dashboard_stats
+from utils.reference_cache import reference_cache
+from utils import read_models
 from datetime import datetime, timedelta
 
 attendance_sessions_bp = Blueprint('attendance_sessions', __name__)
@@ -17,8 +20,6 @@ attendance_sessions_bp = Blueprint('attendance_sessions', __name__)
 def get_all_attendance_sessions():
     try:
         current_user = get_current_user()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         course_assignment_id = request.args.get('course_assignment_id')
         status = request.args.get('status')
         
@@ -36,22 +37,15 @@ def get_all_attendance_sessions():
         if status:
             query = query.filter(AttendanceSession.session_status == status)
         
-        sessions = query.order_by(AttendanceSession.started_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        sessions, pagination = paginate(query, AttendanceSession.started_at, AttendanceSession.id)
         
         return jsonify({
-            'attendance_sessions': [session.to_dict() for session in sessions.items],
-            'pagination': {
-                'page': sessions.page,
-                'pages': sessions.pages,
-                'per_page': sessions.per_page,
-                'total': sessions.total,
-                'has_next': sessions.has_next,
-                'has_prev': sessions.has_prev
-            }
+            'attendance_sessions': [session.to_dict() for session in sessions],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -101,7 +95,7 @@ def create_attendance_session():
             return jsonify({'error': 'Access denied. You are not assigned to this course'}), 403
         
         # Check if geofence area exists
-        geofence_area = GeofenceArea.query.get(data['geofence_area_id'])
+        geofence_area = reference_cache.geofence_areas.get(data['geofence_area_id'])
         if not geofence_area or not geofence_area.is_active:
             return jsonify({'error': 'Geofence area not found or inactive'}), 404
         
@@ -135,6 +129,8 @@ def create_attendance_session():
         
         db.session.add(session)
         db.session.commit()
+        dashboard_stats.session_started()
+        read_models.sessions_changed()
         
         return jsonify({
             'message': 'Attendance session created successfully',
@@ -210,6 +206,8 @@ def end_attendance_session(session_id):
         session.session_status = 'ended'
         
         db.session.commit()
+        dashboard_stats.session_finished()
+        read_models.sessions_changed()
         
         return jsonify({
             'message': 'Attendance session ended successfully',
@@ -244,6 +242,8 @@ def cancel_attendance_session(session_id):
         session.session_status = 'cancelled'
         
         db.session.commit()
+        dashboard_stats.session_finished()
+        read_models.sessions_changed()
         
         return jsonify({
             'message': 'Attendance session cancelled successfully',
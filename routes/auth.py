@@ -1,18 +1,20 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
-from werkzeug.security import check_password_hash, generate_password_hash
-from app import db, bcrypt
+from app import db
 from models.user import User
 from models.student import Student
 from models.lecturer import Lecturer
 from models.admin import Admin
-from models.department import Department
 from models.user_preference import UserPreference
 from models.user_session import UserSession
 from models.verification_code import VerificationCode
 from utils.validators import validate_email_format, validate_password, ValidationError, validate_email, validate_phone
 from utils.ub_validators import validate_email_by_user_type, validate_ub_matricle_number
 from utils.notification_service import NotificationService
+from utils.password_hasher import password_hasher, HashingBusyError
+from utils.rate_limiter import login_rate_limiter, get_client_ip
+from utils.token_revocation import token_revocation_store
+from utils.reference_cache import reference_cache
 from datetime import datetime, timedelta
 import uuid
 import secrets
@@ -39,6 +41,10 @@ def token_required(f):
         except jwt.InvalidTokenError:
             return jsonify({'error': 'Token is invalid'}), 401
         
+        if token_revocation_store.is_revoked(data.get('jti')):
+            return jsonify({'error': 'Token has been revoked'}), 401
+        
+        g.token_claims = data
         return f(current_user_id, *args, **kwargs)
     
     return decorated
@@ -46,7 +52,7 @@ def token_required(f):
 def get_default_department():
     """Get the first available department for students"""
     try:
-        department = Department.query.first()
+        department = reference_cache.departments.first()
         if department:
             print(f"🏫 Using existing department: {department.name} (ID: {department.id})")
             return department.id
@@ -217,7 +223,7 @@ def register():
         # For now, we'll store it in the session or return it to be sent back
         user_data = {
             'email': email,
-            'password_hash': generate_password_hash(password),
+            'password_hash': password_hasher.hash_password(password),
             'user_type': user_type,
             'first_name': first_name,
             'last_name': last_name,
@@ -230,6 +236,9 @@ def register():
             'verification_id': str(verification_code.id)
         }), 200
         
+    except HashingBusyError:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy, please try again shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Registration error: {str(e)}")
@@ -294,7 +303,7 @@ def verify_registration():
         # Create user account
         user = User(
             email=verification.email,
-            password_hash=bcrypt.generate_password_hash(password).decode('utf-8'),
+            password_hash=password_hasher.hash_password(password),
             first_name=first_name,
             last_name=last_name,
             user_type=verification.user_type,
@@ -400,6 +409,9 @@ def verify_registration():
             }
         }), 201
         
+    except HashingBusyError:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy, please try again shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
         print(f"❌ Verify registration error: {str(e)}")
         db.session.rollback()
@@ -478,10 +490,19 @@ def login():
         email = data['email'].lower().strip()
         password = data['password']
         
+        # Throttle per email and per client IP before touching the DB or hashing pool
+        allowed, retry_after = login_rate_limiter.check(email, get_client_ip(request))
+        if not allowed:
+            retry_after = max(1, int(retry_after + 0.999))
+            return jsonify({
+                'error': 'Too many login attempts. Please try again later',
+                'retry_after': retry_after
+            }), 429, {'Retry-After': str(retry_after)}
+        
         # Find user
         user = User.query.filter_by(email=email).first()
         
-        if not user or not check_password_hash(user.password_hash, password):
+        if not user or not password_hasher.verify_password(password, user.password_hash):
             return jsonify({'error': 'Invalid email or password'}), 401
         
         if not user.is_active:
@@ -497,9 +518,17 @@ def login():
             'user_id': str(user.id),
             'email': user.email,
             'user_type': user.user_type,
+            'jti': uuid.uuid4().hex,
             'exp': datetime.utcnow() + timedelta(days=30)
         }, current_app.config['SECRET_KEY'], algorithm='HS256')
         
+        # Transparently upgrade hashes from older algorithms/cost factors
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.hash_password(password)
+            except HashingBusyError:
+                pass  # Retry on a later login
+        
         # Update last login
         user.last_login = datetime.utcnow()
         db.session.commit()
@@ -517,6 +546,8 @@ def login():
             }
         }), 200
         
+    except HashingBusyError:
+        return jsonify({'error': 'Server busy, please try again shortly'}), 503, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"Login error: {str(e)}")
         return jsonify({'error': 'Login failed'}), 500
@@ -525,8 +556,9 @@ def login():
 @token_required
 def logout(current_user_id):
     try:
-        # In a more sophisticated setup, you'd invalidate the token
-        # For now, we'll just return success
+        # Revoke this token until it would have expired anyway
+        claims = g.get('token_claims', {})
+        token_revocation_store.revoke(claims.get('jti'), claims.get('exp', 0))
         return jsonify({'message': 'Logout successful'}), 200
         
     except Exception as e:
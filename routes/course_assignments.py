@@ -2,12 +2,12 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app import db
 from models.course_assignment import CourseAssignment
-from models.course import Course
 from models.lecturer import Lecturer
-from models.semester import Semester
-from models.geofence_area import GeofenceArea
 from utils.decorators import admin_required, lecturer_required, get_current_user
 from utils.validators import validate_required_fields, ValidationError
+from utils.pagination import paginate, CursorError
+from utils.reference_cache import reference_cache
+from utils import read_models
 
 course_assignments_bp = Blueprint('course_assignments', __name__)
 
@@ -16,8 +16,6 @@ course_assignments_bp = Blueprint('course_assignments', __name__)
 def get_all_course_assignments():
     try:
         current_user = get_current_user()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         lecturer_id = request.args.get('lecturer_id')
         semester_id = request.args.get('semester_id')
         active_only = request.args.get('active_only', 'true').lower() == 'true'
@@ -39,22 +37,15 @@ def get_all_course_assignments():
         if active_only:
             query = query.filter(CourseAssignment.is_active == True)
         
-        assignments = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        assignments, pagination = paginate(query, CourseAssignment.assigned_at, CourseAssignment.id)
         
         return jsonify({
-            'course_assignments': [assignment.to_dict() for assignment in assignments.items],
-            'pagination': {
-                'page': assignments.page,
-                'pages': assignments.pages,
-                'per_page': assignments.per_page,
-                'total': assignments.total,
-                'has_next': assignments.has_next,
-                'has_prev': assignments.has_prev
-            }
+            'course_assignments': [assignment.to_dict() for assignment in assignments],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -96,12 +87,12 @@ def create_course_assignment():
             return jsonify({'error': 'Lecturer not found or inactive'}), 404
         
         # Check if course exists
-        course = Course.query.get(data['course_id'])
+        course = reference_cache.courses.get(data['course_id'])
         if not course or not course.is_active:
             return jsonify({'error': 'Course not found or inactive'}), 404
         
         # Check if semester exists
-        semester = Semester.query.get(data['semester_id'])
+        semester = reference_cache.semesters.get(data['semester_id'])
         if not semester:
             return jsonify({'error': 'Semester not found'}), 404
         
@@ -112,7 +103,7 @@ def create_course_assignment():
         
         # Check if geofence area exists (if provided)
         if data.get('geofence_area_id'):
-            geofence_area = GeofenceArea.query.get(data['geofence_area_id'])
+            geofence_area = reference_cache.geofence_areas.get(data['geofence_area_id'])
             if not geofence_area or not geofence_area.is_active:
                 return jsonify({'error': 'Geofence area not found or inactive'}), 404
         
@@ -142,6 +133,7 @@ def create_course_assignment():
         
         db.session.add(assignment)
         db.session.commit()
+        read_models.assignments_changed()
         
         return jsonify({
             'message': 'Course assignment created successfully',
@@ -185,7 +177,7 @@ def update_course_assignment(assignment_id):
         
         # Update course
         if 'course_id' in data:
-            course = Course.query.get(data['course_id'])
+            course = reference_cache.courses.get(data['course_id'])
             if not course or not course.is_active:
                 return jsonify({'error': 'Course not found or inactive'}), 404
             
@@ -203,7 +195,7 @@ def update_course_assignment(assignment_id):
         
         # Update semester
         if 'semester_id' in data:
-            semester = Semester.query.get(data['semester_id'])
+            semester = reference_cache.semesters.get(data['semester_id'])
             if not semester:
                 return jsonify({'error': 'Semester not found'}), 404
             
@@ -222,7 +214,7 @@ def update_course_assignment(assignment_id):
         # Update geofence area
         if 'geofence_area_id' in data:
             if data['geofence_area_id']:
-                geofence_area = GeofenceArea.query.get(data['geofence_area_id'])
+                geofence_area = reference_cache.geofence_areas.get(data['geofence_area_id'])
                 if not geofence_area or not geofence_area.is_active:
                     return jsonify({'error': 'Geofence area not found or inactive'}), 404
             assignment.geofence_area_id = data['geofence_area_id']
@@ -232,6 +224,7 @@ def update_course_assignment(assignment_id):
             assignment.is_active = data['is_active']
         
         db.session.commit()
+        read_models.assignments_changed()
         
         return jsonify({
             'message': 'Course assignment updated successfully',
@@ -256,11 +249,13 @@ def delete_course_assignment(assignment_id):
             # Soft delete - deactivate instead of deleting
             assignment.is_active = False
             db.session.commit()
+            read_models.assignments_changed()
             return jsonify({'message': 'Course assignment deactivated successfully'}), 200
         
         # Hard delete if no associations
         db.session.delete(assignment)
         db.session.commit()
+        read_models.assignments_changed()
         
         return jsonify({'message': 'Course assignment deleted successfully'}), 200
         
@@ -281,7 +276,7 @@ def get_lecturer_current_assignments(lecturer_id):
                 return jsonify({'error': 'Access denied'}), 403
         
         # Get current semester
-        current_semester = Semester.query.filter_by(is_current=True).first()
+        current_semester = reference_cache.current_semester()
         if not current_semester:
             return jsonify({'error': 'No current semester set'}), 404
         
@@ -304,7 +299,7 @@ def get_lecturer_current_assignments(lecturer_id):
 def get_assignment_statistics():
     try:
         # Get current semester
-        current_semester = Semester.query.filter_by(is_current=True).first()
+        current_semester = reference_cache.current_semester()
         
         # Total active assignments
         total_assignments = CourseAssignment.query.filter_by(is_active=True).count()
@@ -5,15 +5,18 @@ from models.course import Course
 from models.department import Department
 from utils.decorators import admin_required, lecturer_required
 from utils.validators import validate_required_fields, validate_course_code, ValidationError
+from utils.pagination import paginate, CursorError
+from utils.http_cache import conditional_get
+from utils.reference_cache import reference_cache
+from utils.search_index import course_code_index, text_match, COURSE_CODE_PREFIX
 
 courses_bp = Blueprint('courses', __name__)
 
 @courses_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get('courses')
 def get_all_courses():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         department_id = request.args.get('department_id')
         level = request.args.get('level')
         semester_number = request.args.get('semester_number', type=int)
@@ -42,27 +45,67 @@ def get_all_courses():
                 )
             )
         
-        courses = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        courses, pagination = paginate(query, Course.course_code, Course.id, descending=False)
         
         return jsonify({
-            'courses': [course.to_dict() for course in courses.items],
-            'pagination': {
-                'page': courses.page,
-                'pages': courses.pages,
-                'per_page': courses.per_page,
-                'total': courses.total,
-                'has_next': courses.has_next,
-                'has_prev': courses.has_prev
-            }
+            'courses': [course.to_dict() for course in courses],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@courses_bp.route('/search', methods=['GET'])
+@jwt_required()
+@conditional_get('courses')
+def search_courses():
+    """Ranked course search; code prefixes (CEF3, EEF40...) are answered from the in-memory trie"""
+    try:
+        term = (request.args.get('q') or '').strip()
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        active_only = request.args.get('active_only', 'true').lower() == 'true'
+
+        if not term:
+            return jsonify({'error': 'Query parameter q is required'}), 400
+
+        results = []
+        sources = []
+
+        if COURSE_CODE_PREFIX.match(term.upper()):
+            results = course_code_index.autocomplete(term, limit, active_only)
+            if results:
+                sources.append('code_index')
+
+        # Titles (and codes the trie can't answer, e.g. "205") go to the trigram-indexed query
+        if len(results) < limit:
+            condition, rank = text_match(
+                term, [Course.course_title, Course.course_code], prefix_columns=[Course.course_code]
+            )
+            query = Course.query.filter(condition)
+            if active_only:
+                query = query.filter(Course.is_active == True)
+            if results:
+                query = query.filter(Course.id.notin_([course.id for course in results]))
+            order = [rank.desc(), Course.course_code] if rank is not None else [Course.course_code]
+            matches = query.order_by(*order).limit(limit - len(results)).all()
+            if matches:
+                results.extend(matches)
+                sources.append('database')
+
+        return jsonify({
+            'query': term,
+            'courses': [course.to_dict() for course in results],
+            'sources': sources
+        }), 200
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @courses_bp.route('/<course_id>', methods=['GET'])
 @jwt_required()
+@conditional_get('courses')
 def get_course(course_id):
     try:
         course = Course.query.get(course_id)
@@ -89,7 +132,7 @@ def create_course():
         validate_course_code(data['course_code'])
         
         # Check if department exists
-        if not Department.query.get(data['department_id']):
+        if not reference_cache.departments.get(data['department_id']):
             return jsonify({'error': 'Department not found'}), 404
         
         # Check if course code already exists
@@ -117,6 +160,7 @@ def create_course():
         
         db.session.add(course)
         db.session.commit()
+        reference_cache.invalidate('courses')
         
         return jsonify({
             'message': 'Course created successfully',
@@ -161,7 +205,7 @@ def update_course(course_id):
         for field in updatable_fields:
             if field in data:
                 if field == 'department_id':
-                    if not Department.query.get(data[field]):
+                    if not reference_cache.departments.get(data[field]):
                         return jsonify({'error': 'Department not found'}), 404
                 elif field == 'level':
                     if data[field] not in ['200', '300', '400', '500']:
@@ -173,6 +217,7 @@ def update_course(course_id):
                 setattr(course, field, data[field])
         
         db.session.commit()
+        reference_cache.invalidate('courses')
         
         return jsonify({
             'message': 'Course updated successfully',
@@ -199,11 +244,13 @@ def delete_course(course_id):
             # Soft delete - deactivate instead of deleting
             course.is_active = False
             db.session.commit()
+            reference_cache.invalidate('courses')
             return jsonify({'message': 'Course deactivated successfully'}), 200
         
         # Hard delete if no associations
         db.session.delete(course)
         db.session.commit()
+        reference_cache.invalidate('courses')
         
         return jsonify({'message': 'Course deleted successfully'}), 200
         
@@ -213,6 +260,7 @@ def delete_course(course_id):
 
 @courses_bp.route('/by-department/<department_id>', methods=['GET'])
 @jwt_required()
+@conditional_get('courses', 'departments')
 def get_courses_by_department(department_id):
     try:
         level = request.args.get('level')
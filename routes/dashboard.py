@@ -4,11 +4,8 @@ from app import db
 from models.user import User
 from models.student import Student
 from models.lecturer import Lecturer
-from models.admin import Admin
-from models.department import Department
-from models.course import Course
-from models.attendance_session import AttendanceSession
-from models.attendance_record import AttendanceRecord
+from utils.dashboard_stats import dashboard_stats, active_session_counter
+from utils.read_models import student_dashboard_view, lecturer_dashboard_view
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -26,15 +23,11 @@ def admin_dashboard():
         if current_user.user_type != 'admin':
             return jsonify({'error': 'Admin access required'}), 403
         
-        # Get system statistics
-        total_users = User.query.count()
-        total_students = Student.query.count()
-        total_lecturers = Lecturer.query.count()
-        total_admins = Admin.query.count()
-        total_departments = Department.query.count()
-        total_courses = Course.query.count()
-        total_sessions = AttendanceSession.query.count()
-        active_sessions = AttendanceSession.query.filter_by(session_status='active').count()
+        # Get system statistics (one query, cached for DASHBOARD_CACHE_SECONDS)
+        approximate = request.args.get('approximate')
+        if approximate is not None:
+            approximate = approximate.lower() == 'true'
+        overview = dashboard_stats.get_overview(approximate=approximate)
         
         dashboard_data = {
             'user_info': {
@@ -43,15 +36,17 @@ def admin_dashboard():
                 'user_type': current_user.user_type
             },
             'system_overview': {
-                'total_users': total_users,
-                'total_students': total_students,
-                'total_lecturers': total_lecturers,
-                'total_admins': total_admins,
-                'total_departments': total_departments,
-                'total_courses': total_courses,
-                'total_sessions': total_sessions,
-                'active_sessions': active_sessions
+                'total_users': overview['total_users'],
+                'total_students': overview['total_students'],
+                'total_lecturers': overview['total_lecturers'],
+                'total_admins': overview['total_admins'],
+                'total_departments': overview['total_departments'],
+                'total_courses': overview['total_courses'],
+                'total_sessions': overview['total_sessions'],
+                'active_sessions': overview['active_sessions']
             },
+            'counts_cached': overview['cached'],
+            'counts_approximate': overview['approximate'],
             'status': 'operational'
         }
         
@@ -80,14 +75,32 @@ def student_dashboard():
         if not student:
             return jsonify({'error': 'Student profile not found. Please create your profile first.'}), 404
         
-        # Get student statistics
-        total_attendance_records = AttendanceRecord.query.filter_by(student_id=student.id).count()
-        present_records = AttendanceRecord.query.filter_by(
-            student_id=student.id, 
-            attendance_status='present'
-        ).count()
-        
-        attendance_rate = (present_records / total_attendance_records * 100) if total_attendance_records > 0 else 0
+        # Per-course attendance for the current semester (one indexed read of the read model)
+        courses = []
+        total_classes = 0
+        classes_attended = 0
+        for row in student_dashboard_view.fetch(student.id, order_by='course_code'):
+            attended = row['classes_attended'] or 0
+            held = row['total_classes'] or 0
+            total_classes += held
+            classes_attended += attended
+            courses.append({
+                'course_assignment_id': str(row['course_assignment_id']),
+                'course_code': row['course_code'],
+                'course_title': row['course_title'],
+                'credit_units': row['credit_units'],
+                'department_name': row['department_name'],
+                'lecturer_name': row['lecturer_name'],
+                'semester_name': row['semester_name'],
+                'year_name': row['year_name'],
+                'has_active_session': bool(row['has_active_session']),
+                'classes_attended': attended,
+                'total_classes': held,
+                'attendance_rate': f"{(attended / held * 100) if held else 0:.1f}%"
+            })
+        
+        # Late arrivals count as attended, matching the view
+        attendance_rate = (classes_attended / total_classes * 100) if total_classes > 0 else 0
         
         dashboard_data = {
             'user_info': {
@@ -103,10 +116,11 @@ def student_dashboard():
                 'gender': student.gender if hasattr(student, 'gender') else None
             },
             'attendance_summary': {
-                'total_sessions': total_attendance_records,
-                'attended': present_records,
+                'total_sessions': total_classes,
+                'attended': classes_attended,
                 'attendance_rate': f"{attendance_rate:.1f}%"
             },
+            'courses': courses,
             'status': 'active'
         }
         
@@ -135,12 +149,24 @@ def lecturer_dashboard():
         if not lecturer:
             return jsonify({'error': 'Lecturer profile not found. Please create your profile first.'}), 404
         
-        # Get lecturer statistics
-        total_sessions = AttendanceSession.query.filter_by(started_by=lecturer.id).count()
-        active_sessions = AttendanceSession.query.filter_by(
-            started_by=lecturer.id, 
-            session_status='active'
-        ).count()
+        # Per-course breakdown for the current semester (one indexed read of the read model)
+        courses = []
+        for row in lecturer_dashboard_view.fetch(lecturer.id, order_by='course_code'):
+            courses.append({
+                'course_assignment_id': str(row['course_assignment_id']),
+                'course_code': row['course_code'],
+                'course_title': row['course_title'],
+                'department_name': row['department_name'],
+                'classroom_name': row['classroom_name'],
+                'semester_name': row['semester_name'],
+                'year_name': row['year_name'],
+                'enrolled_students': row['enrolled_students'] or 0,
+                'has_active_session': bool(row['has_active_session']),
+                'total_sessions': row['total_sessions'] or 0
+            })
+        
+        total_sessions = sum(course['total_sessions'] for course in courses)
+        active_sessions = sum(1 for course in courses if course['has_active_session'])
         
         dashboard_data = {
             'user_info': {
@@ -156,8 +182,11 @@ def lecturer_dashboard():
             },
             'session_summary': {
                 'total_sessions': total_sessions,
-                'active_sessions': active_sessions
+                'active_sessions': active_sessions,
+                'total_courses': len(courses),
+                'enrolled_students': sum(course['enrolled_students'] for course in courses)
             },
+            'courses': courses,
             'status': 'active'
         }
         
@@ -180,7 +209,7 @@ def quick_stats():
         stats = {
             'user_type': current_user.user_type,
             'system_status': 'operational',
-            'active_sessions': AttendanceSession.query.filter_by(session_status='active').count()
+            'active_sessions': active_session_counter.get()
         }
         
         return jsonify(stats), 200
@@ -7,11 +7,14 @@ from models.course import Course
 from models.user import User
 from utils.decorators import admin_required
 from utils.validators import validate_required_fields, ValidationError
+from utils.http_cache import conditional_get
+from utils.reference_cache import reference_cache
 
 departments_bp = Blueprint('departments', __name__)
 
 @departments_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get('departments')
 def get_all_departments():
     try:
         active_only = request.args.get('active_only', 'true').lower() == 'true'
@@ -31,6 +34,7 @@ def get_all_departments():
 
 @departments_bp.route('/<department_id>', methods=['GET'])
 @jwt_required()
+@conditional_get('departments')
 def get_department(department_id):
     try:
         department = Department.query.get(department_id)
@@ -72,6 +76,7 @@ def create_department():
         
         db.session.add(department)
         db.session.commit()
+        reference_cache.invalidate('departments')
         
         return jsonify({
             'message': 'Department created successfully',
@@ -126,6 +131,7 @@ def update_department(department_id):
             department.is_active = data['is_active']
         
         db.session.commit()
+        reference_cache.invalidate('departments')
         
         return jsonify({
             'message': 'Department updated successfully',
@@ -153,6 +159,7 @@ def delete_department(department_id):
             # Soft delete - deactivate instead of deleting
             department.is_active = False
             db.session.commit()
+            reference_cache.invalidate('departments')
             return jsonify({
                 'message': 'Department deactivated successfully (has associated records)',
                 'students_count': student_count,
@@ -162,6 +169,7 @@ def delete_department(department_id):
         # Hard delete if no associations
         db.session.delete(department)
         db.session.commit()
+        reference_cache.invalidate('departments')
         
         return jsonify({'message': 'Department deleted successfully'}), 200
         
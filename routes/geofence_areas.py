@@ -4,11 +4,14 @@ from app import db
 from models.geofence_area import GeofenceArea
 from utils.decorators import admin_required, lecturer_required
 from utils.validators import validate_required_fields, validate_coordinates, ValidationError
+from utils.http_cache import conditional_get
+from utils.reference_cache import reference_cache
 
 geofence_areas_bp = Blueprint('geofence_areas', __name__)
 
 @geofence_areas_bp.route('', methods=['GET'])
 @lecturer_required
+@conditional_get('geofence_areas')
 def get_all_geofence_areas():
     try:
         active_only = request.args.get('active_only', 'true').lower() == 'true'
@@ -46,6 +49,7 @@ def get_all_geofence_areas():
 
 @geofence_areas_bp.route('/<area_id>', methods=['GET'])
 @lecturer_required
+@conditional_get('geofence_areas')
 def get_geofence_area(area_id):
     try:
         area = GeofenceArea.query.get(area_id)
@@ -119,6 +123,7 @@ def create_geofence_area():
         
         db.session.add(geofence_area)
         db.session.commit()
+        reference_cache.invalidate('geofence_areas')
         
         return jsonify({
             'message': 'Geofence area created successfully',
@@ -202,6 +207,7 @@ def update_geofence_area(area_id):
                 return jsonify({'error': 'East longitude must be greater than west longitude'}), 400
         
         db.session.commit()
+        reference_cache.invalidate('geofence_areas')
         
         return jsonify({
             'message': 'Geofence area updated successfully',
@@ -228,11 +234,13 @@ def delete_geofence_area(area_id):
             # Soft delete - deactivate instead of deleting
             area.is_active = False
             db.session.commit()
+            reference_cache.invalidate('geofence_areas')
             return jsonify({'message': 'Geofence area deactivated successfully'}), 200
         
         # Hard delete if no associations
         db.session.delete(area)
         db.session.commit()
+        reference_cache.invalidate('geofence_areas')
         
         return jsonify({'message': 'Geofence area deleted successfully'}), 200
         
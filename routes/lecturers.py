@@ -5,6 +5,7 @@ from models.lecturer import Lecturer
 from models.user import User
 from utils.decorators import admin_required, lecturer_required, get_current_user
 from utils.validators import validate_required_fields, validate_phone_number, validate_email_format, ValidationError
+from utils.pagination import paginate, CursorError
 
 lecturers_bp = Blueprint('lecturers', __name__)
 
@@ -12,8 +13,6 @@ lecturers_bp = Blueprint('lecturers', __name__)
 @lecturer_required
 def get_all_lecturers():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         search = request.args.get('search')
         active_only = request.args.get('active_only', 'true').lower() == 'true'
         
@@ -31,22 +30,15 @@ def get_all_lecturers():
                 )
             )
         
-        lecturers = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        lecturers, pagination = paginate(query, Lecturer.created_at, Lecturer.id)
         
         return jsonify({
-            'lecturers': [lecturer.to_dict() for lecturer in lecturers.items],
-            'pagination': {
-                'page': lecturers.page,
-                'pages': lecturers.pages,
-                'per_page': lecturers.per_page,
-                'total': lecturers.total,
-                'has_next': lecturers.has_next,
-                'has_prev': lecturers.has_prev
-            }
+            'lecturers': [lecturer.to_dict() for lecturer in lecturers],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
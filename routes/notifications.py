@@ -1,56 +1,129 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, current_app
 from flask_jwt_extended import jwt_required
 from app import db
 from models.notification import Notification
+from models.broadcast_notification import BroadcastNotification
+from models.broadcast_receipt import BroadcastReceipt
+from models.notification_counter import NotificationCounter
 from models.user import User
 from utils.decorators import admin_required, get_current_user
 from utils.validators import validate_required_fields, ValidationError
+from utils.notification_bus import notification_bus
+from utils.pagination import get_page_args, decode_cursor, encode_cursor, keyset_condition, build_pagination, CursorError
+from sqlalchemy import select, insert, literal, func, union_all
 from datetime import datetime
+import json
+import time
 
 notifications_bp = Blueprint('notifications', __name__)
 
+def _not_expired(model, now):
+    return db.or_(model.expires_at.is_(None), model.expires_at > now)
+
+def _unread_broadcasts(user, now):
+    """Broadcasts visible to the user with no receipt yet"""
+    receipt = db.and_(BroadcastReceipt.broadcast_id == BroadcastNotification.id,
+                      BroadcastReceipt.user_id == user.id)
+    return select(BroadcastNotification.id).where(
+        BroadcastNotification.visible_to(user, now),
+        ~select(BroadcastReceipt.broadcast_id).where(receipt).exists()
+    )
+
+def _get_broadcast_for(user, notification_id):
+    """(broadcast, receipt) if the id is a broadcast visible to the user, else (None, None)"""
+    broadcast = BroadcastNotification.query.filter(
+        BroadcastNotification.id == notification_id,
+        BroadcastNotification.visible_to(user)
+    ).first()
+    if not broadcast:
+        return None, None
+    return broadcast, db.session.get(BroadcastReceipt, (broadcast.id, user.id))
+
 @notifications_bp.route('', methods=['GET'])
 @jwt_required()
 def get_user_notifications():
     try:
         current_user = get_current_user()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page, per_page, after, count_mode = get_page_args()
         unread_only = request.args.get('unread_only', 'false').lower() == 'true'
         notification_type = request.args.get('type')
         
-        query = Notification.query.filter_by(recipient_id=current_user.id)
+        now = datetime.utcnow()
         
+        # Direct notifications
+        direct = select(
+            Notification.id.label('id'),
+            Notification.created_at.label('created_at'),
+            literal(False).label('is_broadcast')
+        ).where(
+            Notification.recipient_id == current_user.id,
+            _not_expired(Notification, now)
+        )
         if unread_only:
-            query = query.filter_by(is_read=False)
-        
+            direct = direct.where(Notification.is_read == False)
         if notification_type:
-            query = query.filter_by(notification_type=notification_type)
-        
-        # Filter out expired notifications
-        query = query.filter(
-            db.or_(
-                Notification.expires_at.is_(None),
-                Notification.expires_at > datetime.utcnow()
-            )
-        )
-        
-        notifications = query.order_by(Notification.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+            direct = direct.where(Notification.notification_type == notification_type)
+        
+        # Broadcasts for the user's audience, merged in at read time
+        broadcasts = select(
+            BroadcastNotification.id.label('id'),
+            BroadcastNotification.created_at.label('created_at'),
+            literal(True).label('is_broadcast')
+        ).outerjoin(
+            BroadcastReceipt,
+            db.and_(BroadcastReceipt.broadcast_id == BroadcastNotification.id,
+                    BroadcastReceipt.user_id == current_user.id)
+        ).where(
+            BroadcastNotification.visible_to(current_user, now),
+            BroadcastReceipt.dismissed_at.is_(None)
         )
+        if unread_only:
+            broadcasts = broadcasts.where(BroadcastReceipt.broadcast_id.is_(None))
+        if notification_type:
+            broadcasts = broadcasts.where(BroadcastNotification.notification_type == notification_type)
+        
+        feed = union_all(direct, broadcasts).subquery()
+        feed_page = select(feed).order_by(feed.c.created_at.desc(), feed.c.id.desc())
+        if after:
+            values = decode_cursor(after, [feed.c.created_at, feed.c.id])
+            feed_page = feed_page.where(keyset_condition([feed.c.created_at, feed.c.id], values))
+        else:
+            feed_page = feed_page.offset((page - 1) * per_page)
+        page_rows = db.session.execute(feed_page.limit(per_page + 1)).all()
+        has_next = len(page_rows) > per_page
+        page_rows = page_rows[:per_page]
+        next_cursor = encode_cursor([page_rows[-1].created_at, page_rows[-1].id]) if has_next and page_rows else None
+        
+        # The feed is a per-user union, so an estimate would be no cheaper than counting it
+        total = None
+        if count_mode != 'none':
+            total = db.session.execute(select(func.count()).select_from(feed)).scalar()
+        
+        # Load the page's rows from each table
+        direct_ids = [row.id for row in page_rows if not row.is_broadcast]
+        broadcast_ids = [row.id for row in page_rows if row.is_broadcast]
+        loaded = {}
+        if direct_ids:
+            for notification in Notification.query.filter(Notification.id.in_(direct_ids)):
+                loaded[notification.id] = notification.to_dict()
+        if broadcast_ids:
+            receipts = {
+                receipt.broadcast_id: receipt
+                for receipt in BroadcastReceipt.query.filter(
+                    BroadcastReceipt.user_id == current_user.id,
+                    BroadcastReceipt.broadcast_id.in_(broadcast_ids)
+                )
+            }
+            for broadcast in BroadcastNotification.query.filter(BroadcastNotification.id.in_(broadcast_ids)):
+                loaded[broadcast.id] = broadcast.to_dict(current_user.id, receipts.get(broadcast.id))
         
         return jsonify({
-            'notifications': [notification.to_dict() for notification in notifications.items],
-            'pagination': {
-                'page': notifications.page,
-                'pages': notifications.pages,
-                'per_page': notifications.per_page,
-                'total': notifications.total,
-                'has_next': notifications.has_next,
-                'has_prev': notifications.has_prev
-            }
+            'notifications': [loaded[row.id] for row in page_rows if row.id in loaded],
+            'pagination': build_pagination(page, per_page, after, has_next, next_cursor, total)
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -62,7 +135,10 @@ def get_notification(notification_id):
         notification = Notification.query.get(notification_id)
         
         if not notification:
-            return jsonify({'error': 'Notification not found'}), 404
+            broadcast, receipt = _get_broadcast_for(current_user, notification_id)
+            if not broadcast:
+                return jsonify({'error': 'Notification not found'}), 404
+            return jsonify({'notification': broadcast.to_dict(current_user.id, receipt)}), 200
         
         # Check if user can access this notification
         if notification.recipient_id != current_user.id and current_user.user_type != 'admin':
@@ -114,11 +190,15 @@ def create_notification():
         )
         
         db.session.add(notification)
+        NotificationCounter.adjust(notification.recipient_id, 1)
         db.session.commit()
         
+        notification_data = notification.to_dict()
+        notification_bus.publish_to_user(notification.recipient_id, 'notification', notification_data)
+        
         return jsonify({
             'message': 'Notification created successfully',
-            'notification': notification.to_dict()
+            'notification': notification_data
         }), 201
         
     except ValidationError as e:
@@ -135,7 +215,17 @@ def mark_notification_read(notification_id):
         notification = Notification.query.get(notification_id)
         
         if not notification:
-            return jsonify({'error': 'Notification not found'}), 404
+            broadcast, receipt = _get_broadcast_for(current_user, notification_id)
+            if not broadcast:
+                return jsonify({'error': 'Notification not found'}), 404
+            if not receipt:
+                receipt = BroadcastReceipt(broadcast_id=broadcast.id, user_id=current_user.id)
+                db.session.add(receipt)
+                db.session.commit()
+            return jsonify({
+                'message': 'Notification marked as read',
+                'notification': broadcast.to_dict(current_user.id, receipt)
+            }), 200
         
         # Check if user can mark this notification as read
         if notification.recipient_id != current_user.id:
@@ -144,6 +234,7 @@ def mark_notification_read(notification_id):
         if not notification.is_read:
             notification.is_read = True
             notification.read_at = datetime.utcnow()
+            NotificationCounter.adjust(current_user.id, -1)
             db.session.commit()
         
         return jsonify({
@@ -161,20 +252,29 @@ def mark_all_notifications_read():
     try:
         current_user = get_current_user()
         
-        # Update all unread notifications for the user
-        unread_notifications = Notification.query.filter_by(
+        now = datetime.utcnow()
+        
+        # Update all unread notifications for the user in one statement
+        direct_marked = Notification.query.filter_by(
             recipient_id=current_user.id,
             is_read=False
-        ).all()
-        
-        for notification in unread_notifications:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
+        ).update({'is_read': True, 'read_at': now}, synchronize_session=False)
+        NotificationCounter.reset(current_user.id)
+        
+        # Broadcasts: one receipt per unread broadcast, written set-wise
+        unread_broadcasts = _unread_broadcasts(current_user, now).subquery()
+        broadcasts_marked = db.session.execute(
+            insert(BroadcastReceipt.__table__).from_select(
+                ['broadcast_id', 'user_id', 'read_at'],
+                select(unread_broadcasts.c.id, literal(current_user.id, BroadcastReceipt.user_id.type),
+                       literal(now, db.DateTime))
+            )
+        ).rowcount
         
         db.session.commit()
         
         return jsonify({
-            'message': f'Marked {len(unread_notifications)} notifications as read'
+            'message': f'Marked {direct_marked + broadcasts_marked} notifications as read'
         }), 200
         
     except Exception as e:
@@ -189,12 +289,32 @@ def delete_notification(notification_id):
         notification = Notification.query.get(notification_id)
         
         if not notification:
-            return jsonify({'error': 'Notification not found'}), 404
+            if current_user.user_type == 'admin':
+                broadcast = BroadcastNotification.query.get(notification_id)
+                if broadcast:
+                    # Admins delete the broadcast itself, for everyone
+                    db.session.delete(broadcast)
+                    db.session.commit()
+                    return jsonify({'message': 'Broadcast notification deleted successfully'}), 200
+            
+            broadcast, receipt = _get_broadcast_for(current_user, notification_id)
+            if not broadcast:
+                return jsonify({'error': 'Notification not found'}), 404
+            
+            # Users only hide a broadcast from their own feed
+            if not receipt:
+                receipt = BroadcastReceipt(broadcast_id=broadcast.id, user_id=current_user.id)
+                db.session.add(receipt)
+            receipt.dismissed_at = datetime.utcnow()
+            db.session.commit()
+            return jsonify({'message': 'Notification deleted successfully'}), 200
         
         # Check if user can delete this notification
         if notification.recipient_id != current_user.id and current_user.user_type != 'admin':
             return jsonify({'error': 'Access denied'}), 403
         
+        if not notification.is_read:
+            NotificationCounter.adjust(notification.recipient_id, -1)
         db.session.delete(notification)
         db.session.commit()
         
@@ -224,13 +344,6 @@ def broadcast_notification():
         if data['user_type'] not in ['all', 'student', 'lecturer', 'admin']:
             return jsonify({'error': 'Invalid user type'}), 400
         
-        # Get target users
-        query = User.query.filter_by(is_active=True)
-        if data['user_type'] != 'all':
-            query = query.filter_by(user_type=data['user_type'])
-        
-        target_users = query.all()
-        
         # Parse expires_at if provided
         expires_at = None
         if data.get('expires_at'):
@@ -239,11 +352,15 @@ def broadcast_notification():
             except ValueError:
                 return jsonify({'error': 'Invalid expires_at format. Use ISO format'}), 400
         
-        # Create notifications for all target users
-        notifications_created = 0
-        for user in target_users:
-            notification = Notification(
-                recipient_id=user.id,
+        # Per-user rows only when explicitly requested; by default one broadcast row
+        # is written and merged into each user's feed at read time
+        if data.get('fan_out'):
+            user_filter = User.is_active == True
+            if data['user_type'] != 'all':
+                user_filter = db.and_(user_filter, User.user_type == data['user_type'])
+            
+            notifications_created = Notification.fan_out(
+                user_filter,
                 sender_id=current_user.id,
                 notification_type=data['notification_type'],
                 title=data['title'],
@@ -251,13 +368,41 @@ def broadcast_notification():
                 data=data.get('data'),
                 expires_at=expires_at
             )
-            db.session.add(notification)
-            notifications_created += 1
-        
+            NotificationCounter.adjust_where(user_filter, 1)
+            db.session.commit()
+            
+            # Rows differ only by id; push the shared content so clients refresh their feed
+            notification_bus.publish_to_audience(data['user_type'], 'notification', {
+                'id': None,
+                'notification_type': data['notification_type'],
+                'title': data['title'],
+                'message': data['message'],
+                'data': data.get('data')
+            })
+            
+            return jsonify({
+                'message': f'Broadcast notification sent to {notifications_created} users',
+                'recipients': notifications_created
+            }), 201
+        
+        broadcast = BroadcastNotification(
+            sender_id=current_user.id,
+            target_user_type=data['user_type'],
+            notification_type=data['notification_type'],
+            title=data['title'],
+            message=data['message'],
+            data=data.get('data'),
+            expires_at=expires_at
+        )
+        db.session.add(broadcast)
         db.session.commit()
         
+        broadcast_data = broadcast.to_dict()
+        notification_bus.publish_to_audience(broadcast.target_user_type, 'broadcast', broadcast_data)
+        
         return jsonify({
-            'message': f'Broadcast notification sent to {notifications_created} users'
+            'message': f"Broadcast notification published to {data['user_type']} users",
+            'broadcast': broadcast_data
         }), 201
         
     except ValidationError as e:
@@ -272,21 +417,109 @@ def get_unread_count():
     try:
         current_user = get_current_user()
         
-        unread_count = Notification.query.filter_by(
-            recipient_id=current_user.id,
-            is_read=False
-        ).filter(
-            db.or_(
-                Notification.expires_at.is_(None),
-                Notification.expires_at > datetime.utcnow()
-            )
-        ).count()
+        # Direct notifications from the maintained counter, broadcasts from the (small) broadcast table
+        unread_count = NotificationCounter.get_unread(current_user.id)
+        
+        unread_count += db.session.execute(
+            select(func.count()).select_from(_unread_broadcasts(current_user, datetime.utcnow()).subquery())
+        ).scalar()
         
         return jsonify({'unread_count': unread_count}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _last_event_id():
+    """
+    Last event id the client has seen, as an int (0 for none).
+    Last-Event-ID lets a reconnecting client pick up what it missed; EventSource
+    can't send headers on its first connect, so ?after= covers that.
+    """
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is None:
+        last_event_id = request.args.get('after', 0, type=int)
+    return last_event_id
+
+@notifications_bp.route('/stream', methods=['GET'])
+@jwt_required()
+def stream_notifications():
+    """Server-Sent Events: pushes new notifications until the stream times out and the client reconnects"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        last_event_id = _last_event_id()
+        heartbeat = current_app.config.get('NOTIFICATION_STREAM_HEARTBEAT_SECONDS', 15)
+        max_seconds = current_app.config.get('NOTIFICATION_STREAM_MAX_SECONDS', 300)
+        
+        subscription = notification_bus.subscribe(current_user.id, current_user.user_type)
+        missed = notification_bus.events_since(current_user.id, current_user.user_type, last_event_id) if last_event_id else []
+        
+        def format_event(event):
+            return f"id: {event['event_id']}\nevent: {event['type']}\ndata: {json.dumps(event['notification'], default=str)}\n\n"
+        
+        def generate():
+            try:
+                yield "retry: 3000\n\n"
+                for event in missed:
+                    yield format_event(event)
+                deadline = time.monotonic() + max_seconds
+                while time.monotonic() < deadline:
+                    event = subscription.get(timeout=heartbeat)
+                    if event is None:
+                        yield ": keepalive\n\n"
+                    elif event['event_id'] > last_event_id:
+                        yield format_event(event)
+            finally:
+                notification_bus.unsubscribe(subscription)
+        
+        # Release the DB connection; the stream itself never touches the database
+        db.session.remove()
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notifications_bp.route('/poll', methods=['GET'])
+@jwt_required()
+def poll_notifications():
+    """Long-poll: returns as soon as there is something newer than `after`, or empty after `timeout` seconds"""
+    try:
+        current_user = get_current_user()
+        if not current_user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        after = request.args.get('after', 0, type=int)
+        timeout = min(max(request.args.get('timeout', 25, type=float), 0), 55)
+        user_id, user_type = current_user.id, current_user.user_type
+        
+        subscription = notification_bus.subscribe(user_id, user_type)
+        db.session.remove()
+        try:
+            events = notification_bus.events_since(user_id, user_type, after) if after else []
+            if not events:
+                event = subscription.get(timeout=timeout)
+                if event is not None:
+                    events = [e for e in [event] + subscription.drain() if e['event_id'] > after]
+        finally:
+            notification_bus.unsubscribe(subscription)
+        
+        return jsonify({
+            'events': [
+                {'id': e['event_id'], 'type': e['type'], 'notification': e['notification']}
+                for e in events
+            ],
+            'last_event_id': events[-1]['event_id'] if events else after
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @notifications_bp.route('/cleanup-expired', methods=['POST'])
 @admin_required
 def cleanup_expired_notifications():
@@ -300,7 +533,13 @@ def cleanup_expired_notifications():
         for notification in expired_notifications:
             db.session.delete(notification)
         
+        # Expired broadcasts (their receipts go with them)
+        count += BroadcastNotification.query.filter(
+            BroadcastNotification.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+        
         db.session.commit()
+        NotificationCounter.reconcile()
         
         return jsonify({
             'message': f'Cleaned up {count} expired notifications'
@@ -333,8 +572,11 @@ def get_notification_statistics():
             Notification.created_at >= seven_days_ago
         ).count()
         
+        total_broadcasts = BroadcastNotification.query.count()
+        
         return jsonify({
             'total_notifications': total_notifications,
+            'total_broadcasts': total_broadcasts,
             'unread_notifications': unread_notifications,
             'recent_notifications_7_days': recent_notifications,
             'by_type': [
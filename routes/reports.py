@@ -7,10 +7,10 @@ from models.student import Student
 from models.course import Course
 from models.course_assignment import CourseAssignment
 from models.student_enrollment import StudentEnrollment
-from models.semester import Semester
 from models.lecturer import Lecturer
 from models.department import Department
 from utils.decorators import lecturer_required, admin_required, get_current_user
+from utils.reference_cache import reference_cache
 from datetime import datetime, timedelta
 from sqlalchemy import func, and_, or_
 
@@ -125,8 +125,8 @@ def get_course_attendance_report(course_assignment_id):
             attendance_data.append(student_data)
         
         # Course and session summary
-        course = Course.query.get(course_assignment.course_id)
-        semester = Semester.query.get(course_assignment.semester_id)
+        course = reference_cache.courses.get(course_assignment.course_id)
+        semester = reference_cache.semesters.get(course_assignment.semester_id)
         
         # Overall statistics
         total_possible_attendance = len(enrolled_students) * len(sessions)
@@ -228,7 +228,7 @@ def get_student_attendance_report(student_id):
         # Calculate statistics by course
         course_statistics = []
         for enrollment in enrollments:
-            course = Course.query.get(enrollment.course_id)
+            course = reference_cache.courses.get(enrollment.course_id)
             course_assignment = CourseAssignment.query.filter_by(
                 course_id=enrollment.course_id,
                 semester_id=enrollment.semester_id
@@ -479,7 +479,7 @@ def get_course_performance_report():
         
         # Get current semester if not specified
         if not semester_id:
-            current_semester = Semester.query.filter_by(is_current=True).first()
+            current_semester = reference_cache.current_semester()
             if current_semester:
                 semester_id = current_semester.id
         
@@ -501,7 +501,7 @@ def get_course_performance_report():
         
         course_performance = []
         for assignment in assignments:
-            course = Course.query.get(assignment.course_id)
+            course = reference_cache.courses.get(assignment.course_id)
             lecturer = Lecturer.query.get(assignment.lecturer_id)
             
             # Get enrolled students count
@@ -556,7 +556,7 @@ def get_course_performance_report():
         # Sort by attendance rate (descending)
         course_performance.sort(key=lambda x: x['statistics']['attendance_rate'], reverse=True)
         
-        semester = Semester.query.get(semester_id)
+        semester = reference_cache.semesters.get(semester_id)
         
         return jsonify({
             'semester': semester.to_dict() if semester else None,
@@ -0,0 +1,118 @@
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+import io
+from app import db
+from models.roster_import import RosterImport
+from utils.decorators import admin_required, get_current_user
+from utils.reference_cache import reference_cache
+from utils.roster_import import RosterImporter, RosterFormatError
+from utils.search_index import student_directory
+from utils.dashboard_stats import dashboard_stats
+from utils import read_models
+
+roster_imports_bp = Blueprint('roster_imports', __name__)
+
+def _mark_failed(import_id, message):
+    db.session.rollback()
+    record = RosterImport.query.get(import_id)
+    record.status = 'failed'
+    record.error_message = message
+    record.finished_at = datetime.utcnow()
+    db.session.commit()
+    return record
+
+@roster_imports_bp.route('', methods=['POST'])
+@admin_required
+def import_roster():
+    """
+    Stream a CSV roster into users, students and enrollments.
+    Send it as multipart field 'file' or as a raw text/csv body; ?semester_id=
+    selects the semester for the courses column (default: current semester).
+    """
+    try:
+        current_user = get_current_user()
+
+        upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+        if request.mimetype == 'multipart/form-data' and not upload:
+            return jsonify({'error': 'No file uploaded. Expected multipart field "file"'}), 400
+
+        semester_id = request.args.get('semester_id')
+        if semester_id:
+            semester = reference_cache.semesters.get(semester_id)
+            if not semester:
+                return jsonify({'error': 'Semester not found'}), 404
+        else:
+            semester = reference_cache.current_semester()
+
+        record = RosterImport(
+            filename=upload.filename if upload else request.args.get('filename'),
+            semester_id=semester.id if semester else None,
+            created_by=current_user.id
+        )
+        db.session.add(record)
+        db.session.commit()
+        import_id = record.id
+
+        importer = RosterImporter(
+            record, semester, created_by=current_user.id,
+            chunk_size=current_app.config.get('ROSTER_IMPORT_CHUNK_SIZE', 1000)
+        )
+        stream = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+        try:
+            importer.run(stream)
+        except RosterFormatError as e:
+            record = _mark_failed(import_id, str(e))
+            return jsonify({'error': str(e), 'import': record.to_dict()}), 400
+        except (UnicodeDecodeError, ValueError) as e:
+            record = _mark_failed(import_id, f'Unreadable CSV: {e}')
+            return jsonify({'error': record.error_message, 'import': record.to_dict()}), 400
+        except Exception as e:
+            record = _mark_failed(import_id, str(e))
+            return jsonify({'error': str(e), 'import': record.to_dict()}), 500
+        finally:
+            if record.students_created or record.enrollments_created:
+                student_directory.invalidate()
+                dashboard_stats.invalidate()
+            if record.enrollments_created:
+                read_models.enrollments_changed()
+
+        return jsonify({
+            'message': f'Roster import completed. {record.students_created} students created, '
+                       f'{record.enrollments_created} enrollments created, {record.rows_failed} rows failed',
+            'import': record.to_dict(),
+            'errors': importer.errors,
+            'errors_omitted': importer.errors_omitted
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@roster_imports_bp.route('', methods=['GET'])
+@admin_required
+def get_roster_imports():
+    """Recent imports with their progress counters"""
+    try:
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        imports = RosterImport.query.order_by(RosterImport.started_at.desc()).limit(limit).all()
+
+        return jsonify({
+            'imports': [record.to_dict() for record in imports]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@roster_imports_bp.route('/<import_id>', methods=['GET'])
+@admin_required
+def get_roster_import(import_id):
+    try:
+        record = RosterImport.query.get(import_id)
+
+        if not record:
+            return jsonify({'error': 'Roster import not found'}), 404
+
+        return jsonify({'import': record.to_dict(include_errors=True)}), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -3,14 +3,20 @@ from flask_jwt_extended import jwt_required
 from app import db
 from models.semester import Semester
 from models.academic_year import AcademicYear
-from utils.decorators import admin_required
+from utils.decorators import admin_required, get_current_user
 from utils.validators import validate_required_fields, ValidationError
-from datetime import datetime
+from utils.http_cache import conditional_get
+from utils.reference_cache import reference_cache
+from utils.semester_rollover import rollover_semester
+from utils import read_models
+from datetime import datetime, date
+import uuid
 
 semesters_bp = Blueprint('semesters', __name__)
 
 @semesters_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get('semesters')
 def get_all_semesters():
     try:
         academic_year_id = request.args.get('academic_year_id')
@@ -35,9 +41,10 @@ def get_all_semesters():
 
 @semesters_bp.route('/current', methods=['GET'])
 @jwt_required()
+@conditional_get('semesters')
 def get_current_semester():
     try:
-        current_semester = Semester.query.filter_by(is_current=True).first()
+        current_semester = reference_cache.current_semester()
         
         if not current_semester:
             return jsonify({'error': 'No current semester set'}), 404
@@ -49,6 +56,7 @@ def get_current_semester():
 
 @semesters_bp.route('/<semester_id>', methods=['GET'])
 @jwt_required()
+@conditional_get('semesters')
 def get_semester(semester_id):
     try:
         semester = Semester.query.get(semester_id)
@@ -129,6 +137,9 @@ def create_semester():
         
         db.session.add(semester)
         db.session.commit()
+        reference_cache.invalidate('semesters')
+        if semester.is_current:
+            read_models.semesters_changed()
         
         return jsonify({
             'message': 'Semester created successfully',
@@ -197,6 +208,9 @@ def update_semester(semester_id):
             semester.is_current = data['is_current']
         
         db.session.commit()
+        reference_cache.invalidate('semesters')
+        if 'is_current' in data:
+            read_models.semesters_changed()
         
         return jsonify({
             'message': 'Semester updated successfully',
@@ -226,6 +240,7 @@ def delete_semester(semester_id):
         
         db.session.delete(semester)
         db.session.commit()
+        reference_cache.invalidate('semesters')
         
         return jsonify({'message': 'Semester deleted successfully'}), 200
         
@@ -249,6 +264,8 @@ def set_current_semester(semester_id):
         semester.is_current = True
         
         db.session.commit()
+        reference_cache.invalidate('semesters')
+        read_models.semesters_changed()
         
         return jsonify({
             'message': 'Semester set as current successfully',
@@ -258,3 +275,78 @@ def set_current_semester(semester_id):
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+
+@semesters_bp.route('/<semester_id>/rollover', methods=['POST'])
+@admin_required
+def rollover_into_semester(semester_id):
+    """
+    Clone course assignments (and optionally enrollments) from source_semester_id
+    into this semester in one transaction. dry_run=true only reports the counts.
+    """
+    try:
+        data = request.get_json() or {}
+        current_user = get_current_user()
+        
+        # Validate required fields
+        validate_required_fields(data, ['source_semester_id'])
+        
+        target = reference_cache.semesters.get(semester_id)
+        if not target:
+            return jsonify({'error': 'Semester not found'}), 404
+        
+        source = reference_cache.semesters.get(data['source_semester_id'])
+        if not source:
+            return jsonify({'error': 'Source semester not found'}), 404
+        
+        if source.id == target.id:
+            return jsonify({'error': 'Source and target semesters must be different'}), 400
+        
+        # Same rule as creating a single assignment
+        if target.end_date < date.today():
+            return jsonify({'error': 'Cannot assign courses to past semesters'}), 400
+        
+        selections = {}
+        for field in ('course_ids', 'assignment_ids'):
+            values = data.get(field)
+            if values is None:
+                continue
+            if not isinstance(values, list) or not values:
+                return jsonify({'error': f'{field} must be a non-empty list', 'field': field}), 400
+            try:
+                selections[field] = [uuid.UUID(str(value)) for value in values]
+            except ValueError:
+                return jsonify({'error': f'{field} contains an invalid id', 'field': field}), 400
+        
+        # Get admin profile for assigned_by field
+        from models.admin import Admin
+        admin_profile = Admin.query.filter_by(user_id=current_user.id).first()
+        if not admin_profile:
+            return jsonify({'error': 'Admin profile not found'}), 404
+        
+        dry_run = bool(data.get('dry_run', False))
+        include_enrollments = bool(data.get('include_enrollments', False))
+        result = rollover_semester(
+            source, target,
+            assigned_by=admin_profile.id,
+            enrolled_by=current_user.id,
+            include_enrollments=include_enrollments,
+            dry_run=dry_run,
+            **selections
+        )
+        
+        if not dry_run:
+            if result['course_assignments']['created']:
+                read_models.assignments_changed()
+            if include_enrollments and result['student_enrollments']['created']:
+                read_models.enrollments_changed()
+        
+        return jsonify({
+            'message': 'Rollover preview' if dry_run else 'Semester rollover completed',
+            'rollover': result
+        }), 200
+        
+    except ValidationError as e:
+        return jsonify({'error': e.message, 'field': e.field}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
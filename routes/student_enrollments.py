@@ -1,12 +1,15 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+import uuid
 from app import db
 from models.student_enrollment import StudentEnrollment
 from models.student import Student
 from models.course import Course
-from models.semester import Semester
 from utils.decorators import admin_required, lecturer_required, student_required, get_current_user
 from utils.validators import validate_required_fields, ValidationError
+from utils.pagination import paginate, CursorError
+from utils.reference_cache import reference_cache
+from utils import read_models
 
 student_enrollments_bp = Blueprint('student_enrollments', __name__)
 
@@ -15,8 +18,6 @@ student_enrollments_bp = Blueprint('student_enrollments', __name__)
 def get_all_student_enrollments():
     try:
         current_user = get_current_user()
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         student_id = request.args.get('student_id')
         course_id = request.args.get('course_id')
         semester_id = request.args.get('semester_id')
@@ -42,22 +43,15 @@ def get_all_student_enrollments():
         if status:
             query = query.filter(StudentEnrollment.enrollment_status == status)
         
-        enrollments = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        enrollments, pagination = paginate(query, StudentEnrollment.enrollment_date, StudentEnrollment.id)
         
         return jsonify({
-            'student_enrollments': [enrollment.to_dict() for enrollment in enrollments.items],
-            'pagination': {
-                'page': enrollments.page,
-                'pages': enrollments.pages,
-                'per_page': enrollments.per_page,
-                'total': enrollments.total,
-                'has_next': enrollments.has_next,
-                'has_prev': enrollments.has_prev
-            }
+            'student_enrollments': [enrollment.to_dict() for enrollment in enrollments],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -99,12 +93,12 @@ def create_student_enrollment():
             return jsonify({'error': 'Student not found'}), 404
         
         # Check if course exists
-        course = Course.query.get(data['course_id'])
+        course = reference_cache.courses.get(data['course_id'])
         if not course or not course.is_active:
             return jsonify({'error': 'Course not found or inactive'}), 404
         
         # Check if semester exists
-        semester = Semester.query.get(data['semester_id'])
+        semester = reference_cache.semesters.get(data['semester_id'])
         if not semester:
             return jsonify({'error': 'Semester not found'}), 404
         
@@ -134,6 +128,7 @@ def create_student_enrollment():
         
         db.session.add(enrollment)
         db.session.commit()
+        read_models.enrollments_changed()
         
         return jsonify({
             'message': 'Student enrollment created successfully',
@@ -169,6 +164,8 @@ def update_student_enrollment(enrollment_id):
             enrollment.grade = data['grade']
         
         db.session.commit()
+        if 'enrollment_status' in data:
+            read_models.enrollments_changed()
         
         return jsonify({
             'message': 'Student enrollment updated successfully',
@@ -191,6 +188,7 @@ def delete_student_enrollment(enrollment_id):
         # Change status to dropped instead of deleting
         enrollment.enrollment_status = 'dropped'
         db.session.commit()
+        read_models.enrollments_changed()
         
         return jsonify({'message': 'Student enrollment dropped successfully'}), 200
         
@@ -211,7 +209,7 @@ def get_student_current_enrollments(student_id):
                 return jsonify({'error': 'Access denied'}), 403
         
         # Get current semester
-        current_semester = Semester.query.filter_by(is_current=True).first()
+        current_semester = reference_cache.current_semester()
         if not current_semester:
             return jsonify({'error': 'No current semester set'}), 404
         
@@ -244,7 +242,7 @@ def get_course_enrolled_students(course_id):
             query = query.filter_by(semester_id=semester_id)
         else:
             # Default to current semester
-            current_semester = Semester.query.filter_by(is_current=True).first()
+            current_semester = reference_cache.current_semester()
             if current_semester:
                 query = query.filter_by(semester_id=current_semester.id)
         
@@ -272,61 +270,57 @@ def bulk_enroll_students():
             return jsonify({'error': 'student_ids must be a non-empty list'}), 400
         
         # Check if course exists
-        course = Course.query.get(data['course_id'])
+        course = reference_cache.courses.get(data['course_id'])
         if not course or not course.is_active:
             return jsonify({'error': 'Course not found or inactive'}), 404
         
         # Check if semester exists
-        semester = Semester.query.get(data['semester_id'])
+        semester = reference_cache.semesters.get(data['semester_id'])
         if not semester:
             return jsonify({'error': 'Semester not found'}), 404
         
-        successful_enrollments = []
-        failed_enrollments = []
-        
+        # Parse ids up front; malformed ids fail without touching the database
+        parsed_ids = []
         for student_id in data['student_ids']:
             try:
-                # Check if student exists
-                student = Student.query.get(student_id)
-                if not student:
-                    failed_enrollments.append({
-                        'student_id': student_id,
-                        'error': 'Student not found'
-                    })
-                    continue
-                
-                # Check if enrollment already exists
-                existing = StudentEnrollment.query.filter_by(
-                    student_id=student_id,
-                    course_id=data['course_id'],
-                    semester_id=data['semester_id']
-                ).first()
-                if existing:
-                    failed_enrollments.append({
-                        'student_id': student_id,
-                        'error': 'Enrollment already exists'
-                    })
+                parsed_ids.append(uuid.UUID(str(student_id)))
+            except ValueError:
+                parsed_ids.append(None)
+        requested = {parsed for parsed in parsed_ids if parsed is not None}
+        
+        # One IN query validates every id
+        existing_students = set(db.session.execute(
+            db.select(Student.id).where(Student.id.in_(list(requested)))
+        ).scalars()) if requested else set()
+        
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING enrolls everyone not already enrolled
+        enrolled = StudentEnrollment.insert_missing(
+            existing_students, course.id, semester.id, enrolled_by=current_user.id
+        )
+        
+        # Per-id outcomes are set differences, reported in request order
+        successful_enrollments = []
+        failed_enrollments = []
+        seen = set()
+        for student_id, parsed in zip(data['student_ids'], parsed_ids):
+            if parsed is None:
+                error = 'Invalid student id'
+            elif parsed in seen:
+                error = 'Duplicate student id in request'
+            else:
+                seen.add(parsed)
+                if parsed in enrolled:
+                    successful_enrollments.append(student_id)
                     continue
-                
-                # Create enrollment
-                enrollment = StudentEnrollment(
-                    student_id=student_id,
-                    course_id=data['course_id'],
-                    semester_id=data['semester_id'],
-                    enrollment_status='enrolled',
-                    enrolled_by=current_user.id
-                )
-                
-                db.session.add(enrollment)
-                successful_enrollments.append(student_id)
-                
-            except Exception as e:
-                failed_enrollments.append({
-                    'student_id': student_id,
-                    'error': str(e)
-                })
+                error = 'Student not found' if parsed not in existing_students else 'Enrollment already exists'
+            failed_enrollments.append({
+                'student_id': student_id,
+                'error': error
+            })
         
         db.session.commit()
+        if successful_enrollments:
+            read_models.enrollments_changed()
         
         return jsonify({
             'message': f'Bulk enrollment completed. {len(successful_enrollments)} successful, {len(failed_enrollments)} failed',
@@ -345,7 +339,7 @@ def bulk_enroll_students():
 def get_enrollment_statistics():
     try:
         # Get current semester
-        current_semester = Semester.query.filter_by(is_current=True).first()
+        current_semester = reference_cache.current_semester()
         
         # Total enrollments
         total_enrollments = StudentEnrollment.query.count()
@@ -6,6 +6,9 @@ from models.user import User
 from models.department import Department
 from utils.decorators import admin_required, lecturer_required, get_current_user
 from utils.validators import validate_required_fields, validate_matricle_number, validate_phone_number, ValidationError
+from utils.pagination import paginate, CursorError
+from utils.reference_cache import reference_cache
+from utils.search_index import student_directory, student_directory_entry, text_match, MATRICLE_PREFIX
 
 students_bp = Blueprint('students', __name__)
 
@@ -13,8 +16,6 @@ students_bp = Blueprint('students', __name__)
 @lecturer_required
 def get_all_students():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         department_id = request.args.get('department_id')
         level = request.args.get('level')
         search = request.args.get('search')
@@ -35,20 +36,62 @@ def get_all_students():
                 )
             )
         
-        students = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        students, pagination = paginate(query, Student.matricle_number, Student.id, descending=False)
+        
+        return jsonify({
+            'students': [student.to_dict() for student in students],
+            'pagination': pagination
+        }), 200
+        
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@students_bp.route('/search', methods=['GET'])
+@lecturer_required
+def search_students():
+    """Ranked directory search by name or matricle number prefix (FE22A2...)"""
+    try:
+        term = (request.args.get('q') or '').strip()
+        department_id = request.args.get('department_id')
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        
+        if not term:
+            return jsonify({'error': 'Query parameter q is required'}), 400
+        
+        # Department-scoped typeahead can be served from the in-memory directory
+        if department_id:
+            if not reference_cache.departments.get(department_id):
+                return jsonify({'error': 'Department not found'}), 404
+            students = student_directory.search(department_id, term, limit)
+            if students is not None:
+                return jsonify({'query': term, 'students': students, 'source': 'index'}), 200
+        
+        columns = (Student.id, Student.matricle_number, Student.full_name, Student.department_id, Student.level)
+        base = db.session.query(*columns).join(User, User.id == Student.user_id).filter(User.is_active == True)
+        if department_id:
+            base = base.filter(Student.department_id == department_id)
+        
+        rows = []
+        if MATRICLE_PREFIX.match(term.upper()):
+            # Served by the upper(matricle_number) text_pattern_ops index
+            rows = base.filter(
+                db.func.upper(Student.matricle_number).like(f'{term.upper()}%')
+            ).order_by(Student.matricle_number).limit(limit).all()
+        
+        if len(rows) < limit:
+            condition, rank = text_match(term, [Student.full_name])
+            query = base.filter(condition)
+            if rows:
+                query = query.filter(Student.id.notin_([row.id for row in rows]))
+            order = [rank.desc(), Student.full_name] if rank is not None else [Student.full_name]
+            rows += query.order_by(*order).limit(limit - len(rows)).all()
         
         return jsonify({
-            'students': [student.to_dict() for student in students.items],
-            'pagination': {
-                'page': students.page,
-                'pages': students.pages,
-                'per_page': students.per_page,
-                'total': students.total,
-                'has_next': students.has_next,
-                'has_prev': students.has_prev
-            }
+            'query': term,
+            'students': [student_directory_entry(row) for row in rows],
+            'source': 'database'
         }), 200
         
     except Exception as e:
@@ -130,7 +173,7 @@ def create_student():
             return jsonify({'error': 'Student profile already exists for this user'}), 409
         
         # Check if department exists
-        department = Department.query.get(data['department_id'])
+        department = reference_cache.departments.get(data['department_id'])
         if not department:
             return jsonify({'error': 'Department not found'}), 404
         
@@ -150,6 +193,7 @@ def create_student():
         
         db.session.add(student)
         db.session.commit()
+        student_directory.invalidate(student.department_id)
         
         return jsonify({
             'message': 'Student created successfully',
@@ -178,6 +222,7 @@ def update_student(student_id):
             return jsonify({'error': 'Access denied'}), 403
         
         data = request.get_json()
+        previous_department_id = student.department_id
         
         # Fields students can update themselves
         student_updatable_fields = [
@@ -224,6 +269,8 @@ def update_student(student_id):
             student.is_face_registered = bool(data['face_encoding_data'])
         
         db.session.commit()
+        student_directory.invalidate(previous_department_id)
+        student_directory.invalidate(student.department_id)
         
         return jsonify({
             'message': 'Student updated successfully',
@@ -251,6 +298,7 @@ def delete_student(student_id):
             user.is_active = False
         
         db.session.commit()
+        student_directory.invalidate(student.department_id)
         
         return jsonify({'message': 'Student deactivated successfully'}), 200
         
@@ -5,10 +5,29 @@ from models.system_setting import SystemSetting
 from models.admin import Admin
 from utils.decorators import admin_required, get_current_user
 from utils.validators import validate_required_fields, ValidationError
+from utils.http_cache import conditional_get
+from utils.settings_cache import settings_cache
 import json
 
 system_settings_bp = Blueprint('system_settings', __name__)
 
+def _invalid_value_error(setting_key, setting_type, setting_value):
+    """Error message if the value does not fit the setting type, else None"""
+    if setting_type == 'number':
+        try:
+            float(setting_value)
+        except (ValueError, TypeError):
+            return f'Setting {setting_key} must be a valid number'
+    elif setting_type == 'boolean':
+        if setting_value not in ['true', 'false', True, False]:
+            return f'Setting {setting_key} must be true or false'
+    elif setting_type == 'json':
+        try:
+            json.loads(setting_value) if isinstance(setting_value, str) else setting_value
+        except (json.JSONDecodeError, TypeError):
+            return f'Setting {setting_key} must be valid JSON'
+    return None
+
 @system_settings_bp.route('', methods=['GET'])
 @jwt_required()
 def get_all_system_settings():
@@ -17,12 +36,12 @@ def get_all_system_settings():
         
         # Non-admin users can only see public settings
         if current_user.user_type != 'admin':
-            settings = SystemSetting.query.filter_by(is_public=True).all()
+            settings = settings_cache.public_settings()
         else:
-            settings = SystemSetting.query.all()
+            settings = settings_cache.all_settings()
         
         return jsonify({
-            'system_settings': [setting.to_dict() for setting in settings]
+            'system_settings': settings
         }), 200
         
     except Exception as e:
@@ -33,7 +52,7 @@ def get_all_system_settings():
 def get_system_setting(setting_key):
     try:
         current_user = get_current_user()
-        setting = SystemSetting.query.filter_by(setting_key=setting_key).first()
+        setting = settings_cache.get_setting(setting_key)
         
         if not setting:
             return jsonify({'error': 'System setting not found'}), 404
@@ -42,7 +61,7 @@ def get_system_setting(setting_key):
         if not setting.is_public and current_user.user_type != 'admin':
             return jsonify({'error': 'Access denied'}), 403
         
-        return jsonify({'system_setting': setting.to_dict()}), 200
+        return jsonify({'system_setting': setting.data}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -98,6 +117,7 @@ def create_system_setting():
         
         db.session.add(setting)
         db.session.commit()
+        settings_cache.bump()
         
         return jsonify({
             'message': 'System setting created successfully',
@@ -156,6 +176,7 @@ def update_system_setting(setting_key):
             setting.updated_by = admin_profile.id
         
         db.session.commit()
+        settings_cache.bump()
         
         return jsonify({
             'message': 'System setting updated successfully',
@@ -177,6 +198,7 @@ def delete_system_setting(setting_key):
         
         db.session.delete(setting)
         db.session.commit()
+        settings_cache.bump()
         
         return jsonify({'message': 'System setting deleted successfully'}), 200
         
@@ -202,42 +224,36 @@ def bulk_update_settings():
         updated_settings = []
         created_settings = []
         
+        # One IN query for every key in the request
+        existing = {
+            setting.setting_key: setting
+            for setting in SystemSetting.query.filter(SystemSetting.setting_key.in_(list(settings_data.keys()))).all()
+        }
+        
+        rows = []
         for setting_key, setting_value in settings_data.items():
-            setting = SystemSetting.query.filter_by(setting_key=setting_key).first()
+            setting = existing.get(setting_key)
             
             if setting:
-                # Update existing setting
                 # Validate based on existing type
-                if setting.setting_type == 'number':
-                    try:
-                        float(setting_value)
-                    except ValueError:
-                        return jsonify({'error': f'Setting {setting_key} must be a valid number'}), 400
-                elif setting.setting_type == 'boolean':
-                    if setting_value not in ['true', 'false', True, False]:
-                        return jsonify({'error': f'Setting {setting_key} must be true or false'}), 400
-                elif setting.setting_type == 'json':
-                    try:
-                        json.loads(setting_value) if isinstance(setting_value, str) else setting_value
-                    except (json.JSONDecodeError, TypeError):
-                        return jsonify({'error': f'Setting {setting_key} must be valid JSON'}), 400
-                
-                setting.setting_value = str(setting_value)
-                if admin_profile:
-                    setting.updated_by = admin_profile.id
+                error = _invalid_value_error(setting_key, setting.setting_type, setting_value)
+                if error:
+                    return jsonify({'error': error}), 400
                 updated_settings.append(setting_key)
             else:
-                # Create new setting (default to string type)
-                new_setting = SystemSetting(
-                    setting_key=setting_key,
-                    setting_value=str(setting_value),
-                    setting_type='string',
-                    updated_by=admin_profile.id if admin_profile else None
-                )
-                db.session.add(new_setting)
+                # New settings default to string type
                 created_settings.append(setting_key)
-        
+            
+            rows.append({
+                'setting_key': setting_key,
+                'setting_value': str(setting_value),
+                'updated_by': admin_profile.id if admin_profile else None
+            })
+        
+        # Single INSERT ... ON CONFLICT for creates and updates alike
+        SystemSetting.upsert(rows)
         db.session.commit()
+        settings_cache.bump()
         
         return jsonify({
             'message': f'Bulk update completed. Updated: {len(updated_settings)}, Created: {len(created_settings)}',
@@ -250,13 +266,12 @@ def bulk_update_settings():
         return jsonify({'error': str(e)}), 500
 
 @system_settings_bp.route('/public', methods=['GET'])
+@conditional_get('system_settings', public=True)
 def get_public_settings():
     """Get public settings without authentication"""
     try:
-        settings = SystemSetting.query.filter_by(is_public=True).all()
-        
         return jsonify({
-            'public_settings': [setting.to_dict() for setting in settings]
+            'public_settings': settings_cache.public_settings()
         }), 200
         
     except Exception as e:
@@ -301,30 +316,27 @@ def reset_to_defaults():
             'attendance.auto_end_minutes': '120',
             'geofence.default_radius_meters': '50',
             'notifications.enabled': 'true',
-            'face_recognition.confidence_threshold': '0.8'
+            'face_recognition.confidence_threshold': '0.8',
+            'auth.login_rate_limit_enabled': 'true',
+            'auth.login_email_burst': '5',
+            'auth.login_email_per_minute': '5',
+            'auth.login_ip_burst': '20',
+            'auth.login_ip_per_minute': '30'
         }
         
-        reset_count = 0
-        for key, value in default_settings.items():
-            setting = SystemSetting.query.filter_by(setting_key=key).first()
-            if setting:
-                setting.setting_value = value
-                if admin_profile:
-                    setting.updated_by = admin_profile.id
-                reset_count += 1
-            else:
-                # Create if doesn't exist
-                new_setting = SystemSetting(
-                    setting_key=key,
-                    setting_value=value,
-                    setting_type='string',
-                    description=f'Default setting for {key}',
-                    updated_by=admin_profile.id if admin_profile else None
-                )
-                db.session.add(new_setting)
-                reset_count += 1
-        
+        # Existing rows keep their type/description; missing ones are created as strings
+        SystemSetting.upsert([
+            {
+                'setting_key': key,
+                'setting_value': value,
+                'description': f'Default setting for {key}',
+                'updated_by': admin_profile.id if admin_profile else None
+            }
+            for key, value in default_settings.items()
+        ])
+        reset_count = len(default_settings)
         db.session.commit()
+        settings_cache.bump()
         
         return jsonify({
             'message': f'Reset {reset_count} settings to default values'
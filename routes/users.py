@@ -1,10 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from models.user import User
 from models.user_preference import UserPreference
 from utils.decorators import admin_required, get_current_user
 from utils.validators import ValidationError
+from utils.pagination import paginate, CursorError
+from utils.search_index import student_directory
+from utils.dashboard_stats import dashboard_stats
+from utils.bulk_provisioning import BulkProvisioner
 
 users_bp = Blueprint('users', __name__)
 
@@ -12,8 +16,6 @@ users_bp = Blueprint('users', __name__)
 @admin_required
 def get_all_users():
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
         user_type = request.args.get('type')
         search = request.args.get('search')
         
@@ -25,25 +27,58 @@ def get_all_users():
         if search:
             query = query.filter(User.email.ilike(f'%{search}%'))
         
-        users = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        users, pagination = paginate(query, User.created_at, User.id)
         
         return jsonify({
-            'users': [user.to_dict() for user in users.items],
-            'pagination': {
-                'page': users.page,
-                'pages': users.pages,
-                'per_page': users.per_page,
-                'total': users.total,
-                'has_next': users.has_next,
-                'has_prev': users.has_prev
-            }
+            'users': [user.to_dict() for user in users],
+            'pagination': pagination
         }), 200
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@users_bp.route('/bulk-provision', methods=['POST'])
+@admin_required
+def bulk_provision_users():
+    """
+    Create users with student or lecturer profiles in one batch.
+    Body: {"users": [{email, user_type, full_name, ...}, ...]}. Failures are
+    reported per entry and the rest are still created. Password hashing runs
+    within the request, so large intakes should be sent in several batches.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        entries = data.get('users')
+
+        if not isinstance(entries, list) or not entries:
+            return jsonify({'error': 'users must be a non-empty list'}), 400
+
+        max_users = current_app.config.get('BULK_PROVISION_MAX_USERS', 500)
+        if len(entries) > max_users:
+            return jsonify({'error': f'At most {max_users} users can be provisioned per request'}), 400
+
+        provisioner = BulkProvisioner(hash_processes=current_app.config.get('BULK_PROVISION_HASH_PROCESSES') or None)
+        result = provisioner.run(entries)
+
+        if any(item['user_type'] == 'student' for item in result['created']):
+            student_directory.invalidate()
+        if result['created']:
+            dashboard_stats.invalidate()
+
+        print(f"👥 Bulk provisioning: {len(result['created'])} created, {len(result['failed'])} failed "
+              f"({result['throughput']['users_per_second']} users/s)")
+
+        return jsonify(dict(
+            result,
+            message=f"{len(result['created'])} users created, {len(result['failed'])} failed"
+        )), 201 if result['created'] else 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @users_bp.route('/<user_id>', methods=['GET'])
 @jwt_required()
 def get_user(user_id):
@@ -90,6 +125,8 @@ def update_user(user_id):
             user.email_verified = data['email_verified']
         
         db.session.commit()
+        if 'is_active' in data and user.user_type == 'student':
+            student_directory.invalidate()
         
         return jsonify({
             'message': 'User updated successfully',
@@ -112,6 +149,8 @@ def delete_user(user_id):
         # Soft delete - deactivate instead of deleting
         user.is_active = False
         db.session.commit()
+        if user.user_type == 'student':
+            student_directory.invalidate()
         
         return jsonify({'message': 'User deactivated successfully'}), 200
         
@@ -61,7 +61,7 @@ def create_admin_user():
     """Create a default admin user if none exists."""
     from models.user import User
     from models.admin import Admin
-    from app import bcrypt
+    from utils.password_hasher import password_hasher
     
     app = create_app()
     with app.app_context():
@@ -73,7 +73,7 @@ def create_admin_user():
                 # Create admin user
                 admin_user = User(
                     email='admin@attendease.com',
-                    password_hash=bcrypt.generate_password_hash('AdminPass123').decode('utf-8'),
+                    password_hash=password_hasher.hash_password('AdminPass123'),
                     user_type='admin',
                     email_verified=True
                 )
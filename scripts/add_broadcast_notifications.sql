@@ -0,0 +1,29 @@
+-- Fan-out-on-read broadcast notifications
+-- One row per broadcast; broadcast_receipts only holds users who read or dismissed it
+
+CREATE TABLE IF NOT EXISTS broadcast_notifications (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    sender_id UUID REFERENCES users(id) ON DELETE SET NULL,
+    target_user_type VARCHAR(20) NOT NULL DEFAULT 'all', -- 'all', 'student', 'lecturer', 'admin'
+    notification_type notification_type_enum NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    message TEXT NOT NULL,
+    data JSONB,
+    expires_at TIMESTAMP NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_broadcast_notifications_target_created
+    ON broadcast_notifications(target_user_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_broadcast_notifications_created_at
+    ON broadcast_notifications(created_at);
+
+CREATE TABLE IF NOT EXISTS broadcast_receipts (
+    broadcast_id UUID NOT NULL REFERENCES broadcast_notifications(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    read_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    dismissed_at TIMESTAMP NULL,
+    PRIMARY KEY (broadcast_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_broadcast_receipts_user ON broadcast_receipts(user_id);
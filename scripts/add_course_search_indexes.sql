@@ -0,0 +1,8 @@
+-- Trigram indexes for GET /api/courses/search. They serve similarity (%) and
+-- ILIKE '%term%' matches on titles and codes without a sequential scan.
+-- CONCURRENTLY avoids blocking writes; run outside a transaction.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_title_trgm ON courses USING gin (course_title gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_code_trgm ON courses USING gin (course_code gin_trgm_ops);
@@ -0,0 +1,14 @@
+-- Composite indexes matching the (sort column, id) order used by keyset pagination
+-- (?after= cursors). CONCURRENTLY avoids blocking writes; run outside a transaction.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_attendance_records_check_in_id ON attendance_records(check_in_time DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_attendance_records_student_check_in_id ON attendance_records(student_id, check_in_time DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_attendance_sessions_started_id ON attendance_sessions(started_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_recipient_created_id ON notifications(recipient_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_student_enrollments_date_id ON student_enrollments(enrollment_date DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_course_assignments_assigned_id ON course_assignments(assigned_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_id ON users(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_matricle_id ON students(matricle_number, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_lecturers_created_id ON lecturers(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_admins_created_id ON admins(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_courses_code_id ON courses(course_code, id);
@@ -0,0 +1,55 @@
+-- Materialized read model behind GET /api/dashboard/lecturer
+-- Same SELECT as the lecturer_dashboard view, so it also works where that view was never created.
+-- Refreshed CONCURRENTLY by the API (debounced) after session and enrollment changes.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS lecturer_dashboard_mv AS
+SELECT
+    l.id AS lecturer_id,
+    l.lecturer_id AS lecturer_staff_id,
+    l.full_name AS lecturer_name,
+    c.course_code,
+    c.course_title,
+    d.name AS department_name,
+    ca.id AS course_assignment_id,
+    ga.name AS classroom_name,
+    sem.name AS semester_name,
+    ay.year_name,
+    (
+        SELECT COUNT(*)
+        FROM student_enrollments se
+        WHERE se.course_id = c.id
+        AND se.semester_id = sem.id
+        AND se.enrollment_status = 'enrolled'
+    ) AS enrolled_students,
+    CASE
+        WHEN EXISTS (
+            SELECT 1 FROM attendance_sessions ats
+            WHERE ats.course_assignment_id = ca.id
+            AND ats.session_status = 'active'
+        ) THEN true
+        ELSE false
+    END AS has_active_session,
+    (
+        SELECT COUNT(*)
+        FROM attendance_sessions ats
+        WHERE ats.course_assignment_id = ca.id
+        AND ats.session_status = 'ended'
+    ) AS total_sessions
+FROM lecturers l
+JOIN course_assignments ca ON l.id = ca.lecturer_id
+JOIN courses c ON ca.course_id = c.id
+JOIN departments d ON c.department_id = d.id
+JOIN semesters sem ON ca.semester_id = sem.id
+JOIN academic_years ay ON sem.academic_year_id = ay.id
+LEFT JOIN geofence_areas ga ON ca.geofence_area_id = ga.id
+WHERE ca.is_active = true
+AND sem.is_current = true
+WITH DATA;
+
+-- One row per active course assignment; required by REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lecturer_dashboard_mv_assignment
+    ON lecturer_dashboard_mv(course_assignment_id);
+
+-- Lookups by lecturer from the dashboard endpoint
+CREATE INDEX IF NOT EXISTS idx_lecturer_dashboard_mv_lecturer
+    ON lecturer_dashboard_mv(lecturer_id);
@@ -0,0 +1,10 @@
+-- Per-user unread notification counters (seeded lazily by the API, reconciled by the scheduler)
+
+CREATE TABLE IF NOT EXISTS notification_counters (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    unread_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Supports the reconciliation subquery and unread filters
+CREATE INDEX IF NOT EXISTS idx_notifications_recipient_unread ON notifications(recipient_id, is_read);
@@ -0,0 +1,22 @@
+-- Progress and error report of CSV roster uploads (POST /api/roster-imports)
+-- Counters are committed with every merged chunk so long uploads can be polled
+
+CREATE TABLE IF NOT EXISTS roster_imports (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    status VARCHAR(20) NOT NULL DEFAULT 'running', -- 'running', 'completed', 'failed'
+    filename VARCHAR(255),
+    semester_id UUID REFERENCES semesters(id) ON DELETE SET NULL,
+    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    rows_processed INTEGER NOT NULL DEFAULT 0,
+    rows_failed INTEGER NOT NULL DEFAULT 0,
+    users_created INTEGER NOT NULL DEFAULT 0,
+    students_created INTEGER NOT NULL DEFAULT 0,
+    students_existing INTEGER NOT NULL DEFAULT 0,
+    enrollments_created INTEGER NOT NULL DEFAULT 0,
+    errors JSONB,
+    error_message TEXT,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_roster_imports_started_at ON roster_imports(started_at);
@@ -0,0 +1,65 @@
+-- Materialized read model behind GET /api/dashboard/student
+-- The student_dashboard view's SELECT, so it also works where that view was never created,
+-- restricted to active assignments in the enrollment's semester (earlier or deactivated
+-- assignments of the same course would otherwise add one row each).
+-- Refreshed CONCURRENTLY by the API after sessions start, end or are cancelled.
+-- Re-runnable: the view only holds derived data, so it is dropped and rebuilt.
+
+DROP MATERIALIZED VIEW IF EXISTS student_dashboard_mv;
+
+CREATE MATERIALIZED VIEW student_dashboard_mv AS
+SELECT
+    s.id AS student_id,
+    s.matricle_number,
+    s.full_name AS student_name,
+    c.course_code,
+    c.course_title,
+    c.credit_units,
+    d.name AS department_name,
+    l.full_name AS lecturer_name,
+    ca.id AS course_assignment_id,
+    sem.name AS semester_name,
+    ay.year_name,
+    CASE
+        WHEN EXISTS (
+            SELECT 1 FROM attendance_sessions ats
+            WHERE ats.course_assignment_id = ca.id
+            AND ats.session_status = 'active'
+        ) THEN true
+        ELSE false
+    END AS has_active_session,
+    (
+        SELECT COUNT(*)
+        FROM attendance_records ar
+        JOIN attendance_sessions ats ON ar.session_id = ats.id
+        WHERE ar.student_id = s.id
+        AND ats.course_assignment_id = ca.id
+        AND ar.attendance_status IN ('present', 'late')
+    ) AS classes_attended,
+    (
+        SELECT COUNT(*)
+        FROM attendance_sessions ats
+        WHERE ats.course_assignment_id = ca.id
+        AND ats.session_status = 'ended'
+    ) AS total_classes
+FROM students s
+JOIN student_enrollments se ON s.id = se.student_id
+JOIN courses c ON se.course_id = c.id
+JOIN course_assignments ca ON c.id = ca.course_id
+    AND ca.semester_id = se.semester_id
+    AND ca.is_active = true
+JOIN lecturers l ON ca.lecturer_id = l.id
+JOIN departments d ON c.department_id = d.id
+JOIN semesters sem ON se.semester_id = sem.id
+JOIN academic_years ay ON sem.academic_year_id = ay.id
+WHERE se.enrollment_status = 'enrolled'
+AND sem.is_current = true
+WITH DATA;
+
+-- Unique index required by REFRESH ... CONCURRENTLY; its leading column serves lookups by student_id
+CREATE UNIQUE INDEX IF NOT EXISTS idx_student_dashboard_mv_student
+    ON student_dashboard_mv(student_id, course_assignment_id);
+
+-- Supports the per-course subqueries evaluated on every refresh
+CREATE INDEX IF NOT EXISTS idx_attendance_sessions_assignment_status
+    ON attendance_sessions(course_assignment_id, session_status);
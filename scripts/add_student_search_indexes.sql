@@ -0,0 +1,9 @@
+-- Indexes for GET /api/students/search. The trigram index serves similarity (%)
+-- and ILIKE '%term%' on names; the text_pattern_ops index serves matricle
+-- prefixes (upper(matricle_number) LIKE 'FE22A%') under any collation.
+-- CONCURRENTLY avoids blocking writes; run outside a transaction.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_full_name_trgm ON students USING gin (full_name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_students_matricle_prefix ON students (upper(matricle_number) text_pattern_ops);
@@ -0,0 +1,7 @@
+-- Per-table data versions behind the ETags of read-mostly endpoints (bumped by the API on every write)
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Bulk enrollment benchmark
+Creates throwaway students, a course and a semester, then times
+POST /api/student-enrollments/bulk-enroll for the whole list (fresh inserts)
+and again for the same list (every id already enrolled). Everything the run
+created is deleted afterwards. Point DATABASE_URL at a scratch database.
+
+Usage:
+    python scripts/benchmark_bulk_enroll.py --students 5000
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import app, db
+from models.user import User
+from models.student import Student
+from models.department import Department
+from models.course import Course
+from models.academic_year import AcademicYear
+from models.semester import Semester
+from models.student_enrollment import StudentEnrollment
+
+
+def create_fixtures(count):
+    """Insert the admin, reference rows and `count` students with bulk statements"""
+    tag = uuid.uuid4().hex[:6].upper()
+    admin = User(email=f'bench-admin-{tag}@ubuea.cm', password_hash='x', user_type='admin')
+    department = Department(name=f'Benchmark {tag}', code=f'B{tag}')
+    db.session.add_all([admin, department])
+    db.session.flush()
+    course = Course(course_code=f'CEF{tag[:3]}', course_title='Benchmark Course',
+                    department_id=department.id, level='200')
+    year = AcademicYear(year_name=f'B{tag}', start_date=date(2030, 1, 1), end_date=date(2030, 12, 31))
+    db.session.add_all([course, year])
+    db.session.flush()
+    semester = Semester(academic_year_id=year.id, semester_number=1, name=f'Benchmark {tag}',
+                        start_date=date(2030, 1, 1), end_date=date(2030, 6, 30))
+    db.session.add(semester)
+
+    users, students = [], []
+    for i in range(count):
+        user_id, student_id = uuid.uuid4(), uuid.uuid4()
+        users.append({'id': user_id, 'email': f'bench-{tag}-{i}@ubuea.cm', 'password_hash': 'x',
+                      'user_type': 'student', 'is_active': True})
+        students.append({'id': student_id, 'user_id': user_id, 'matricle_number': f'B{tag}{i:06d}',
+                         'full_name': f'Benchmark Student {i}', 'department_id': department.id,
+                         'level': '200', 'gender': 'Male', 'enrollment_year': 2030})
+    db.session.execute(User.__table__.insert(), users)
+    db.session.execute(Student.__table__.insert(), students)
+    db.session.commit()
+    return {
+        'admin': admin, 'department': department, 'course': course, 'year': year,
+        'semester': semester, 'user_ids': [u['id'] for u in users], 'student_ids': [s['id'] for s in students]
+    }
+
+
+def delete_fixtures(fixtures):
+    student_ids = fixtures['student_ids']
+    StudentEnrollment.query.filter(StudentEnrollment.course_id == fixtures['course'].id).delete(synchronize_session=False)
+    for start in range(0, len(student_ids), 1000):
+        Student.query.filter(Student.id.in_(student_ids[start:start + 1000])).delete(synchronize_session=False)
+        User.query.filter(User.id.in_(fixtures['user_ids'][start:start + 1000])).delete(synchronize_session=False)
+    for name in ('semester', 'course', 'year', 'department', 'admin'):
+        db.session.delete(fixtures[name])
+    db.session.commit()
+
+
+def timed_enroll(client, headers, payload):
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    start = time.perf_counter()
+    response = client.post('/api/student-enrollments/bulk-enroll', headers=headers, json=payload)
+    elapsed = time.perf_counter() - start
+    event.remove(db.engine, 'before_cursor_execute', count)
+    body = response.get_json()
+    return elapsed, len(statements), len(body.get('successful_enrollments', [])), len(body.get('failed_enrollments', []))
+
+
+def benchmark(count):
+    with app.app_context():
+        print("📚 Bulk enrollment benchmark")
+        print(f"   Students: {count} | Database: {db.engine.dialect.name}")
+        print("=" * 64)
+        fixtures = create_fixtures(count)
+        try:
+            headers = {'Authorization': f"Bearer {create_access_token(identity=str(fixtures['admin'].id))}"}
+            payload = {
+                'student_ids': [str(student_id) for student_id in fixtures['student_ids']],
+                'course_id': str(fixtures['course'].id),
+                'semester_id': str(fixtures['semester'].id)
+            }
+            client = app.test_client()
+            print(f"{'run':<18} {'seconds':>8} {'queries':>8} {'enrolled':>9} {'failed':>7}")
+            for label in ('fresh inserts', 'all duplicates'):
+                elapsed, queries, enrolled, failed = timed_enroll(client, headers, payload)
+                print(f"{label:<18} {elapsed:>8.3f} {queries:>8} {enrolled:>9} {failed:>7}")
+        finally:
+            db.session.rollback()
+            delete_fixtures(fixtures)
+
+    print("=" * 64)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark set-based bulk enrollment')
+    parser.add_argument('--students', type=int, default=5000)
+    args = parser.parse_args()
+
+    benchmark(args.students)
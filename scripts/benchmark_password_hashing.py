@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark for the password hashing pool
+Measures verify (login) and hash (registration) throughput at several bcrypt
+cost factors so BCRYPT_LOG_ROUNDS and PASSWORD_HASH_WORKERS can be tuned.
+
+Usage:
+    python scripts/benchmark_password_hashing.py --rounds 10 11 12 13 --workers 2 --clients 16
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.password_hasher import PasswordHasher, HashingBusyError
+
+PASSWORD = 'BenchmarkPass123'
+
+
+def run_logins(hasher, pw_hash, clients, logins):
+    """Fire `logins` verifications from `clients` concurrent request threads"""
+
+    def login(_):
+        try:
+            return hasher.verify_password(PASSWORD, pw_hash)
+        except HashingBusyError:
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+
+    rejected = sum(1 for r in results if r is None)
+    failed = sum(1 for r in results if r is False)
+    return elapsed, rejected, failed
+
+
+def benchmark(rounds_list, workers, max_queue, clients, logins):
+    print("🔐 Password hashing benchmark")
+    print(f"   Workers: {workers} | Max queue: {max_queue} | Clients: {clients} | Logins per cost: {logins}")
+    print("=" * 72)
+    print(f"{'cost':>4} {'hash ms':>9} {'verify ms':>10} {'logins/s':>10} {'rejected':>9} {'failed':>7}")
+
+    for rounds in rounds_list:
+        hasher = PasswordHasher()
+        hasher.configure(method='bcrypt', rounds=rounds, workers=workers,
+                         max_queue=max_queue, timeout=120)
+
+        start = time.perf_counter()
+        pw_hash = hasher.hash_password(PASSWORD)
+        hash_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        hasher.verify_password(PASSWORD, pw_hash)
+        verify_ms = (time.perf_counter() - start) * 1000
+
+        elapsed, rejected, failed = run_logins(hasher, pw_hash, clients, logins)
+        accepted = logins - rejected
+        throughput = accepted / elapsed if elapsed else 0
+
+        print(f"{rounds:>4} {hash_ms:>9.1f} {verify_ms:>10.1f} {throughput:>10.1f} {rejected:>9} {failed:>7}")
+        hasher.shutdown()
+
+    print("=" * 72)
+    print("ℹ️  Rejected logins would receive 503 + Retry-After from /api/auth/login")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark password hashing throughput')
+    parser.add_argument('--rounds', type=int, nargs='+', default=[10, 11, 12, 13])
+    parser.add_argument('--workers', type=int, default=int(os.getenv('PASSWORD_HASH_WORKERS', '2')))
+    parser.add_argument('--max-queue', type=int, default=int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '16')))
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=64)
+    args = parser.parse_args()
+
+    benchmark(args.rounds, args.workers, args.max_queue, args.clients, args.logins)
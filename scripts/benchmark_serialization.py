@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for attendance records
+Inserts throwaway attendance records and compares two pipelines, stage by stage:
+ORM query + to_dict() + Flask's default JSON provider (before), and select()
+tuples + the compiled RowSerializer + OrjsonProvider (after). The run happens
+in one transaction that is rolled back, so nothing is left behind. Point
+DATABASE_URL at a scratch database.
+
+Usage:
+    python scripts/benchmark_serialization.py --records 10000 --repeat 3
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from app import app, db
+from models.user import User
+from models.admin import Admin
+from models.lecturer import Lecturer
+from models.student import Student
+from models.department import Department
+from models.course import Course
+from models.academic_year import AcademicYear
+from models.semester import Semester
+from models.geofence_area import GeofenceArea
+from models.course_assignment import CourseAssignment
+from models.attendance_session import AttendanceSession
+from models.attendance_record import AttendanceRecord
+from utils.serialization import model_serializer, OrjsonProvider
+
+
+def create_fixtures(count):
+    """Insert the reference rows, sessions, students and `count` records; returns the session ids"""
+    tag = uuid.uuid4().hex[:6].upper()
+    admin_user = User(email=f'bench-admin-{tag}@ubuea.cm', password_hash='x', user_type='admin')
+    lecturer_user = User(email=f'bench.lecturer{tag.lower()}@ubuea.cm', password_hash='x', user_type='lecturer')
+    department = Department(name=f'Benchmark {tag}', code=f'B{tag}')
+    year = AcademicYear(year_name=f'B{tag}', start_date=date(2030, 1, 1), end_date=date(2030, 12, 31))
+    geofence = GeofenceArea(name=f'Benchmark {tag}', center_latitude=Decimal('4.15'), center_longitude=Decimal('9.28'),
+                            radius_meters=50)
+    db.session.add_all([admin_user, lecturer_user, department, year, geofence])
+    db.session.flush()
+    admin = Admin(user_id=admin_user.id, admin_id=f'BA{tag}', full_name='Benchmark Admin')
+    lecturer = Lecturer(user_id=lecturer_user.id, lecturer_id=f'BL{tag}', full_name='Benchmark Lecturer')
+    course = Course(course_code=f'CEF{tag[:3]}', course_title='Benchmark Course',
+                    department_id=department.id, level='200')
+    semester = Semester(academic_year_id=year.id, semester_number=1, name=f'Benchmark {tag}',
+                        start_date=date(2030, 1, 1), end_date=date(2030, 6, 30))
+    db.session.add_all([admin, lecturer, course, semester])
+    db.session.flush()
+    assignment = CourseAssignment(lecturer_id=lecturer.id, course_id=course.id, semester_id=semester.id,
+                                  geofence_area_id=geofence.id, assigned_by=admin.id)
+    db.session.add(assignment)
+    db.session.flush()
+
+    student_count = min(count, 500)
+    session_count = -(-count // student_count)
+    users, students = [], []
+    for i in range(student_count):
+        user_id = uuid.uuid4()
+        users.append({'id': user_id, 'email': f'bench-{tag}-{i}@gmail.com', 'password_hash': 'x',
+                      'user_type': 'student', 'is_active': True})
+        students.append({'id': uuid.uuid4(), 'user_id': user_id, 'matricle_number': f'B{tag}{i:06d}',
+                         'full_name': f'Benchmark Student {i}', 'department_id': department.id,
+                         'level': '200', 'gender': 'Female', 'enrollment_year': 2030})
+    sessions = [{'id': uuid.uuid4(), 'course_assignment_id': assignment.id, 'geofence_area_id': geofence.id,
+                 'started_by': lecturer.id, 'session_name': f'Benchmark {i}', 'session_status': 'ended',
+                 'started_at': datetime(2030, 2, 1) + timedelta(days=i)} for i in range(session_count)]
+
+    records = []
+    for i in range(count):
+        session, student = sessions[i // student_count], students[i % student_count]
+        records.append({
+            'id': uuid.uuid4(), 'session_id': session['id'], 'student_id': student['id'],
+            'check_in_time': session['started_at'] + timedelta(seconds=i % 900),
+            'attendance_status': 'late' if i % 7 == 0 else 'present', 'check_in_method': 'face_recognition',
+            'face_match_confidence': Decimal('97.25'), 'location_latitude': Decimal('4.15012345'),
+            'location_longitude': Decimal('9.28054321'), 'device_info': {'platform': 'android', 'version': '14'},
+            'is_verified': True, 'created_at': session['started_at']
+        })
+
+    db.session.execute(User.__table__.insert(), users)
+    db.session.execute(Student.__table__.insert(), students)
+    db.session.execute(AttendanceSession.__table__.insert(), sessions)
+    for start in range(0, count, 5000):
+        db.session.execute(AttendanceRecord.__table__.insert(), records[start:start + 5000])
+    db.session.flush()
+    db.session.expunge_all()
+    return [session['id'] for session in sessions]
+
+
+def orm_pipeline(session_ids, provider):
+    rows = AttendanceRecord.query.filter(AttendanceRecord.session_id.in_(session_ids)).all()
+    fetched = time.perf_counter()
+    data = [record.to_dict() for record in rows]
+    serialized = time.perf_counter()
+    body = provider.dumps({'attendance_records': data})
+    db.session.expunge_all()
+    return fetched, serialized, len(data), len(body)
+
+
+def compiled_pipeline(session_ids, provider):
+    serializer = model_serializer(AttendanceRecord)
+    rows = db.session.execute(serializer.select().where(AttendanceRecord.session_id.in_(session_ids))).all()
+    fetched = time.perf_counter()
+    data = serializer.many(rows)
+    serialized = time.perf_counter()
+    body = provider.dumps({'attendance_records': data})
+    return fetched, serialized, len(data), len(body)
+
+
+def best_of(repeat, pipeline, session_ids, provider):
+    """Fastest (query, serialize, encode, rows, bytes) of `repeat` runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetched, serialized, rows, size = pipeline(session_ids, provider)
+        encoded = time.perf_counter()
+        run = (fetched - start, serialized - fetched, encoded - serialized, rows, size)
+        if best is None or sum(run[:3]) < sum(best[:3]):
+            best = run
+    return best
+
+
+def benchmark(count, repeat):
+    with app.app_context():
+        print("🧾 Attendance record serialization benchmark")
+        print(f"   Records: {count} | Repeat: {repeat} | Database: {db.engine.dialect.name}")
+        print("=" * 86)
+        default_provider = DefaultJSONProvider(app)
+        try:
+            fast_provider = OrjsonProvider(app)
+        except ImportError:
+            fast_provider = None
+            print("ℹ️  orjson not installed; the compiled pipeline is measured with the default provider")
+
+        try:
+            session_ids = create_fixtures(count)
+            runs = [
+                ('to_dict + json', orm_pipeline, default_provider),
+                ('compiled + json', compiled_pipeline, default_provider)
+            ]
+            if fast_provider:
+                runs.append(('compiled + orjson', compiled_pipeline, fast_provider))
+
+            print(f"{'pipeline':<20} {'query ms':>9} {'serialize ms':>13} {'encode ms':>10} {'total ms':>9} {'rows/s':>10} {'bytes':>10}")
+            for label, pipeline, provider in runs:
+                query, serialize, encode, rows, size = best_of(repeat, pipeline, session_ids, provider)
+                total = query + serialize + encode
+                print(f"{label:<20} {query * 1000:>9.1f} {serialize * 1000:>13.1f} {encode * 1000:>10.1f} "
+                      f"{total * 1000:>9.1f} {rows / total:>10.0f} {size:>10}")
+        finally:
+            db.session.rollback()
+
+    print("=" * 86)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark attendance record serialization')
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark(args.records, args.repeat)
@@ -0,0 +1,19 @@
+"""
+Unit tests for AttendEase
+Run from the repository root with:
+    python -m unittest discover -s tests -t .
+(The test_*.py scripts in the root exercise a running server and are not part of this suite.)
+
+The app is created on import, so the environment is pinned here first: an
+in-memory SQLite database (TEST_DATABASE_URL overrides it, DATABASE_URL never
+does) and no background scheduler or Postgres bridge. The app module is then
+imported before any utils module, as in production, so create_app() never
+sees a half-imported utils package.
+"""
+import os
+
+os.environ['DATABASE_URL'] = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+os.environ['SCHEDULER_ENABLED'] = 'false'
+os.environ['NOTIFICATION_BUS_BRIDGE'] = 'false'
+
+import app  # noqa: E402,F401
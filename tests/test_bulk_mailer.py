@@ -0,0 +1,79 @@
+import email
+import unittest
+from email.header import decode_header, make_header
+from string import Template
+from unittest import mock
+
+from utils.bulk_mailer import BulkTemplate, escape_template
+
+
+def body_of(payload):
+    """Decoded text of the first plain-text part of a rendered payload"""
+    message = email.message_from_string(payload)
+    for part in message.walk():
+        if part.get_content_type() == 'text/plain':
+            return part.get_payload(decode=True).decode(part.get_content_charset())
+
+
+class BulkTemplateTest(unittest.TestCase):
+
+    def setUp(self):
+        # Template.get_identifiers() only exists from Python 3.11; the deploy runtime is 3.10
+        patcher = mock.patch.object(Template, 'get_identifiers', create=True,
+                                    side_effect=AssertionError('needs Python 3.11'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ascii_fields_are_substituted_on_the_prepared_payload(self):
+        template = BulkTemplate('Reminder', 'Hello $name, this went to ${email}.', html='<p>Hi $name</p>',
+                                from_header='AttendEase <noreply@ubuea.cm>')
+        self.assertTrue(template.personalised)
+        self.assertIsNotNone(template._payload)
+        payload = template.render('ada@gmail.com', {'name': 'Ada'})
+        self.assertTrue(payload.startswith('To: ada@gmail.com\n'))
+        self.assertEqual(body_of(payload), 'Hello Ada, this went to ada@gmail.com.')
+        self.assertIn('<p>Hi Ada</p>', payload)
+        self.assertIn('From: AttendEase <noreply@ubuea.cm>', payload)
+
+    def test_non_ascii_fields_are_substituted_before_encoding(self):
+        template = BulkTemplate('Séance annulée', 'Bonjour $name', html=None)
+        self.assertTrue(template.personalised)
+        self.assertIsNone(template._payload)
+        self.assertEqual(body_of(template.render('a@gmail.com', {'name': 'Ébénézer'})), 'Bonjour Ébénézer')
+
+    def test_static_templates_are_built_once(self):
+        for text in ('Session cancelled', 'Séance annulée'):
+            with self.subTest(text=text):
+                template = BulkTemplate('Notice', text)
+                self.assertFalse(template.personalised)
+                with mock.patch.object(template, '_build', side_effect=AssertionError('rebuilt')):
+                    first = template.render('a@gmail.com')
+                    second = template.render('b@gmail.com')
+                self.assertEqual(first.split('\n', 1)[1], second.split('\n', 1)[1])
+                self.assertEqual(body_of(second), text)
+
+    def test_missing_fields_are_left_in_place(self):
+        template = BulkTemplate('Notice', 'Hello $name')
+        self.assertEqual(body_of(template.render('a@gmail.com')), 'Hello $name')
+
+
+class EscapeTemplateTest(unittest.TestCase):
+
+    def test_admin_text_is_sent_as_typed(self):
+        message = 'Fees: $$50 or $20, reply to $email or ${name}'
+        for subject in ('Fees $email', 'Frais $email é'):
+            with self.subTest(subject=subject):
+                template = BulkTemplate(subject, escape_template(message) + '\nSent to $email')
+                payload = template.render('a@gmail.com', {'name': 'Ada'})
+                self.assertEqual(body_of(payload), message + '\nSent to a@gmail.com')
+                subject_header = email.message_from_string(payload)['Subject']
+                self.assertEqual(str(make_header(decode_header(subject_header))), subject)
+
+    def test_escaped_text_has_no_fields(self):
+        template = BulkTemplate('Notice', escape_template('Costs $5 for $name'))
+        self.assertFalse(template.personalised)
+        self.assertEqual(body_of(template.render('a@gmail.com')), 'Costs $5 for $name')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+from app import app
+from routes.notifications import _last_event_id
+
+
+class LastEventIdTest(unittest.TestCase):
+
+    def last_event_id(self, query='', headers=None):
+        with app.test_request_context(f'/api/notifications/stream{query}', headers=headers or {}):
+            return _last_event_id()
+
+    def test_after_is_an_int_on_first_connect(self):
+        # EventSource can't send headers on its first connect
+        self.assertEqual(self.last_event_id('?after=123'), 123)
+
+    def test_header_wins_on_reconnect(self):
+        self.assertEqual(self.last_event_id('?after=123', {'Last-Event-ID': '7'}), 7)
+
+    def test_invalid_header_falls_back_to_after(self):
+        self.assertEqual(self.last_event_id('?after=5', {'Last-Event-ID': 'abc'}), 5)
+
+    def test_defaults_to_zero(self):
+        self.assertEqual(self.last_event_id(), 0)
+        self.assertEqual(self.last_event_id('?after=abc'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
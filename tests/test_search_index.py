@@ -0,0 +1,56 @@
+import unittest
+
+from utils.search_index import PrefixTrie, escape_like
+
+
+class PrefixTrieTest(unittest.TestCase):
+
+    def setUp(self):
+        self.trie = PrefixTrie()
+        for key, item_id in [('CEF305', 'c3'), ('CEF201', 'c1'), ('CEF202', 'c2'), ('EEF201', 'e1'), ('CEF201', 'c1b')]:
+            self.trie.insert(key, item_id)
+
+    def test_search_returns_ids_in_key_order(self):
+        self.assertEqual(self.trie.search('CEF'), ['c1', 'c1b', 'c2', 'c3'])
+        self.assertEqual(self.trie.search('CEF20'), ['c1', 'c1b', 'c2'])
+        self.assertEqual(self.trie.search(''), ['c1', 'c1b', 'c2', 'c3', 'e1'])
+
+    def test_search_limit_and_misses(self):
+        self.assertEqual(self.trie.search('CEF', limit=2), ['c1', 'c1b'])
+        self.assertEqual(self.trie.search('MEF'), [])
+        self.assertEqual(self.trie.search('CEF2019'), [])
+
+    def test_len_counts_ids_once(self):
+        self.assertEqual(len(self.trie), 5)
+        self.trie.insert('CEF305', 'c3')
+        self.assertEqual(len(self.trie), 5)
+
+    def test_remove(self):
+        self.assertTrue(self.trie.remove('CEF201', 'c1'))
+        self.assertFalse(self.trie.remove('CEF201', 'c1'))
+        self.assertFalse(self.trie.remove('CEF999', 'c1'))
+        self.assertEqual(self.trie.search('CEF201'), ['c1b'])
+        self.assertEqual(len(self.trie), 4)
+
+    def test_remove_prunes_empty_branches(self):
+        self.trie.remove('EEF201', 'e1')
+        self.assertNotIn('E', self.trie._root)
+        self.trie.insert('CEF2', 'short')
+        self.trie.remove('CEF2', 'short')
+        # The longer keys under the same path survive
+        self.assertEqual(self.trie.search('CEF2'), ['c1', 'c1b', 'c2'])
+
+
+class EscapeLikeTest(unittest.TestCase):
+
+    def test_wildcards_are_escaped(self):
+        self.assertEqual(escape_like('50%'), '50\\%')
+        self.assertEqual(escape_like('CEF_2'), 'CEF\\_2')
+        self.assertEqual(escape_like('a\\b'), 'a\\\\b')
+
+    def test_plain_text_is_unchanged(self):
+        self.assertEqual(escape_like('Ngwa Ébénézer'), 'Ngwa Ébénézer')
+
+
+if __name__ == '__main__':
+    unittest.main()
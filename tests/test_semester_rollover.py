@@ -0,0 +1,66 @@
+import unittest
+import uuid
+from types import SimpleNamespace
+
+from app import app, db
+from models.course import Course
+from models.course_assignment import CourseAssignment
+from models.geofence_area import GeofenceArea
+from models.lecturer import Lecturer
+from utils.semester_rollover import rollover_semester
+
+TABLES = [Lecturer.__table__, Course.__table__, GeofenceArea.__table__, CourseAssignment.__table__]
+
+
+class RolloverSelectionTest(unittest.TestCase):
+    """course_ids / assignment_ids narrow the rollover; an empty list selects nothing"""
+
+    def setUp(self):
+        context = app.app_context()
+        context.push()
+        self.addCleanup(context.pop)
+        db.metadata.create_all(db.engine, tables=TABLES)
+        self.addCleanup(db.metadata.drop_all, db.engine, tables=TABLES)
+        self.addCleanup(db.session.remove)
+
+        self.source = SimpleNamespace(id=uuid.uuid4())
+        self.target = SimpleNamespace(id=uuid.uuid4())
+        self.admin_id = uuid.uuid4()
+        lecturer = Lecturer(user_id=uuid.uuid4(), lecturer_id='L1', full_name='Lecturer One')
+        self.courses = [Course(course_code=code, course_title=code, department_id=uuid.uuid4(), level='200')
+                        for code in ('CEF201', 'CEF202')]
+        db.session.add_all([lecturer] + self.courses)
+        db.session.flush()
+        self.assignments = [CourseAssignment(lecturer_id=lecturer.id, course_id=course.id, semester_id=self.source.id,
+                                             assigned_by=self.admin_id) for course in self.courses]
+        db.session.add_all(self.assignments)
+        db.session.commit()
+
+    def rollover(self, **selection):
+        return rollover_semester(self.source, self.target, assigned_by=self.admin_id, **selection)['course_assignments']
+
+    def target_count(self):
+        return CourseAssignment.query.filter_by(semester_id=self.target.id).count()
+
+    def test_no_selection_clones_everything(self):
+        self.assertEqual(self.rollover(dry_run=True), {
+            'source_rows': 2, 'skipped_inactive': 0, 'already_in_target': 0, 'to_create': 2
+        })
+        self.assertEqual(self.rollover()['created'], 2)
+        self.assertEqual(self.target_count(), 2)
+
+    def test_selection_narrows_the_clone(self):
+        self.assertEqual(self.rollover(course_ids=[self.courses[0].id])['created'], 1)
+        self.assertEqual(self.rollover(assignment_ids=[self.assignments[1].id])['created'], 1)
+        self.assertEqual(self.target_count(), 2)
+
+    def test_empty_selection_selects_nothing(self):
+        for selection in ({'course_ids': []}, {'assignment_ids': []}, {'course_ids': [], 'assignment_ids': None}):
+            with self.subTest(selection=selection):
+                self.assertEqual(self.rollover(dry_run=True, **selection)['source_rows'], 0)
+                self.assertEqual(self.rollover(**selection)['created'], 0)
+        self.assertEqual(self.target_count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
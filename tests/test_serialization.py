@@ -0,0 +1,119 @@
+import json
+import unittest
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Column, MetaData, Table, Boolean, Date, DateTime, Float, Integer, Numeric, String, Uuid, literal
+
+from utils.serialization import RowSerializer, OrjsonProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+records = Table(
+    'serializer_records', MetaData(),
+    Column('id', Uuid),
+    Column('name', String),
+    Column('count', Integer),
+    Column('confidence', Numeric(5, 2)),
+    Column('ratio', Float),
+    Column('checked_in_at', DateTime),
+    Column('day', Date),
+    Column('is_verified', Boolean)
+)
+
+
+class RowSerializerTest(unittest.TestCase):
+
+    def test_row_tuple_to_json_ready_dict(self):
+        serializer = RowSerializer(*records.c)
+        record_id = uuid.uuid4()
+        row = (record_id, 'Ada', 3, Decimal('97.25'), 0.5, datetime(2026, 10, 1, 8, 30), date(2026, 10, 1), True)
+        self.assertEqual(serializer(row), {
+            'id': str(record_id),
+            'name': 'Ada',
+            'count': 3,
+            'confidence': 97.25,
+            'ratio': 0.5,
+            'checked_in_at': '2026-10-01T08:30:00',
+            'day': '2026-10-01',
+            'is_verified': True
+        })
+
+    def test_nulls_stay_null(self):
+        serializer = RowSerializer(*records.c)
+        self.assertEqual(serializer((None,) * len(records.c)), {column.key: None for column in records.c})
+
+    def test_single_column_and_labels(self):
+        serializer = RowSerializer(records.c.id, literal(1).label('one'))
+        record_id = uuid.uuid4()
+        self.assertEqual(serializer.keys, ('id', 'one'))
+        self.assertEqual(serializer.many([(record_id, 1), (None, 1)]), [{'id': str(record_id), 'one': 1}, {'id': None, 'one': 1}])
+        self.assertEqual(RowSerializer(records.c.name)(('Ada',)), {'name': 'Ada'})
+
+    def test_select_uses_the_serializer_columns(self):
+        serializer = RowSerializer(records.c.id, records.c.name)
+        self.assertEqual([column.key for column in serializer.select().selected_columns], ['id', 'name'])
+
+
+@unittest.skipIf(orjson is None, 'orjson is not installed')
+class OrjsonProviderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.default = DefaultJSONProvider(self.app)
+        self.fast = OrjsonProvider(self.app)
+
+    def assertSameResponse(self, obj):
+        with self.app.test_request_context():
+            self.assertEqual(self.fast.response(obj).get_data(), self.default.response(obj).get_data())
+
+    def test_responses_match_the_default_provider(self):
+        for obj in [
+            {'z': 1, 'a': [1, 2.5, None, True, False], 'm': {'b': 'x', 'a': 'y'}},
+            {'id': uuid.uuid4(), 'amount': Decimal('1.50'), 'at': datetime(2026, 1, 2, 3, 4, 5), 'day': date(2026, 1, 2)},
+            {'control': 'a\nb\t"quoted"\\ \x01'},
+            [1, 'two', {'three': 3}]
+        ]:
+            with self.subTest(obj=obj):
+                self.assertSameResponse(obj)
+
+    def test_non_ascii_is_escaped_like_ensure_ascii(self):
+        for obj in [{'full_name': 'Ébénézer Ngwa Ñ'}, {'emoji': 'ok 😀'}, ['Ç', {'k': 'ü '}]]:
+            with self.subTest(obj=obj):
+                self.assertSameResponse(obj)
+
+    def test_debug_responses_are_indented_like_the_default(self):
+        self.app.debug = True
+        self.assertSameResponse({'b': [1, {'c': 'é'}], 'a': None})
+
+    def test_without_ensure_ascii_utf8_is_written(self):
+        self.fast.ensure_ascii = False
+        self.assertEqual(self.fast.dumps({'name': 'É'}), '{"name":"É"}')
+
+    def test_dumps_round_trips(self):
+        obj = {'name': 'Ébénézer', 'n': [1, 2.5, None]}
+        self.assertEqual(json.loads(self.fast.dumps(obj)), obj)
+        self.assertEqual(self.fast.dumps(obj, indent=2), self.default.dumps(obj, indent=2))
+
+    def test_loads_keeps_wide_integers_exact(self):
+        for document in ['{"n": 123456789012345678901234567890}', b'{"n": -9999999999999999999}', '{"n": 18446744073709551616}']:
+            with self.subTest(document=document):
+                loaded = self.fast.loads(document)
+                self.assertEqual(loaded, json.loads(document))
+                self.assertIsInstance(loaded['n'], int)
+        self.assertEqual(self.fast.loads(b'{"a": [1, 2.5, "\\u00c9"]}'), {'a': [1, 2.5, 'É']})
+
+    def test_values_orjson_rejects_fall_back(self):
+        obj = {'big': 2 ** 70}
+        self.assertEqual(self.fast.dumps(obj), self.default.dumps(obj))
+        self.assertSameResponse(obj)
+
+
+if __name__ == '__main__':
+    unittest.main()
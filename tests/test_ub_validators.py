@@ -0,0 +1,57 @@
+import unittest
+
+from utils.ub_validators import check_ub_matricle_number, check_email_by_user_type, validate_ub_matricle_number
+from utils.validators import ValidationError
+
+
+class CheckUbMatricleNumberTest(unittest.TestCase):
+
+    def test_valid_numbers(self):
+        self.assertIsNone(check_ub_matricle_number('FE22A220', current_year=26))
+        self.assertIsNone(check_ub_matricle_number('fe22a220', current_year=26))
+
+    def test_missing(self):
+        self.assertEqual(check_ub_matricle_number('', current_year=26), 'Matricle number is required')
+        self.assertEqual(check_ub_matricle_number(None, current_year=26), 'Matricle number is required')
+
+    def test_bad_format(self):
+        for matricle_number in ('FE22B220', 'FE2A220', 'FE22A2201', 'XX22A220', ' FE22A220'):
+            with self.subTest(matricle_number=matricle_number):
+                self.assertIn('Invalid matricle number format', check_ub_matricle_number(matricle_number, current_year=26))
+
+    def test_year_range(self):
+        # Up to 10 years ahead and 20 years back of the current two-digit year
+        self.assertIsNone(check_ub_matricle_number('FE36A001', current_year=26))
+        self.assertIsNone(check_ub_matricle_number('FE06A001', current_year=26))
+        self.assertIn("Year '37'", check_ub_matricle_number('FE37A001', current_year=26))
+        self.assertIn("Year '05'", check_ub_matricle_number('FE05A001', current_year=26))
+
+    def test_validate_raises_with_field(self):
+        with self.assertRaises(ValidationError) as raised:
+            validate_ub_matricle_number('FE22B220')
+        self.assertEqual(raised.exception.field, 'matricle_number')
+
+
+class CheckEmailByUserTypeTest(unittest.TestCase):
+
+    def test_missing(self):
+        self.assertEqual(check_email_by_user_type('', 'student'), 'Email is required')
+
+    def test_lecturer_needs_institutional_email(self):
+        self.assertIsNone(check_email_by_user_type('Jane.Doe@ubuea.cm', 'lecturer'))
+        self.assertIn('Invalid UB lecturer email', check_email_by_user_type('jane@ubuea.cm', 'lecturer'))
+        self.assertIn('Invalid UB lecturer email', check_email_by_user_type('jane.doe@gmail.com', 'lecturer'))
+
+    def test_student_needs_personal_email(self):
+        self.assertIsNone(check_email_by_user_type('student.one@gmail.com', 'student'))
+        self.assertIn('Students should use personal emails', check_email_by_user_type('student.one@ubuea.cm', 'student'))
+        self.assertEqual(check_email_by_user_type('not-an-email', 'student'), 'Invalid email format')
+
+    def test_admin_accepts_any_valid_email(self):
+        self.assertIsNone(check_email_by_user_type('admin@ubuea.cm', 'admin'))
+        self.assertIsNone(check_email_by_user_type('admin@gmail.com', 'admin'))
+        self.assertEqual(check_email_by_user_type('admin@', 'admin'), 'Invalid email format')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+"""
+Bulk email sending for AttendEase
+Broadcasts are rendered from a template compiled once and pushed through a few
+long-lived SMTP connections in parallel, with retry/backoff on transient errors.
+"""
+import os
+import queue
+import smtplib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from string import Template
+
+from utils.delivery_queue import delivery_queue
+
+
+def is_transient_error(error):
+    """4xx replies and dropped connections are worth retrying; 5xx and refusals are not"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPException):
+        return False
+    return isinstance(error, OSError)
+
+
+def escape_template(text):
+    """Plain text made safe to use as BulkTemplate text, so $ is never read as a field"""
+    return text.replace('$', '$$')
+
+
+def _has_fields(template):
+    """Whether `template` has $name or ${name} fields (Template.get_identifiers needs 3.11)"""
+    return any(match.group('named') or match.group('braced') for match in template.pattern.finditer(template.template))
+
+
+class BulkTemplate:
+    """
+    Email template compiled once per broadcast.
+
+    The MIME skeleton (headers, multipart boundaries, encoded parts) is rendered
+    a single time; each recipient only costs a To header and, when the template
+    uses ${...} fields, one string substitution over the prepared payload.
+    `text` and `html` are string.Template sources: pass user-written text
+    through escape_template() first.
+    """
+
+    def __init__(self, subject, text, html=None, from_header=None):
+        self.subject = subject
+        self.text = Template(text)
+        self.html = Template(html) if html else None
+        self.from_header = from_header
+        self.personalised = _has_fields(self.text) or bool(self.html and _has_fields(self.html))
+
+        ascii_only = all(part.isascii() for part in (subject, text, html or '', from_header or ''))
+        # 7bit parts keep ${field} markers intact, so substitution can run on the final payload
+        self._payload = Template(self._build(text, html, escape_headers=True)) if ascii_only and self.personalised else None
+        # Without fields every recipient gets the same encoded payload, whatever the charset
+        self._static = None if self.personalised else self._build(text, html, {})
+
+    def _build(self, text, html, fields=None, escape_headers=False):
+        if fields is not None:
+            text = self.text.safe_substitute(fields)
+            html = self.html.safe_substitute(fields) if self.html else None
+        # Headers are literal text; escape them when the whole payload becomes a template
+        header = escape_template if escape_headers else str
+        if html:
+            mime = MIMEMultipart('alternative')
+            mime.attach(MIMEText(text, 'plain'))
+            mime.attach(MIMEText(html, 'html'))
+        else:
+            mime = MIMEText(text, 'plain')
+        mime['Subject'] = header(self.subject)
+        if self.from_header:
+            mime['From'] = header(self.from_header)
+        return mime.as_string()
+
+    def render(self, to, fields=None):
+        """Full RFC 822 payload for one recipient"""
+        fields = dict(fields or {}, email=to)
+        if self._static is not None:
+            body = self._static
+        elif self._payload is not None:
+            body = self._payload.safe_substitute(fields)
+        else:
+            body = self._build(self.text.template, self.html.template if self.html else None, fields)
+        return f"To: {to}\n{body}"
+
+
+class BulkJob:
+    """Progress of one broadcast"""
+
+    def __init__(self, total, title):
+        self.id = uuid.uuid4().hex
+        self.title = title
+        self.total = total
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.errors = []
+        self.status = 'queued'
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._progress_every = max(1, total // 10)
+
+    def record(self, ok, email=None, error=None):
+        with self._lock:
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+                if len(self.errors) < 100:
+                    self.errors.append({'email': email, 'error': str(error)})
+            done = self.sent + self.failed
+        if done % self._progress_every == 0 or done == self.total:
+            print(f"📢 Bulk '{self.title}': {done}/{self.total} processed ({self.failed} failed)")
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def progress(self):
+        with self._lock:
+            done = self.sent + self.failed
+            end = self.finished_at or time.time()
+            elapsed = end - self.started_at if self.started_at else 0
+            rate = done / elapsed if elapsed > 0 else 0
+            return {
+                'job_id': self.id,
+                'title': self.title,
+                'status': self.status,
+                'total': self.total,
+                'sent': self.sent,
+                'failed': self.failed,
+                'retries': self.retries,
+                'percent': round(done * 100.0 / self.total, 1) if self.total else 100.0,
+                'messages_per_second': round(rate, 2),
+                'eta_seconds': round((self.total - done) / rate, 1) if rate and done < self.total else 0,
+                'errors': list(self.errors)
+            }
+
+
+class BulkMailer:
+    """Runs broadcasts on a fixed number of persistent SMTP connections"""
+
+    def __init__(self, concurrency=4, max_retries=3, retry_backoff=1.0, keep_jobs=50):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.keep_jobs = keep_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.concurrency = app.config.get('BULK_EMAIL_CONCURRENCY', 4)
+        self.max_retries = app.config.get('BULK_EMAIL_MAX_RETRIES', 3)
+        self.retry_backoff = app.config.get('BULK_EMAIL_RETRY_BACKOFF', 1.0)
+        app.extensions['bulk_mailer'] = self
+
+    @staticmethod
+    def default_from_header():
+        from_email = os.getenv('FROM_EMAIL', os.getenv('SMTP_USERNAME', ''))
+        return f"{os.getenv('FROM_NAME', 'AttendEase')} <{from_email}>" if from_email else None
+
+    def send(self, recipients, template, wait=False, concurrency=None):
+        """
+        Start a broadcast. `recipients` holds email strings or (email, fields) pairs.
+        Returns the BulkJob; with wait=True it returns after the last message.
+        """
+        pending = queue.Queue()
+        for recipient in recipients:
+            if isinstance(recipient, str):
+                recipient = (recipient, None)
+            pending.put(recipient)
+
+        job = BulkJob(pending.qsize(), template.subject)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.keep_jobs:
+                self._jobs.popitem(last=False)
+
+        workers = max(1, min(concurrency or self.concurrency, job.total or 1))
+        runner = threading.Thread(
+            target=self._run, args=(job, pending, template, workers),
+            name=f'bulk-{job.id[:8]}', daemon=True
+        )
+        runner.start()
+        if wait:
+            runner.join()
+        return job
+
+    def get_job(self, job_id):
+        return self._jobs.get(job_id)
+
+    def _run(self, job, pending, template, workers):
+        job.status = 'running'
+        job.started_at = time.time()
+        threads = [
+            threading.Thread(target=self._work, args=(job, pending, template), daemon=True)
+            for _ in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        job.finished_at = time.time()
+        job.status = 'completed' if job.failed == 0 else 'completed_with_errors'
+        print(f"✅ Bulk '{job.title}' finished: {job.sent} sent, {job.failed} failed "
+              f"in {job.finished_at - job.started_at:.1f}s")
+
+    def _work(self, job, pending, template):
+        """One worker = one SMTP connection kept open for its whole share of the list"""
+        transport = delivery_queue.new_email_transport()
+        try:
+            while True:
+                try:
+                    email, fields = pending.get_nowait()
+                except queue.Empty:
+                    return
+                payload = template.render(email, fields)
+                attempt = 0
+                while True:
+                    try:
+                        transport.send_raw(email, payload)
+                        job.record(True)
+                        break
+                    except Exception as e:
+                        if attempt < self.max_retries and is_transient_error(e):
+                            attempt += 1
+                            job.record_retry()
+                            time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+                            continue
+                        job.record(False, email, e)
+                        break
+        finally:
+            if transport is not delivery_queue.transports.get('email'):
+                transport.close()
+
+
+bulk_mailer = BulkMailer()
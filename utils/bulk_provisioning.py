@@ -0,0 +1,291 @@
+"""
+Bulk account provisioning for AttendEase
+Creates users with their student or lecturer profiles for a whole intake in a
+single request. Entries are validated in Python, and conflicts with existing
+emails, matricle numbers and lecturer ids are found with one IN query per
+column. Initial passwords are hashed together on a process pool. Each table
+then takes a single multi-row INSERT, and one commit covers the batch. Entries
+that fail are reported individually and never block the others.
+
+Entry fields:
+- common: email, user_type (student | lecturer), full_name, and optionally
+  password and phone_number.
+- students: matricle_number, department (code or id), gender, and optionally
+  level (default 200) and enrollment_year (default from the matricle).
+- lecturers: lecturer_id, and optionally institutional_email and
+  specialization.
+Entries without a password get a random temporary password. It is returned
+once in the response and is never stored in plain text.
+"""
+import secrets
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy import select
+from app import db
+from utils.password_hasher import password_hasher
+from utils.ub_validators import check_ub_matricle_number, check_email_by_user_type
+from utils.validators import validate_password, ValidationError
+
+PROFILE_TYPES = ('student', 'lecturer')
+VALID_LEVELS = ('200', '300', '400', '500')
+VALID_GENDERS = ('Male', 'Female', 'Other')
+LOOKUP_BATCH_SIZE = 1000
+
+
+def _existing(column, values):
+    """The subset of `values` already present in `column`"""
+    values = list(values)
+    found = set()
+    for start in range(0, len(values), LOOKUP_BATCH_SIZE):
+        found.update(db.session.execute(
+            select(column).where(column.in_(values[start:start + LOOKUP_BATCH_SIZE]))
+        ).scalars())
+    return found
+
+
+class BulkProvisioner:
+    """Validates and creates one batch of accounts, collecting per-entry outcomes"""
+
+    def __init__(self, hash_processes=None):
+        self.hash_processes = hash_processes
+        self.failed = []
+        self.timings = {}
+        self._seen = {'email': set(), 'matricle_number': set(), 'lecturer_id': set()}
+        self._current_year = datetime.now().year % 100
+
+    def _fail(self, index, entry, error):
+        self.failed.append({
+            'index': index,
+            'email': str(entry.get('email') or '').strip().lower() or None,
+            'error': error
+        })
+
+    # Entry validation (pure Python, no queries)
+
+    def parse_entry(self, index, entry):
+        """Normalised account for a valid entry, or None after recording its error"""
+        from utils.reference_cache import reference_cache
+        if not isinstance(entry, dict):
+            self._fail(index, {}, 'Entry must be an object')
+            return None
+        value = lambda name: str(entry.get(name) or '').strip()
+
+        user_type = value('user_type').lower()
+        email = value('email').lower()
+        full_name = value('full_name')
+        phone_number = value('phone_number') or None
+        password = entry.get('password')
+
+        if user_type not in PROFILE_TYPES:
+            error = f'Invalid user type. Must be one of: {", ".join(PROFILE_TYPES)}'
+        else:
+            error = check_email_by_user_type(email, user_type)
+        if not error and len(email) > 255:
+            error = 'Email is too long'
+        if not error and not full_name:
+            error = 'Full name is required'
+        if not error and len(full_name) > 255:
+            error = 'Full name is too long'
+        if not error and phone_number and len(phone_number) > 20:
+            error = 'Phone number is too long'
+        if not error and password is not None:
+            try:
+                validate_password(str(password))
+            except ValidationError as e:
+                error = e.message
+        if error:
+            self._fail(index, entry, error)
+            return None
+
+        account = {
+            'index': index,
+            'user_type': user_type,
+            'email': email,
+            'password': str(password) if password is not None else None,
+            'user': {'id': uuid.uuid4(), 'email': email, 'user_type': user_type},
+            'profile': {'id': uuid.uuid4(), 'full_name': full_name, 'phone_number': phone_number}
+        }
+        if user_type == 'student':
+            error = self._parse_student(entry, value, account['profile'], reference_cache)
+        else:
+            error = self._parse_lecturer(value, account['profile'])
+        # Repeats inside the request would fail the whole insert, so reject them here
+        unique_key = 'matricle_number' if user_type == 'student' else 'lecturer_id'
+        unique_value = account['profile'].get(unique_key)
+        if not error and email in self._seen['email']:
+            error = 'Duplicate email in request'
+        if not error and unique_value in self._seen[unique_key]:
+            error = f"Duplicate {unique_key.replace('_', ' ')} in request"
+        if error:
+            self._fail(index, entry, error)
+            return None
+        self._seen['email'].add(email)
+        self._seen[unique_key].add(unique_value)
+        return account
+
+    def _parse_student(self, entry, value, profile, reference_cache):
+        matricle_number = value('matricle_number').upper()
+        level = value('level') or '200'
+        gender = value('gender').capitalize()
+
+        error = check_ub_matricle_number(matricle_number, self._current_year)
+        if error:
+            return error
+        if level not in VALID_LEVELS:
+            return f'Invalid level. Must be one of: {", ".join(VALID_LEVELS)}'
+        if gender not in VALID_GENDERS:
+            return f'Invalid gender. Must be one of: {", ".join(VALID_GENDERS)}'
+
+        department_key = value('department')
+        department = reference_cache.departments.get_by_code(department_key) or reference_cache.departments.get(department_key)
+        if not department:
+            return f"Department '{department_key}' not found"
+
+        enrollment_year = entry.get('enrollment_year')
+        if enrollment_year in (None, ''):
+            enrollment_year = 2000 + int(matricle_number[2:4])
+        elif not str(enrollment_year).isdigit():
+            return 'Enrollment year must be a number'
+
+        profile.update({
+            'matricle_number': matricle_number,
+            'department_id': department.id,
+            'level': level,
+            'gender': gender,
+            'enrollment_year': int(enrollment_year)
+        })
+        return None
+
+    def _parse_lecturer(self, value, profile):
+        lecturer_id = value('lecturer_id')
+        institutional_email = value('institutional_email').lower() or None
+        specialization = value('specialization') or None
+
+        if not lecturer_id:
+            return 'Lecturer ID is required'
+        if len(lecturer_id) > 20:
+            return 'Lecturer ID is too long'
+        if institutional_email and check_email_by_user_type(institutional_email, 'lecturer'):
+            return 'Invalid institutional email'
+        if specialization and len(specialization) > 255:
+            return 'Specialization is too long'
+        profile.update({
+            'lecturer_id': lecturer_id,
+            'institutional_email': institutional_email,
+            'specialization': specialization
+        })
+        return None
+
+    # Set-wise conflict checks and inserts
+
+    def _drop_conflicts(self, accounts):
+        """Remove accounts whose email, matricle or lecturer id is already taken"""
+        from models.user import User
+        from models.student import Student
+        from models.lecturer import Lecturer
+        taken_emails = _existing(User.email, (a['email'] for a in accounts))
+        taken_matricles = _existing(Student.matricle_number, (
+            a['profile']['matricle_number'] for a in accounts if a['user_type'] == 'student'
+        ))
+        taken_lecturer_ids = _existing(Lecturer.lecturer_id, (
+            a['profile']['lecturer_id'] for a in accounts if a['user_type'] == 'lecturer'
+        ))
+
+        remaining = []
+        for account in accounts:
+            profile = account['profile']
+            if account['email'] in taken_emails:
+                error = 'User with this email already exists'
+            elif account['user_type'] == 'student' and profile['matricle_number'] in taken_matricles:
+                error = f"Matricle number '{profile['matricle_number']}' is already registered"
+            elif account['user_type'] == 'lecturer' and profile['lecturer_id'] in taken_lecturer_ids:
+                error = f"Lecturer ID '{profile['lecturer_id']}' is already assigned"
+            else:
+                remaining.append(account)
+                continue
+            self.failed.append({'index': account['index'], 'email': account['email'], 'error': error})
+        return remaining
+
+    def _insert(self, accounts, now):
+        from models.user import User
+        from models.student import Student
+        from models.lecturer import Lecturer
+        users, students, lecturers = [], [], []
+        for account in accounts:
+            users.append(dict(account['user'], password_hash=account['password_hash'], is_active=True,
+                              email_verified=False, created_at=now, updated_at=now))
+            profile = dict(account['profile'], user_id=account['user']['id'], created_at=now, updated_at=now)
+            if account['user_type'] == 'student':
+                students.append(dict(profile, is_face_registered=False))
+            else:
+                lecturers.append(dict(profile, is_active=True))
+
+        # executemany of one multi-row statement per table
+        db.session.execute(User.__table__.insert(), users)
+        if students:
+            db.session.execute(Student.__table__.insert(), students)
+        if lecturers:
+            db.session.execute(Lecturer.__table__.insert(), lecturers)
+
+    def _timed(self, name, started):
+        now = time.perf_counter()
+        self.timings[f'{name}_ms'] = round((now - started) * 1000, 1)
+        return now
+
+    def run(self, entries):
+        """Provision `entries`; commits the created accounts and returns the outcome"""
+        started = step = time.perf_counter()
+        accounts = [account for account in (
+            self.parse_entry(index, entry) for index, entry in enumerate(entries)
+        ) if account]
+        step = self._timed('validate', step)
+
+        accounts = self._drop_conflicts(accounts) if accounts else []
+        step = self._timed('lookup', step)
+
+        temporary = {}
+        for account in accounts:
+            if account['password'] is None:
+                account['password'] = temporary[account['index']] = secrets.token_urlsafe(12)
+        hashes = password_hasher.hash_many([a['password'] for a in accounts], self.hash_processes)
+        for account, pw_hash in zip(accounts, hashes):
+            account['password_hash'] = pw_hash
+        step = self._timed('hash', step)
+
+        if accounts:
+            try:
+                self._insert(accounts, datetime.utcnow())
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        step = self._timed('insert', step)
+
+        total = step - started
+        self.failed.sort(key=lambda failure: failure['index'])
+        created = []
+        for account in accounts:
+            item = {
+                'index': account['index'],
+                'email': account['email'],
+                'user_type': account['user_type'],
+                'user_id': str(account['user']['id']),
+                'profile_id': str(account['profile']['id'])
+            }
+            if account['index'] in temporary:
+                item['temporary_password'] = temporary[account['index']]
+            created.append(item)
+
+        return {
+            'requested': len(entries),
+            'created': created,
+            'failed': self.failed,
+            'throughput': dict(
+                self.timings,
+                total_ms=round(total * 1000, 1),
+                hash_method=password_hasher.method,
+                hash_rounds=password_hasher.rounds if password_hasher.method == 'bcrypt' else None,
+                users_per_second=round(len(accounts) / total, 1) if total > 0 else None
+            )
+        }
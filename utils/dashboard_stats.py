@@ -0,0 +1,157 @@
+"""
+System-wide dashboard counters for AttendEase
+The admin overview is computed in a single round trip (one SELECT of scalar
+subqueries) and cached for a few seconds. Session start/end/cancel adjust the
+cached session counts in place, so the cache never shows a stale active count
+for changes made by this process. The same hooks drive a process-level count
+of active sessions, reconciled against the database on a schedule.
+"""
+import threading
+import time
+from sqlalchemy import select, func, case, text
+from app import db
+
+# Tables that can grow without bound; approximate mode reads their size from pg_class
+LARGE_TABLES = ('users', 'students', 'attendance_sessions')
+
+
+class ActiveSessionCounter:
+    """
+    Number of attendance sessions in the 'active' state, kept in memory.
+
+    Seeded with one COUNT on first use and then moved by the session hooks.
+    Changes made by other worker processes only show up after the next
+    reconcile(), which the scheduler runs every ACTIVE_SESSION_RECONCILE_MINUTES.
+    """
+
+    def __init__(self):
+        self._value = None
+        self._lock = threading.Lock()
+        self.last_reconciled_at = None
+        self.last_drift = 0
+
+    @staticmethod
+    def _count():
+        from models.attendance_session import AttendanceSession
+        return db.session.execute(
+            select(func.count()).select_from(AttendanceSession).where(AttendanceSession.session_status == 'active')
+        ).scalar() or 0
+
+    def get(self):
+        if self._value is None:
+            self.reconcile()
+        return self._value
+
+    def adjust(self, delta):
+        with self._lock:
+            if self._value is not None:
+                self._value = max(self._value + delta, 0)
+
+    def reconcile(self):
+        """Replace the in-memory value with a fresh count; returns the drift that was corrected"""
+        actual = self._count()
+        with self._lock:
+            drift = actual - self._value if self._value is not None else 0
+            self._value = actual
+            self.last_reconciled_at = time.time()
+            self.last_drift = drift
+        if drift:
+            print(f"🔄 Active session counter corrected by {drift:+d} (now {actual})")
+        return drift
+
+
+class DashboardStats:
+    """TTL cache around the admin overview counts"""
+
+    def __init__(self, ttl=30, approximate=False):
+        self.ttl = ttl
+        self.approximate = approximate
+        self._cache = {}  # approximate flag -> (expires_at, counts)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('DASHBOARD_CACHE_SECONDS', 30)
+        self.approximate = app.config.get('DASHBOARD_APPROXIMATE_COUNTS', False)
+        app.extensions['dashboard_stats'] = self
+
+    @staticmethod
+    def _exact(model, *criteria):
+        query = select(func.count()).select_from(model)
+        if criteria:
+            query = query.where(*criteria)
+        return query.scalar_subquery()
+
+    @classmethod
+    def _estimated(cls, model):
+        """reltuples, falling back to an exact count for tables never analyzed (reltuples = -1)"""
+        reltuples = select(text('reltuples::bigint')).select_from(text('pg_class')).where(
+            text(f"oid = to_regclass('{model.__tablename__}')")
+        ).scalar_subquery()
+        return case((func.coalesce(reltuples, -1) < 0, cls._exact(model)), else_=reltuples)
+
+    def _query(self, approximate):
+        from models.user import User
+        from models.student import Student
+        from models.lecturer import Lecturer
+        from models.admin import Admin
+        from models.department import Department
+        from models.course import Course
+        from models.attendance_session import AttendanceSession
+
+        def count(model):
+            if approximate and model.__tablename__ in LARGE_TABLES:
+                return self._estimated(model)
+            return self._exact(model)
+
+        statement = select(
+            count(User).label('total_users'),
+            count(Student).label('total_students'),
+            count(Lecturer).label('total_lecturers'),
+            count(Admin).label('total_admins'),
+            count(Department).label('total_departments'),
+            count(Course).label('total_courses'),
+            count(AttendanceSession).label('total_sessions'),
+            self._exact(AttendanceSession, AttendanceSession.session_status == 'active').label('active_sessions')
+        )
+        row = db.session.execute(statement).one()
+        return {key: int(value or 0) for key, value in row._mapping.items()}
+
+    def get_overview(self, approximate=None):
+        """Counts for the admin dashboard; `approximate` only has an effect on Postgres"""
+        if approximate is None:
+            approximate = self.approximate
+        approximate = bool(approximate) and db.engine.dialect.name == 'postgresql'
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(approximate)
+            if cached and cached[0] > now:
+                return dict(cached[1], cached=True, approximate=approximate)
+
+        counts = self._query(approximate)
+        with self._lock:
+            self._cache[approximate] = (now + self.ttl, counts)
+        return dict(counts, cached=False, approximate=approximate)
+
+    def _adjust(self, **deltas):
+        with self._lock:
+            for _, counts in self._cache.values():
+                for key, delta in deltas.items():
+                    counts[key] = max(counts.get(key, 0) + delta, 0)
+
+    def session_started(self):
+        self._adjust(total_sessions=1, active_sessions=1)
+        active_session_counter.adjust(1)
+
+    def session_finished(self, count=1):
+        """`count` sessions left the 'active' state (ended, cancelled or auto-ended)"""
+        self._adjust(active_sessions=-count)
+        active_session_counter.adjust(-count)
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+
+active_session_counter = ActiveSessionCounter()
+dashboard_stats = DashboardStats()
@@ -0,0 +1,422 @@
+"""
+Outbound email/SMS delivery queue for AttendEase
+Request handlers enqueue messages and return; background workers deliver them
+over pooled SMTP connections and a single reused Twilio client.
+"""
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+
+class OutboundMessage:
+    """One email or SMS waiting for delivery"""
+
+    __slots__ = ('channel', 'to', 'subject', 'body', 'html', 'enqueued_at', 'attempts')
+
+    def __init__(self, channel, to, body, subject=None, html=None):
+        self.channel = channel
+        self.to = to
+        self.subject = subject
+        self.body = body
+        self.html = html
+        self.enqueued_at = time.monotonic()
+        self.attempts = 0
+
+    def __repr__(self):
+        return f'<OutboundMessage {self.channel} to {self.to}>'
+
+
+class LocalTransport:
+    """Stand-in transport: records messages instead of sending (tests / unconfigured dev)"""
+
+    def __init__(self, channel, keep=1000, echo=True):
+        self.channel = channel
+        self.sent = deque(maxlen=keep)
+        self.echo = echo
+
+    def send(self, message):
+        self.sent.append(message)
+        if self.echo:
+            icon = '📧' if self.channel == 'email' else '📱'
+            print(f"{icon} MOCK {self.channel.upper()} to {message.to}: {message.subject or ''} {message.body.strip()[:120]}")
+
+    def send_raw(self, to, payload):
+        self.sent.append(OutboundMessage(self.channel, to, payload))
+        if self.echo:
+            print(f"📧 MOCK EMAIL to {to}")
+
+    def close(self):
+        pass
+
+
+class SMTPTransport:
+    """
+    Pool of persistent, authenticated SMTP connections.
+
+    Connections are reused across messages and only re-established when the
+    server drops them or they have been idle longer than `max_idle` seconds.
+    """
+
+    def __init__(self, host, port, username, password, from_email, from_name='AttendEase',
+                 pool_size=2, max_idle=60, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.from_email = from_email or username
+        self.from_name = from_name
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+
+    def clone(self, pool_size=1):
+        """Same server and credentials, separate connections"""
+        return SMTPTransport(
+            self.host, self.port, self.username, self.password, self.from_email,
+            from_name=self.from_name, pool_size=pool_size, max_idle=self.max_idle, timeout=self.timeout
+        )
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.starttls(context=ssl.create_default_context())
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _acquire(self):
+        """Reuse an idle connection if it is still fresh, otherwise open a new one"""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.max_idle:
+                return server
+            self._quit(server)
+
+    def _release(self, server):
+        try:
+            self._idle.put_nowait((server, time.monotonic()))
+        except queue.Full:
+            self._quit(server)
+
+    @staticmethod
+    def _quit(server):
+        try:
+            server.quit()
+        except Exception:
+            pass
+
+    def build_mime(self, message):
+        if message.html:
+            mime = MIMEMultipart('alternative')
+            mime.attach(MIMEText(message.body, 'plain'))
+            mime.attach(MIMEText(message.html, 'html'))
+        else:
+            mime = MIMEText(message.body, 'plain')
+        mime['Subject'] = message.subject or 'AttendEase'
+        mime['From'] = f"{self.from_name} <{self.from_email}>"
+        mime['To'] = message.to
+        return mime.as_string()
+
+    def send(self, message):
+        self.send_raw(message.to, self.build_mime(message))
+
+    def _send_on(self, server, to, payload):
+        """sendmail on `server`, then return it to the pool or close it"""
+        try:
+            server.sendmail(self.from_email, [to], payload)
+        except smtplib.SMTPServerDisconnected:
+            self._quit(server)
+            raise
+        except smtplib.SMTPException:
+            # Rejected message, but the session itself is still usable
+            self._release(server)
+            raise
+        except Exception:
+            self._quit(server)
+            raise
+        self._release(server)
+
+    def send_raw(self, to, payload):
+        """Send an already-rendered RFC 822 payload"""
+        try:
+            self._send_on(self._acquire(), to, payload)
+        except smtplib.SMTPServerDisconnected:
+            # Stale pooled connection - retry once on a fresh one
+            self._send_on(self._connect(), to, payload)
+
+    def close(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(server)
+
+
+class TwilioTransport:
+    """SMS through one shared Twilio client (the client is thread-safe and keeps its HTTP session)"""
+
+    def __init__(self, account_sid, auth_token, from_number):
+        from twilio.rest import Client  # Optional dependency, only needed for real SMS
+        self.client = Client(account_sid, auth_token)
+        self.from_number = from_number
+
+    def send(self, message):
+        result = self.client.messages.create(body=message.body, from_=self.from_number, to=message.to)
+        print(f"✅ SMS sent successfully to {message.to} (SID: {result.sid})")
+
+    def close(self):
+        pass
+
+
+class ChannelMetrics:
+    """Counters and recent delivery timings for one channel"""
+
+    def __init__(self, window=300):
+        self.enqueued = 0
+        self.sent = 0
+        self.failed = 0
+        self.sent_sync = 0
+        self._completions = deque()
+        self._latencies = deque(maxlen=500)
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record_enqueued(self):
+        with self._lock:
+            self.enqueued += 1
+
+    def record_sent(self, latency, sync=False):
+        now = time.monotonic()
+        with self._lock:
+            self.sent += 1
+            if sync:
+                self.sent_sync += 1
+            self._completions.append(now)
+            self._latencies.append(latency)
+            while self._completions and now - self._completions[0] > self._window:
+                self._completions.popleft()
+
+    def record_failed(self):
+        with self._lock:
+            self.failed += 1
+
+    def snapshot(self, depth):
+        now = time.monotonic()
+        with self._lock:
+            recent = [t for t in self._completions if now - t <= self._window]
+            latencies = sorted(self._latencies)
+        return {
+            'queued': depth,
+            'enqueued': self.enqueued,
+            'sent': self.sent,
+            'sent_synchronously': self.sent_sync,
+            'failed': self.failed,
+            'throughput_per_minute': round(len(recent) * 60.0 / self._window, 2),
+            'latency_ms_p50': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            'latency_ms_p95': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None
+        }
+
+
+class DeliveryQueue:
+    """Per-channel queues drained by background worker threads"""
+
+    def __init__(self):
+        self.transports = {}
+        self.metrics = {}
+        self._queues = {}
+        self._workers = []
+        self._max_attempts = 3
+        self._retry_timers = {}
+        self._started = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Build transports from configuration and start the workers"""
+        self.configure(
+            transport=app.config.get('DELIVERY_TRANSPORT', 'auto'),
+            email_workers=app.config.get('DELIVERY_EMAIL_WORKERS', 2),
+            sms_workers=app.config.get('DELIVERY_SMS_WORKERS', 1),
+            max_queue=app.config.get('DELIVERY_MAX_QUEUE', 1000)
+        )
+        app.extensions['delivery_queue'] = self
+
+    def configure(self, transport='auto', email_workers=2, sms_workers=1, max_queue=1000,
+                  email_transport=None, sms_transport=None):
+        """Set up transports; 'local' forces the stand-in transport for both channels"""
+        self.stop()
+
+        if email_transport is None:
+            email_transport = self._build_email_transport(transport, email_workers)
+        if sms_transport is None:
+            sms_transport = self._build_sms_transport(transport)
+
+        self.transports = {'email': email_transport, 'sms': sms_transport}
+        self.metrics = {channel: ChannelMetrics() for channel in self.transports}
+        self._queues = {channel: queue.Queue(maxsize=max_queue) for channel in self.transports}
+        self._worker_counts = {'email': max(1, email_workers), 'sms': max(1, sms_workers)}
+        self._started = False
+
+    @staticmethod
+    def _build_email_transport(transport, pool_size):
+        username = os.getenv('SMTP_USERNAME')
+        password = os.getenv('SMTP_PASSWORD')
+        if transport == 'local' or not username or not password:
+            return LocalTransport('email')
+        return SMTPTransport(
+            host=os.getenv('SMTP_SERVER', 'smtp.gmail.com'),
+            port=int(os.getenv('SMTP_PORT', '587')),
+            username=username,
+            password=password,
+            from_email=os.getenv('FROM_EMAIL', username),
+            from_name=os.getenv('FROM_NAME', 'AttendEase'),
+            pool_size=pool_size
+        )
+
+    @staticmethod
+    def _build_sms_transport(transport):
+        account_sid = os.getenv('TWILIO_ACCOUNT_SID')
+        auth_token = os.getenv('TWILIO_AUTH_TOKEN')
+        from_number = os.getenv('TWILIO_PHONE_NUMBER')
+        if transport == 'local' or not account_sid or not auth_token or not from_number:
+            return LocalTransport('sms')
+        try:
+            return TwilioTransport(account_sid, auth_token, from_number)
+        except Exception as e:
+            print(f"⚠️  Twilio unavailable ({e}) - using mock SMS transport")
+            return LocalTransport('sms')
+
+    def new_email_transport(self):
+        """A dedicated single-connection email transport (the stand-in is shared as-is)"""
+        current = self.transports.get('email')
+        if isinstance(current, SMTPTransport):
+            return current.clone(pool_size=1)
+        return current or LocalTransport('email')
+
+    def _ensure_started(self):
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            for channel, count in self._worker_counts.items():
+                for i in range(count):
+                    worker = threading.Thread(
+                        target=self._drain, args=(channel,),
+                        name=f'delivery-{channel}-{i}', daemon=True
+                    )
+                    worker.start()
+                    self._workers.append(worker)
+            self._started = True
+
+    def _deliver(self, message, sync=False):
+        message.attempts += 1
+        self.transports[message.channel].send(message)
+        self.metrics[message.channel].record_sent(time.monotonic() - message.enqueued_at, sync=sync)
+
+    def _drain(self, channel):
+        work = self._queues[channel]
+        while True:
+            message = work.get()
+            if message is None:
+                work.task_done()
+                return
+            try:
+                self._deliver(message)
+            except Exception as e:
+                if message.attempts < self._max_attempts:
+                    self._schedule_retry(channel, message)
+                else:
+                    self.metrics[channel].record_failed()
+                    print(f"❌ {channel.upper()} delivery to {message.to} failed: {e}")
+            finally:
+                work.task_done()
+
+    def _schedule_retry(self, channel, message):
+        """Re-queue a failed message after its backoff without holding up the worker"""
+        work = self._queues[channel]
+
+        def requeue():
+            with self._lock:
+                self._retry_timers.pop(timer, None)
+            try:
+                work.put_nowait(message)
+            except queue.Full:
+                self.metrics[channel].record_failed()
+
+        timer = threading.Timer(min(2 ** message.attempts, 10), requeue)
+        timer.daemon = True
+        with self._lock:
+            self._retry_timers[timer] = channel
+        timer.start()
+
+    def enqueue(self, message):
+        """Queue a message for background delivery; sends inline if the queue is full"""
+        if message.channel not in self._queues:
+            raise ValueError(f"Unknown delivery channel: {message.channel}")
+        self._ensure_started()
+        self.metrics[message.channel].record_enqueued()
+        try:
+            self._queues[message.channel].put_nowait(message)
+        except queue.Full:
+            try:
+                self._deliver(message, sync=True)
+            except Exception as e:
+                self.metrics[message.channel].record_failed()
+                print(f"❌ {message.channel.upper()} delivery to {message.to} failed: {e}")
+                return False
+        return True
+
+    def send_email(self, to, subject, body, html=None):
+        return self.enqueue(OutboundMessage('email', to, body, subject=subject, html=html))
+
+    def send_sms(self, to, body):
+        return self.enqueue(OutboundMessage('sms', to, body))
+
+    def flush(self, timeout=None):
+        """Block until every queued message has been processed (used by tests/scripts)"""
+        deadline = time.monotonic() + timeout if timeout else None
+        while self._retry_timers or any(work.unfinished_tasks for work in self._queues.values()):
+            if deadline and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout=5):
+        """Drain and stop the workers, closing pooled connections"""
+        with self._lock:
+            timers, self._retry_timers = self._retry_timers, {}
+        for timer, channel in timers.items():
+            # Retries still waiting on their backoff are dropped
+            timer.cancel()
+            self.metrics[channel].record_failed()
+        if self._started:
+            for channel, work in self._queues.items():
+                for _ in range(self._worker_counts.get(channel, 0)):
+                    work.put(None)
+            for worker in self._workers:
+                worker.join(timeout)
+        self._workers = []
+        self._started = False
+        for transport in self.transports.values():
+            transport.close()
+
+    def get_metrics(self):
+        return {
+            channel: self.metrics[channel].snapshot(self._queues[channel].qsize())
+            for channel in self.transports
+        }
+
+
+delivery_queue = DeliveryQueue()
@@ -0,0 +1,121 @@
+"""
+Conditional GET support for AttendEase
+Read-mostly endpoints answer with a weak ETag derived from the data version of
+the tables they read. A matching If-None-Match gets a 304 before the view
+runs, so unchanged reference data costs one primary-key lookup instead of the
+full query and serialization.
+"""
+import hashlib
+from functools import wraps
+from flask import request, make_response, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+
+# Tables whose writes are versioned; anything listed in @conditional_get must be here.
+TRACKED_TABLES = {
+    'departments', 'courses', 'geofence_areas', 'system_settings', 'semesters', 'academic_years'
+}
+
+_CHANGED_KEY = 'changed_tables'
+
+
+def track_tables(*table_names):
+    """
+    Also version writes to table_names, for optional in-process caches that
+    follow table_versions. Every write commit then bumps their row, so only
+    call this when such a cache is actually enabled.
+    """
+    TRACKED_TABLES.update(table_names)
+
+
+def _note_tables(session, table_names):
+    changed = {name for name in table_names if name in TRACKED_TABLES}
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_flushed_rows(session, flush_context):
+    _note_tables(session, (
+        getattr(obj, '__tablename__', None)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_statements(orm_execute_state):
+    # Query.update()/delete() and insert() statements bypass the flush
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _note_tables(orm_execute_state.session, [table.name])
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_versions(session):
+    session.flush()  # pending objects only reach after_flush during this flush
+    changed = session.info.pop(_CHANGED_KEY, None)
+    if changed:
+        from models.table_version import TableVersion
+        TableVersion.bump(session.connection(), changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def compute_etag(tables):
+    """Weak validator over the tables' versions and the exact request (path + query string)"""
+    from models.table_version import TableVersion
+    versions = TableVersion.get_versions(sorted(tables))
+    state = ';'.join(f'{name}={version}' for name, version in sorted(versions.items()))
+    digest = hashlib.sha1(f'{state}|{request.full_path}'.encode('utf-8')).hexdigest()[:20]
+    return digest
+
+
+def conditional_get(*tables, public=False):
+    """
+    ETag / If-None-Match for a GET view reading only `tables`.
+
+    public=True marks the response cacheable by shared caches (proxies, CDNs)
+    for HTTP_CACHE_PUBLIC_MAX_AGE seconds; otherwise clients may store it but
+    must revalidate (`private, no-cache`). Only 200 responses get an ETag.
+    """
+    unknown = set(tables) - TRACKED_TABLES
+    if unknown:
+        raise ValueError(f"Tables not tracked for ETags: {', '.join(sorted(unknown))}")
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('HTTP_CACHE_ENABLED', True):
+                return view(*args, **kwargs)
+
+            if public:
+                cache_control = f"public, max-age={current_app.config.get('HTTP_CACHE_PUBLIC_MAX_AGE', 300)}"
+            else:
+                cache_control = 'private, no-cache'
+
+            try:
+                etag = compute_etag(tables)
+            except Exception as e:
+                # A failed query leaves Postgres in an aborted transaction the view can't use
+                db.session.rollback()
+                print(f"⚠️  ETag lookup failed ({e}) - serving without validators")
+                return view(*args, **kwargs)
+
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = cache_control
+            if not public:
+                response.vary.add('Authorization')
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,135 @@
+"""
+Database maintenance jobs for AttendEase
+Set-based purges of expired rows, deleted in primary-key chunks so each
+statement only holds row locks for a short time, and auto-ending of
+attendance sessions that ran past their auto_end_minutes.
+"""
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, delete, update, func, literal_column
+from app import db
+
+
+def purge_in_batches(model, condition, batch_size=1000):
+    """
+    Delete rows of `model` matching `condition` in chunks ordered by primary key.
+
+    Each chunk is one DELETE ... WHERE id IN (SELECT id ... ORDER BY id LIMIT n)
+    committed on its own, so no single transaction locks the whole expired set.
+    Returns the number of rows removed.
+    """
+    table = model.__table__
+    pk = table.c.id
+    total = 0
+    last_id = None
+
+    while True:
+        chunk = select(pk).where(condition)
+        if last_id is not None:
+            chunk = chunk.where(pk > last_id)
+        chunk = chunk.order_by(pk).limit(batch_size)
+
+        result = db.session.execute(
+            delete(table).where(pk.in_(chunk)).returning(pk)
+        )
+        deleted_ids = [row[0] for row in result]
+        db.session.commit()
+
+        total += len(deleted_ids)
+        if len(deleted_ids) < batch_size:
+            break
+        last_id = max(deleted_ids)
+
+    return total
+
+
+def purge_expired_sessions(batch_size=None, now=None):
+    """Remove user sessions past their expiry"""
+    from models.user_session import UserSession
+
+    now = now or datetime.utcnow()
+    batch_size = batch_size or current_app.config.get('PURGE_BATCH_SIZE', 1000)
+    return purge_in_batches(UserSession, UserSession.expires_at < now, batch_size)
+
+
+def purge_verification_codes(batch_size=None, now=None):
+    """
+    Remove verification codes that expired or were used more than the retention
+    window ago (kept briefly so /resend-verification still finds recent ones)
+    """
+    from models.verification_code import VerificationCode
+
+    now = now or datetime.utcnow()
+    batch_size = batch_size or current_app.config.get('PURGE_BATCH_SIZE', 1000)
+    cutoff = now - timedelta(hours=current_app.config.get('VERIFICATION_CODE_RETENTION_HOURS', 24))
+
+    condition = db.or_(
+        VerificationCode.expires_at < cutoff,
+        db.and_(VerificationCode.is_used == True, VerificationCode.used_at < cutoff)
+    )
+    return purge_in_batches(VerificationCode, condition, batch_size)
+
+
+def default_auto_end_minutes(settings_cache, fallback=120):
+    """attendance.auto_end_minutes as a positive int, or `fallback` when unset or invalid"""
+    try:
+        minutes = int(settings_cache.get('attendance.auto_end_minutes', fallback))
+    except (TypeError, ValueError):
+        return fallback
+    return minutes if minutes > 0 else fallback
+
+
+def auto_end_sessions(now=None):
+    """
+    End active sessions that have run past their auto_end_minutes, in one
+    UPDATE ... RETURNING, and tell the dashboard counters how many ended.
+    Sessions without their own value use the attendance.auto_end_minutes setting.
+    """
+    from models.attendance_session import AttendanceSession
+    from utils.dashboard_stats import dashboard_stats
+    from utils.settings_cache import settings_cache
+    from utils import read_models
+
+    now = now or datetime.utcnow()
+    table = AttendanceSession.__table__
+    minutes = func.coalesce(table.c.auto_end_minutes, default_auto_end_minutes(settings_cache))
+    if db.engine.dialect.name == 'postgresql':
+        deadline = table.c.started_at + literal_column("INTERVAL '1 minute'") * minutes
+    else:
+        deadline = func.datetime(table.c.started_at, func.printf('+%d minutes', minutes))
+
+    result = db.session.execute(
+        update(table)
+        .where(table.c.session_status == 'active', table.c.started_at.isnot(None), deadline <= now)
+        .values(session_status='ended', ended_at=now)
+        .returning(table.c.id)
+    )
+    ended = len(result.fetchall())
+    db.session.commit()
+
+    if ended:
+        dashboard_stats.session_finished(ended)
+        read_models.sessions_changed()
+        print(f"⏱️  Auto-ended {ended} attendance session(s)")
+    return ended
+
+
+def run_purge_jobs():
+    """Scheduled entry point: purge expired sessions and verification codes"""
+    started = datetime.utcnow()
+    results = {}
+
+    for name, job in [('user_sessions', purge_expired_sessions),
+                      ('verification_codes', purge_verification_codes)]:
+        try:
+            results[name] = job()
+        except Exception as e:
+            db.session.rollback()
+            results[name] = None
+            print(f"❌ Purge of {name} failed: {e}")
+
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    summary = ', '.join(f"{name}={count}" for name, count in results.items())
+    print(f"🧹 Maintenance purge finished in {elapsed:.2f}s: {summary}")
+    current_app.logger.info(f"Maintenance purge removed rows: {summary}")
+    return results
@@ -0,0 +1,214 @@
+"""
+Notification push bus for AttendEase
+In-process pub/sub feeding the SSE and long-poll endpoints. On Postgres, every
+publish goes through NOTIFY and each worker LISTENs, so a client connected to
+any worker sees notifications created on every other worker.
+"""
+import json
+import queue
+import select
+import threading
+import time
+from collections import OrderedDict, deque
+
+CHANNEL = 'attendease_notifications'
+MAX_NOTIFY_PAYLOAD = 7500  # Postgres caps NOTIFY payloads at 8000 bytes
+
+
+class Subscription:
+    """One connected client; events are buffered in a small bounded queue"""
+
+    def __init__(self, user_id, user_type, max_pending=100):
+        self.user_id = user_id
+        self.user_type = user_type
+        self.events = queue.Queue(maxsize=max_pending)
+
+    def put(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # Slow client: drop the oldest event rather than block publishers
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                pass
+            self.events.put_nowait(event)
+
+    def get(self, timeout=None):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class NotificationBus:
+    """Routes notification events to the subscriptions of the users they target"""
+
+    def __init__(self, history=50, max_users=10000):
+        self._subscriptions = {}
+        self._history = OrderedDict()  # user_id -> recent direct events (for reconnect catch-up)
+        self._audience_history = deque(maxlen=history)  # recent user_type-targeted events
+        self._history_size = history
+        self._max_users = max_users
+        self._lock = threading.Lock()
+        self._engine = None
+        self._listener = None
+        self._bridge_checked = False
+        self.bridged = False
+
+    def init_app(self, app, db):
+        """Bridge through LISTEN/NOTIFY when running on Postgres"""
+        self._app = app
+        self._db = db
+        self._bridge_requested = app.config.get('NOTIFICATION_BUS_BRIDGE', True)
+        app.extensions['notification_bus'] = self
+
+    def _engine_for_bridge(self):
+        if not self._bridge_checked and getattr(self, '_bridge_requested', False):
+            with self._app.app_context():
+                engine = self._db.engine
+            if engine.dialect.name == 'postgresql':
+                self._engine = engine
+                self.bridged = True
+            self._bridge_checked = True
+        return self._engine
+
+    # Publishing
+
+    def publish(self, event):
+        """Send an event to every worker (via NOTIFY) or just this process"""
+        event.setdefault('event_id', time.time_ns() // 1000)
+        engine = self._engine_for_bridge()
+        if engine is None:
+            self.dispatch(event)
+            return
+
+        payload = json.dumps(event, default=str)
+        if len(payload) > MAX_NOTIFY_PAYLOAD:
+            # Too large for NOTIFY: send a reference, clients fetch the full row
+            event = dict(event, notification={'id': event['notification'].get('id'), 'truncated': True})
+            payload = json.dumps(event, default=str)
+        try:
+            from sqlalchemy import text
+            with engine.begin() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"), {'channel': CHANNEL, 'payload': payload})
+        except Exception as e:
+            print(f"⚠️  NOTIFY failed ({e}) - delivering locally only")
+            self.dispatch(event)
+
+    def publish_to_user(self, user_id, event_type, notification):
+        self.publish({'type': event_type, 'user_id': str(user_id), 'notification': notification})
+
+    def publish_to_audience(self, user_type, event_type, notification):
+        """user_type is 'all' or one of the user types"""
+        self.publish({'type': event_type, 'target_user_type': user_type, 'notification': notification})
+
+    # Delivery inside this process
+
+    def dispatch(self, event):
+        with self._lock:
+            user_id = event.get('user_id')
+            if user_id:
+                history = self._history.get(user_id)
+                if history is not None:
+                    history.append(event)
+                targets = list(self._subscriptions.get(user_id, ()))
+            else:
+                audience = event.get('target_user_type', 'all')
+                self._audience_history.append(event)
+                targets = [
+                    sub for subs in self._subscriptions.values() for sub in subs
+                    if audience == 'all' or sub.user_type == audience
+                ]
+        for subscription in targets:
+            subscription.put(event)
+
+    def subscribe(self, user_id, user_type):
+        user_id = str(user_id)
+        subscription = Subscription(user_id, user_type)
+        with self._lock:
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+            if user_id not in self._history:
+                self._history[user_id] = deque(maxlen=self._history_size)
+            self._history.move_to_end(user_id)
+            while len(self._history) > self._max_users:
+                self._history.popitem(last=False)
+        if self._engine_for_bridge() is not None:
+            self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subs = self._subscriptions.get(subscription.user_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscriptions[subscription.user_id]
+
+    def events_since(self, user_id, user_type, event_id):
+        """Buffered events newer than event_id, for clients reconnecting after a gap"""
+        with self._lock:
+            direct = list(self._history.get(str(user_id), ()))
+            audience = [e for e in self._audience_history
+                        if e.get('target_user_type') in ('all', user_type)]
+        events = [e for e in direct + audience if e.get('event_id', 0) > event_id]
+        return sorted(events, key=lambda e: e['event_id'])
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subs) for subs in self._subscriptions.values())
+
+    # LISTEN side of the Postgres bridge
+
+    def _ensure_listener(self):
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, name='notification-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            raw = None
+            try:
+                raw = self._engine.raw_connection()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                print(f"✅ Listening for notifications on '{CHANNEL}'")
+                backoff = 1
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            self.dispatch(json.loads(notify.payload))
+                        except ValueError:
+                            pass
+            except Exception as e:
+                print(f"⚠️  Notification listener lost connection ({e}); retrying in {backoff}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.invalidate()
+                    except Exception:
+                        pass
+
+
+notification_bus = NotificationBus()
@@ -1,11 +1,8 @@
 import os
-import smtplib
-import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from twilio.rest import Client
 from datetime import datetime
 from flask import current_app
+from utils.delivery_queue import delivery_queue
+from utils.bulk_mailer import bulk_mailer, BulkTemplate, escape_template
 
 class NotificationService:
     """Service for sending notifications via email and SMS"""
@@ -44,28 +41,8 @@ class NotificationService:
     
     @staticmethod
     def _send_email_verification(code, email):
-        """Send verification code via email"""
-        try:
-            # Check if SMTP is configured
-            smtp_username = os.getenv('SMTP_USERNAME')
-            smtp_password = os.getenv('SMTP_PASSWORD')
-            
-            if not smtp_username or not smtp_password:
-                print("📧 SMTP not configured - using mock email service")
-                print(f"📧 MOCK EMAIL to {email}: Your verification code is {code}")
-                return True
-            
-            # Real email sending
-            smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
-            smtp_port = int(os.getenv('SMTP_PORT', '587'))
-            
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = smtp_username
-            msg['To'] = email
-            msg['Subject'] = "AttendEase - Verification Code"
-            
-            body = f"""
+        """Queue the verification code email; delivery happens on a background worker"""
+        body = f"""
             Welcome to AttendEase!
             
             Your verification code is: {code}
@@ -77,67 +54,25 @@ class NotificationService:
             Best regards,
             AttendEase Team
             """
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(smtp_username, smtp_password)
-            text = msg.as_string()
-            server.sendmail(smtp_username, email, text)
-            server.quit()
-            
-            print(f"✅ Email sent successfully to {email}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Email sending failed: {str(e)}")
-            # Fallback to mock
-            print(f"📧 MOCK EMAIL to {email}: Your verification code is {code}")
-            return True
+        
+        queued = delivery_queue.send_email(email, "AttendEase - Verification Code", body)
+        if queued:
+            print(f"📨 Email queued for {email}")
+        return queued
     
     @staticmethod
     def _send_sms_verification(code, phone_number):
-        """Send verification code via SMS"""
-        try:
-            # Check if Twilio is configured
-            account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-            auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-            from_number = os.getenv('TWILIO_PHONE_NUMBER')
-            
-            if not account_sid or not auth_token or not from_number:
-                print("📱 Twilio not configured - using mock SMS service")
-                print(f"📱 MOCK SMS to {phone_number}: Your AttendEase verification code is {code}")
-                return True
-            
-            # Real SMS sending
-            client = Client(account_sid, auth_token)
-            
-            message = client.messages.create(
-                body=f"Your AttendEase verification code is: {code}. This code expires in 10 minutes.",
-                from_=from_number,
-                to=phone_number
-            )
-            
-            print(f"✅ SMS sent successfully to {phone_number} (SID: {message.sid})")
-            return True
-            
-        except Exception as e:
-            print(f"❌ SMS sending failed: {str(e)}")
-            # Fallback to mock
-            print(f"📱 MOCK SMS to {phone_number}: Your AttendEase verification code is {code}")
-            return True
+        """Queue the verification code SMS; delivery happens on a background worker"""
+        body = f"Your AttendEase verification code is: {code}. This code expires in 10 minutes."
+        
+        queued = delivery_queue.send_sms(phone_number, body)
+        if queued:
+            print(f"📨 SMS queued for {phone_number}")
+        return queued
     
     def send_verification_email(self, email, code, user_name):
         """Send verification email with code"""
         try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = "AttendEase - Email Verification"
-            message["From"] = f"{self.from_name} <{self.from_email}>"
-            message["To"] = email
-            
             # Create HTML content
             html = f"""
             <!DOCTYPE html>
@@ -207,21 +142,12 @@ class NotificationService:
             This is an automated message. Please do not reply to this email.
             """
             
-            # Add parts to message
-            part1 = MIMEText(text, "plain")
-            part2 = MIMEText(html, "html")
-            message.attach(part1)
-            message.attach(part2)
-            
             # Send email
             if self.smtp_username and self.smtp_password:
-                context = ssl.create_default_context()
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.starttls(context=context)
-                    server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, email, message.as_string())
+                if not delivery_queue.send_email(email, "AttendEase - Email Verification", text, html=html):
+                    return False
                 
-                current_app.logger.info(f"Verification email sent to {email}")
+                current_app.logger.info(f"Verification email queued for {email}")
                 return True
             else:
                 # For development - just log the code
@@ -236,12 +162,6 @@ class NotificationService:
     def send_password_reset_email(self, email, reset_token, user_name):
         """Send password reset email"""
         try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = "AttendEase - Password Reset"
-            message["From"] = f"{self.from_name} <{self.from_email}>"
-            message["To"] = email
-            
             reset_url = f"{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/reset-password?token={reset_token}"
             
             # Create HTML content
@@ -312,21 +232,12 @@ class NotificationService:
             This is an automated message. Please do not reply to this email.
             """
             
-            # Add parts to message
-            part1 = MIMEText(text, "plain")
-            part2 = MIMEText(html, "html")
-            message.attach(part1)
-            message.attach(part2)
-            
             # Send email
             if self.smtp_username and self.smtp_password:
-                context = ssl.create_default_context()
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    server.starttls(context=context)
-                    server.login(self.smtp_username, self.smtp_password)
-                    server.sendmail(self.from_email, email, message.as_string())
+                if not delivery_queue.send_email(email, "AttendEase - Password Reset", text, html=html):
+                    return False
                 
-                current_app.logger.info(f"Password reset email sent to {email}")
+                current_app.logger.info(f"Password reset email queued for {email}")
                 return True
             else:
                 # For development - just log the token
@@ -394,20 +305,25 @@ class NotificationService:
         return True
     
     @staticmethod
-    def send_bulk_notification(emails, title, message):
+    def send_bulk_notification(emails, title, message, wait=False):
         """
         Send notification to multiple users
+        
+        Runs in the background over a few persistent SMTP connections and
+        returns the BulkJob (job.progress() reports sent/failed/ETA).
+        Pass wait=True to block until every message has been attempted.
         """
         print(f"\n📢 SENDING BULK NOTIFICATION")
         print(f"👥 Recipients: {len(emails)} users")
         print(f"📋 Title: {title}")
-        print(f"📝 Message: {message}")
         
-        for email in emails:
-            print(f"   📧 Sending to: {email}")
-        
-        print(f"✅ Bulk notification sent to {len(emails)} users")
-        return True
+        template = BulkTemplate(
+            subject=f"AttendEase - {title}",
+            # The message is literal admin text, not a template
+            text=f"{escape_template(message)}\n\nBest regards,\nAttendEase Team\n",
+            from_header=bulk_mailer.default_from_header()
+        )
+        return bulk_mailer.send(emails, template, wait=wait)
     
     @staticmethod
     def log_notification(notification_type, recipient, content, status='sent'):
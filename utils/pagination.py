@@ -0,0 +1,167 @@
+"""
+Shared pagination for list endpoints
+Supports classic page/per_page (OFFSET) and keyset pagination with an opaque
+`after=` cursor, which costs the same on page 1000 as on page 1. The total can
+be exact, estimated by the planner, or skipped (`count=exact|estimate|none`).
+"""
+import base64
+import json
+import math
+import uuid
+from datetime import datetime, date
+from flask import request, current_app
+from sqlalchemy import text, tuple_
+from app import db
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+
+class CursorError(ValueError):
+    """Raised for an `after` cursor that cannot be decoded"""
+
+
+def get_page_args(default_per_page=20):
+    """page, per_page (capped at MAX_PAGE_SIZE), after cursor and count mode from the query string"""
+    max_per_page = current_app.config.get('MAX_PAGE_SIZE', 100)
+    per_page = request.args.get('per_page', default_per_page, type=int) or default_per_page
+    per_page = max(1, min(per_page, max_per_page))
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    after = request.args.get('after') or None
+
+    # Keyset pages skip the COUNT by default; offset pages keep the old behaviour
+    count_mode = request.args.get('count', 'none' if after else 'exact').lower()
+    if count_mode not in COUNT_MODES:
+        count_mode = 'exact'
+    return page, per_page, after, count_mode
+
+
+def _to_json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _from_json(column, value):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except (NotImplementedError, AttributeError):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values):
+    raw = json.dumps([_to_json(v) for v in values], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if len(values) != len(columns):
+            raise ValueError('cursor length mismatch')
+        return [_from_json(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise CursorError(f'Invalid pagination cursor: {e}')
+
+
+def keyset_condition(columns, values, descending=True):
+    """Row-value comparison, e.g. (created_at, id) < (:c, :i); served by a matching composite index"""
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+
+def estimate_count(query):
+    """
+    Cheap row estimate on Postgres: pg_class.reltuples for an unfiltered table,
+    otherwise the planner's row estimate. Returns None when no estimate is available.
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    try:
+        # Inside a SAVEPOINT, so a failed estimate leaves the caller's transaction
+        # and already-loaded objects alone
+        with db.session.begin_nested():
+            statement = query.order_by(None).statement
+            if statement.whereclause is None and len(statement.get_final_froms()) == 1:
+                table = statement.get_final_froms()[0]
+                estimate = db.session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+                    {'name': table.name}
+                ).scalar()
+            else:
+                # Sent without parameters, so undo the driver's %-escaping of the inlined literals
+                sql = str(statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+                plan = db.session.connection().exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + sql.replace('%%', '%')
+                ).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                estimate = plan[0]['Plan']['Plan Rows']
+        return max(int(estimate), 0) if estimate is not None and estimate >= 0 else None
+    except Exception:
+        return None
+
+
+def build_pagination(page, per_page, after, has_next, next_cursor, total, estimated=False):
+    """Response block; keeps the original page/pages/total keys and adds cursor fields"""
+    return {
+        'page': None if after else page,
+        'pages': math.ceil(total / per_page) if total is not None else None,
+        'per_page': per_page,
+        'total': total,
+        'total_is_estimate': estimated,
+        'has_next': has_next,
+        'has_prev': bool(after) or page > 1,
+        'next_cursor': next_cursor
+    }
+
+
+def paginate(query, sort_column, id_column, descending=True, default_per_page=20):
+    """
+    Paginate an ORM query ordered by (sort_column, id_column).
+
+    With ?after=<cursor> the page is fetched by keyset, otherwise by page
+    number; either way `next_cursor` is returned so clients can switch to
+    keyset paging. sort_column must be non-null for rows to page correctly.
+    Returns (items, pagination_dict); raises CursorError for a bad cursor.
+    """
+    page, per_page, after, count_mode = get_page_args(default_per_page)
+    columns = [sort_column, id_column]
+    ordered = query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+    if after:
+        values = decode_cursor(after, columns)
+        page_query = ordered.filter(keyset_condition(columns, values, descending))
+    else:
+        page_query = ordered.offset((page - 1) * per_page)
+
+    rows = page_query.limit(per_page + 1).all()
+    has_next = len(rows) > per_page
+    items = rows[:per_page]
+
+    next_cursor = None
+    if has_next and items:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, sort_column.key), getattr(last, id_column.key)])
+
+    total = None
+    estimated = False
+    if count_mode == 'estimate':
+        total = estimate_count(query)
+        estimated = total is not None
+    if count_mode == 'exact' or (count_mode == 'estimate' and total is None):
+        total = query.order_by(None).count()
+
+    return items, build_pagination(page, per_page, after, has_next, next_cursor, total, estimated)
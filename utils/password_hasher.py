@@ -0,0 +1,214 @@
+"""
+Password hashing service for AttendEase
+Runs bcrypt/werkzeug hashing on a small bounded worker pool so that bursts of
+logins cannot monopolise the CPU needed by every other route.
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask_bcrypt import generate_password_hash as bcrypt_generate_password_hash
+from flask_bcrypt import check_password_hash as bcrypt_check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full or a job did not finish in time"""
+    pass
+
+
+def is_bcrypt_hash(pw_hash):
+    """Check whether a stored hash was produced by bcrypt"""
+    return bool(pw_hash) and pw_hash.startswith(('$2a$', '$2b$', '$2y$'))
+
+
+def get_bcrypt_rounds(pw_hash):
+    """Extract the cost factor from a bcrypt hash ($2b$12$...)"""
+    try:
+        return int(pw_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def _bulk_context():
+    """forkserver context whose server has only this module preloaded"""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _hash_with(job):
+    """Hash one (password, method, rounds) job; module-level so process pools can pickle it"""
+    password, method, rounds = job
+    if method == 'bcrypt':
+        return bcrypt_generate_password_hash(password, rounds).decode('utf-8')
+    return generate_password_hash(password, method=method)
+
+
+class PasswordHasher:
+    """
+    Hash and verify passwords on a bounded thread pool.
+
+    bcrypt and hashlib release the GIL while hashing, so a pool of N workers
+    caps hashing at N cores while the request thread simply waits. Jobs beyond
+    workers + max_queue are rejected immediately with HashingBusyError.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'bcrypt'
+        self.rounds = 12
+        self.workers = 2
+        self.max_queue = 16
+        self.timeout = 10
+        self._werkzeug_prefix = None
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read hashing configuration from the Flask app and start the pool"""
+        self.configure(
+            method=app.config.get('PASSWORD_HASH_METHOD', 'bcrypt'),
+            rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12),
+            workers=app.config.get('PASSWORD_HASH_WORKERS', 2),
+            max_queue=app.config.get('PASSWORD_HASH_MAX_QUEUE', 16),
+            timeout=app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        )
+        app.extensions['password_hasher'] = self
+
+    def configure(self, method='bcrypt', rounds=12, workers=2, max_queue=16, timeout=10):
+        """(Re)configure the hasher and replace the worker pool"""
+        with self._lock:
+            old_executor = self._executor
+            self.method = method
+            self.rounds = int(rounds)
+            self.workers = max(1, int(workers))
+            self.max_queue = max(0, int(max_queue))
+            self.timeout = float(timeout)
+            self._werkzeug_prefix = None
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix='password-hasher'
+            )
+            self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        if old_executor:
+            old_executor.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _submit(self, fn, *args):
+        """Run fn on the pool, rejecting work when the queue is full"""
+        if self._executor is None:
+            self.configure(self.method, self.rounds, self.workers, self.max_queue, self.timeout)
+
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusyError('Password hashing queue is full')
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HashingBusyError('Password hashing timed out')
+
+    # Synchronous primitives (run on the worker threads)
+
+    def _hash(self, password):
+        return _hash_with((password, self.method, self.rounds))
+
+    @staticmethod
+    def _verify(pw_hash, password):
+        if not pw_hash or password is None:
+            return False
+        try:
+            if is_bcrypt_hash(pw_hash):
+                return bcrypt_check_password_hash(pw_hash, password)
+            return check_password_hash(pw_hash, password)
+        except ValueError:
+            # Unknown or corrupt hash format
+            return False
+
+    # Public API
+
+    def hash_password(self, password):
+        """Hash a password with the configured method and cost"""
+        return self._submit(self._hash, password)
+
+    def hash_many(self, passwords, processes=None):
+        """
+        Hash a batch of passwords for bulk provisioning, in input order.
+
+        Runs on a process pool of `processes` workers (default: every core)
+        that lives only for this call, so it is not bounded by the login pool
+        and leaves nothing behind between batches. Workers come from a
+        forkserver rather than fork(), because the app process already runs
+        scheduler and queue threads whose held locks a fork would copy. Falls
+        back to threads where processes cannot be started; bcrypt releases
+        the GIL there.
+        """
+        jobs = [(password, self.method, self.rounds) for password in passwords]
+        processes = max(1, min(int(processes or os.cpu_count() or 1), len(jobs) or 1))
+        if processes == 1:
+            return [_hash_with(job) for job in jobs]
+
+        # A few chunks per worker keeps pickling overhead low without idle tails
+        chunksize = max(1, len(jobs) // (processes * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=_bulk_context()) as pool:
+                return list(pool.map(_hash_with, jobs, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            with ThreadPoolExecutor(max_workers=processes, thread_name_prefix='password-bulk') as pool:
+                return list(pool.map(_hash_with, jobs))
+
+    def verify_password(self, password, pw_hash):
+        """Check a password against a stored bcrypt or werkzeug hash"""
+        return self._submit(self._verify, pw_hash, password)
+
+    def needs_rehash(self, pw_hash):
+        """Whether a stored hash differs from the configured method or cost"""
+        if not pw_hash:
+            return True
+        if self.method == 'bcrypt':
+            return not is_bcrypt_hash(pw_hash) or get_bcrypt_rounds(pw_hash) != self.rounds
+        if is_bcrypt_hash(pw_hash):
+            return True
+        return pw_hash.split('$', 1)[0] != self._get_werkzeug_prefix()
+
+    def _get_werkzeug_prefix(self):
+        """
+        Full 'method:params' prefix werkzeug writes for the configured method.
+        Stored hashes carry the resolved parameters (pbkdf2:sha256:600000),
+        so 'pbkdf2:sha256' alone would never match them.
+        """
+        if self._werkzeug_prefix is None:
+            self._werkzeug_prefix = generate_password_hash('', method=self.method).split('$', 1)[0]
+        return self._werkzeug_prefix
+
+    def get_stats(self):
+        """Configuration snapshot for diagnostics"""
+        return {
+            'method': self.method,
+            'rounds': self.rounds if self.method == 'bcrypt' else None,
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'timeout_seconds': self.timeout
+        }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,227 @@
+"""
+Token-bucket rate limiting for AttendEase
+Used to stop credential-stuffing traffic on /api/auth/login before it reaches
+the database or the password hashing pool.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+
+
+class MemoryBackend:
+    """
+    In-process token buckets with LRU eviction.
+
+    Memory is bounded by max_keys: when full, the least recently used bucket
+    is dropped (a dropped bucket simply starts full again).
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_per_second, cost=1):
+        """Take `cost` tokens from a bucket. Returns (allowed, retry_after_seconds)"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens, updated = float(capacity), now
+            else:
+                tokens, updated = bucket
+                tokens = min(float(capacity), tokens + (now - updated) * refill_per_second)
+                self._buckets.move_to_end(key)
+
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed = False
+                retry_after = (cost - tokens) / refill_per_second if refill_per_second > 0 else 60
+
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return allowed, retry_after
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+    def size(self):
+        return len(self._buckets)
+
+
+class RedisBackend:
+    """
+    Token buckets stored in Redis so all gunicorn workers share one budget.
+    Each bucket is a hash updated atomically by a Lua script and expires once idle.
+    """
+
+    LUA_CONSUME = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local now = tonumber(ARGV[4])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    local ttl = 60
+    if rate > 0 then ttl = math.ceil(capacity / rate) + 1 end
+    redis.call('EXPIRE', KEYS[1], ttl)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix='attendease:ratelimit:'):
+        import redis  # Optional dependency, only needed for shared limits
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._consume = self.client.register_script(self.LUA_CONSUME)
+
+    def consume(self, key, capacity, refill_per_second, cost=1):
+        allowed, tokens = self._consume(
+            keys=[self.prefix + key],
+            args=[capacity, refill_per_second, cost, time.time()]
+        )
+        if allowed:
+            return True, 0
+        tokens = float(tokens)
+        retry_after = (cost - tokens) / refill_per_second if refill_per_second > 0 else 60
+        return False, retry_after
+
+    def reset(self, key=None):
+        if key is None:
+            for redis_key in self.client.scan_iter(self.prefix + '*'):
+                self.client.delete(redis_key)
+        else:
+            self.client.delete(self.prefix + key)
+
+    def size(self):
+        return sum(1 for _ in self.client.scan_iter(self.prefix + '*'))
+
+
+def create_backend(url=None, max_keys=10000):
+    """Build a limiter backend from a URL (redis://...) or fall back to memory"""
+    url = url if url is not None else os.getenv('RATE_LIMIT_BACKEND_URL', '')
+    if url.startswith(('redis://', 'rediss://')):
+        try:
+            return RedisBackend(url)
+        except Exception as e:
+            print(f"⚠️  Rate limit backend unavailable ({e}) - using in-memory buckets")
+    return MemoryBackend(max_keys=max_keys)
+
+
+class LoginRateLimiter:
+    """
+    Per-email and per-IP token buckets for login attempts.
+
+    Limits come from SystemSetting (auth.login_*) through the settings cache and
+    are re-parsed at most every `settings_ttl` seconds, so checking the limiter
+    never costs a query per request.
+    """
+
+    DEFAULTS = {
+        'auth.login_rate_limit_enabled': True,
+        'auth.login_email_burst': 5,
+        'auth.login_email_per_minute': 5,
+        'auth.login_ip_burst': 20,
+        'auth.login_ip_per_minute': 30
+    }
+
+    def __init__(self, backend=None, settings_ttl=60):
+        self.backend = backend
+        self.settings_ttl = settings_ttl
+        self._limits = dict(self.DEFAULTS)
+        self._limits_loaded_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Attach the configured backend"""
+        self.backend = create_backend(
+            app.config.get('RATE_LIMIT_BACKEND_URL', ''),
+            max_keys=app.config.get('RATE_LIMIT_MAX_KEYS', 10000)
+        )
+        app.extensions['login_rate_limiter'] = self
+
+    def _load_limits(self):
+        """Limits from the settings cache, keeping defaults for missing keys"""
+        from utils.settings_cache import settings_cache
+
+        limits = dict(self.DEFAULTS)
+        try:
+            values = settings_cache.get_many(self.DEFAULTS.keys())
+            for key, value in values.items():
+                if value is None:
+                    continue
+                default = self.DEFAULTS[key]
+                if isinstance(default, bool):
+                    limits[key] = str(value).lower() == 'true'
+                else:
+                    limits[key] = float(value)
+        except Exception as e:
+            print(f"⚠️  Could not load login rate limit settings: {e}")
+        return limits
+
+    def get_limits(self):
+        now = time.monotonic()
+        if self._limits_loaded_at is None or now - self._limits_loaded_at > self.settings_ttl:
+            with self._lock:
+                if self._limits_loaded_at is None or now - self._limits_loaded_at > self.settings_ttl:
+                    self._limits = self._load_limits()
+                    self._limits_loaded_at = now
+        return self._limits
+
+    def invalidate(self):
+        """Force limits to be re-read on the next check"""
+        self._limits_loaded_at = None
+
+    def check(self, email, ip_address):
+        """
+        Consume one attempt for this email and IP.
+        Returns (allowed, retry_after_seconds).
+        """
+        limits = self.get_limits()
+        if not limits['auth.login_rate_limit_enabled']:
+            return True, 0
+
+        if self.backend is None:
+            self.backend = create_backend()
+
+        checks = [
+            (f"ip:{ip_address}", limits['auth.login_ip_burst'], limits['auth.login_ip_per_minute']),
+            (f"email:{email}", limits['auth.login_email_burst'], limits['auth.login_email_per_minute'])
+        ]
+
+        for key, burst, per_minute in checks:
+            if not key.split(':', 1)[1]:
+                continue
+            allowed, retry_after = self.backend.consume(key, burst, per_minute / 60.0)
+            if not allowed:
+                return False, retry_after
+
+        return True, 0
+
+
+def get_client_ip(request):
+    """
+    Peer address of the client. X-Forwarded-For is client-controlled, so it
+    is only honoured through ProxyFix for TRUSTED_PROXY_COUNT proxies
+    (see create_app), which rewrites remote_addr from the trusted hops.
+    """
+    return request.remote_addr or ''
+
+
+login_rate_limiter = LoginRateLimiter()
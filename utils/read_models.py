@@ -0,0 +1,291 @@
+"""
+Materialized read models for AttendEase dashboards
+Each read model is a Postgres materialized view over one of the schema's
+dashboard views, refreshed CONCURRENTLY in the background when the data behind
+it changes. Until the view exists (or on other databases) reads run the same
+SELECT live, so the endpoints work before the migration has been applied.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import text, bindparam
+from sqlalchemy.dialects.postgresql import UUID
+from app import db
+
+# The student_dashboard view in scripts/attendease_schema.sql, restricted to the active
+# assignments of the enrollment's own semester (one row per student and assignment)
+STUDENT_DASHBOARD_SQL = """
+SELECT
+    s.id AS student_id,
+    s.matricle_number,
+    s.full_name AS student_name,
+    c.course_code,
+    c.course_title,
+    c.credit_units,
+    d.name AS department_name,
+    l.full_name AS lecturer_name,
+    ca.id AS course_assignment_id,
+    sem.name AS semester_name,
+    ay.year_name,
+    CASE
+        WHEN EXISTS (
+            SELECT 1 FROM attendance_sessions ats
+            WHERE ats.course_assignment_id = ca.id
+            AND ats.session_status = 'active'
+        ) THEN true
+        ELSE false
+    END AS has_active_session,
+    (
+        SELECT COUNT(*)
+        FROM attendance_records ar
+        JOIN attendance_sessions ats ON ar.session_id = ats.id
+        WHERE ar.student_id = s.id
+        AND ats.course_assignment_id = ca.id
+        AND ar.attendance_status IN ('present', 'late')
+    ) AS classes_attended,
+    (
+        SELECT COUNT(*)
+        FROM attendance_sessions ats
+        WHERE ats.course_assignment_id = ca.id
+        AND ats.session_status = 'ended'
+    ) AS total_classes
+FROM students s
+JOIN student_enrollments se ON s.id = se.student_id
+JOIN courses c ON se.course_id = c.id
+JOIN course_assignments ca ON c.id = ca.course_id
+    AND ca.semester_id = se.semester_id
+    AND ca.is_active = true
+JOIN lecturers l ON ca.lecturer_id = l.id
+JOIN departments d ON c.department_id = d.id
+JOIN semesters sem ON se.semester_id = sem.id
+JOIN academic_years ay ON sem.academic_year_id = ay.id
+WHERE se.enrollment_status = 'enrolled'
+AND sem.is_current = true
+"""
+
+# Same SELECT as the lecturer_dashboard view in scripts/attendease_schema.sql
+LECTURER_DASHBOARD_SQL = """
+SELECT
+    l.id AS lecturer_id,
+    l.lecturer_id AS lecturer_staff_id,
+    l.full_name AS lecturer_name,
+    c.course_code,
+    c.course_title,
+    d.name AS department_name,
+    ca.id AS course_assignment_id,
+    ga.name AS classroom_name,
+    sem.name AS semester_name,
+    ay.year_name,
+    (
+        SELECT COUNT(*)
+        FROM student_enrollments se
+        WHERE se.course_id = c.id
+        AND se.semester_id = sem.id
+        AND se.enrollment_status = 'enrolled'
+    ) AS enrolled_students,
+    CASE
+        WHEN EXISTS (
+            SELECT 1 FROM attendance_sessions ats
+            WHERE ats.course_assignment_id = ca.id
+            AND ats.session_status = 'active'
+        ) THEN true
+        ELSE false
+    END AS has_active_session,
+    (
+        SELECT COUNT(*)
+        FROM attendance_sessions ats
+        WHERE ats.course_assignment_id = ca.id
+        AND ats.session_status = 'ended'
+    ) AS total_sessions
+FROM lecturers l
+JOIN course_assignments ca ON l.id = ca.lecturer_id
+JOIN courses c ON ca.course_id = c.id
+JOIN departments d ON c.department_id = d.id
+JOIN semesters sem ON ca.semester_id = sem.id
+JOIN academic_years ay ON sem.academic_year_id = ay.id
+LEFT JOIN geofence_areas ga ON ca.geofence_area_id = ga.id
+WHERE ca.is_active = true
+AND sem.is_current = true
+"""
+
+
+class MaterializedReadModel:
+    """
+    One materialized view plus its live fallback.
+
+    Refresh requests are debounced through the background scheduler: a burst of
+    changes produces one refresh `debounce` seconds after the last of them, but
+    never later than `max_delay` seconds after the first. Without a running
+    scheduler they are coalesced on a thread instead: while one refresh runs,
+    further requests only mark the view dirty for a single follow-up run.
+    """
+
+    def __init__(self, name, definition, key_column):
+        self.name = name
+        self.definition = definition
+        self.key_column = key_column
+        self._app = None
+        self.enabled = True
+        self._available = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._dirty = False
+        self._first_requested = None
+        self.debounce = 5
+        self.max_delay = 60
+        self.last_refreshed_at = None
+        self.last_refresh_seconds = None
+
+    def init_app(self, app):
+        self._app = app
+        self.enabled = app.config.get('DASHBOARD_READ_MODELS', True)
+        self.debounce = app.config.get('DASHBOARD_REFRESH_DEBOUNCE_SECONDS', 5)
+        self.max_delay = app.config.get('DASHBOARD_REFRESH_MAX_DELAY_SECONDS', 60)
+
+    def is_available(self):
+        """True once the materialized view exists (checked once per process, then remembered)"""
+        if self._available is not None:
+            return self._available
+        if not self.enabled or db.engine.dialect.name != 'postgresql':
+            return False
+        try:
+            self._available = db.session.execute(
+                text("SELECT to_regclass(:name) IS NOT NULL"), {'name': self.name}
+            ).scalar()
+        except Exception:
+            db.session.rollback()
+            self._available = False
+        if not self._available:
+            print(f"ℹ️  Materialized view '{self.name}' not found - serving dashboard queries live")
+        return self._available
+
+    def fetch(self, key, order_by=None):
+        """Rows for one key (e.g. a student id) as dicts"""
+        source = self.name if self.is_available() else f"({self.definition}) AS live_{self.name}"
+        sql = f"SELECT * FROM {source} WHERE {self.key_column} = :key"
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        statement = text(sql).bindparams(bindparam('key', type_=UUID(as_uuid=True)))
+        return [dict(row._mapping) for row in db.session.execute(statement, {'key': key})]
+
+    def refresh(self):
+        """REFRESH ... CONCURRENTLY (readers are never blocked); falls back to a plain refresh"""
+        if not self.is_available():
+            return False
+        started = time.monotonic()
+        try:
+            db.session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.name}"))
+            db.session.commit()
+        except Exception as e:
+            # CONCURRENTLY needs a populated view with a unique index
+            db.session.rollback()
+            print(f"⚠️  Concurrent refresh of '{self.name}' failed ({e}); refreshing with a lock")
+            db.session.execute(text(f"REFRESH MATERIALIZED VIEW {self.name}"))
+            db.session.commit()
+        self.last_refreshed_at = time.time()
+        self.last_refresh_seconds = round(time.monotonic() - started, 3)
+        return True
+
+    def request_refresh(self):
+        """Schedule a debounced background refresh"""
+        if self._app is None:
+            return
+        from utils.scheduler import scheduler, add_app_job
+
+        if not scheduler.running:
+            self._start_refresh_thread()
+            return
+
+        now = datetime.now()
+        with self._lock:
+            if self._first_requested is None:
+                self._first_requested = now
+            run_at = min(now + timedelta(seconds=self.debounce),
+                         self._first_requested + timedelta(seconds=self.max_delay))
+        # Same job id: each request moves the pending run instead of adding another
+        add_app_job(self._app, self._run_scheduled, f'refresh_{self.name}', trigger='date', run_date=run_at)
+
+    def _run_scheduled(self):
+        with self._lock:
+            self._first_requested = None
+            self._refreshing = True
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _start_refresh_thread(self):
+        with self._lock:
+            if self._refreshing:
+                self._dirty = True
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_loop, name=f'refresh-{self.name}', daemon=True).start()
+
+    def _refresh_loop(self):
+        while True:
+            with self._lock:
+                self._dirty = False
+            with self._app.app_context():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"❌ Refresh of '{self.name}' failed: {e}")
+                finally:
+                    db.session.remove()
+            with self._lock:
+                if not self._dirty:
+                    self._refreshing = False
+                    return
+
+    def status(self):
+        return {
+            'name': self.name,
+            'available': bool(self._available),
+            'refreshing': self._refreshing,
+            'refresh_pending': self._first_requested is not None,
+            'last_refreshed_at': self.last_refreshed_at,
+            'last_refresh_seconds': self.last_refresh_seconds
+        }
+
+
+student_dashboard_view = MaterializedReadModel('student_dashboard_mv', STUDENT_DASHBOARD_SQL, 'student_id')
+lecturer_dashboard_view = MaterializedReadModel('lecturer_dashboard_mv', LECTURER_DASHBOARD_SQL, 'lecturer_id')
+READ_MODELS = (student_dashboard_view, lecturer_dashboard_view)
+
+
+def init_app(app):
+    for read_model in READ_MODELS:
+        read_model.init_app(app)
+    app.extensions['read_models'] = READ_MODELS
+
+
+def sessions_changed():
+    """Attendance sessions started, ended or cancelled"""
+    for read_model in READ_MODELS:
+        read_model.request_refresh()
+
+
+def enrollments_changed():
+    """Students enrolled, dropped or re-enrolled"""
+    for read_model in READ_MODELS:
+        read_model.request_refresh()
+
+
+def assignments_changed():
+    """Course assignments created, updated, deactivated or deleted (e.g. by a semester rollover)"""
+    for read_model in READ_MODELS:
+        read_model.request_refresh()
+
+
+def semesters_changed():
+    """The current semester moved"""
+    for read_model in READ_MODELS:
+        read_model.request_refresh()
+
+
+def refresh_all():
+    """Refresh every available read model now (used by the periodic safety-net job)"""
+    for read_model in READ_MODELS:
+        read_model.refresh()
@@ -0,0 +1,199 @@
+"""
+Reference-data cache for AttendEase
+Departments, courses, semesters, academic years and geofence areas are small
+and change rarely, yet are looked up on most write paths and reports. Each
+table is held in memory as an immutable snapshot indexed by id and by code,
+with the current semester / academic year resolved at load time.
+
+Snapshots are dropped by the create/update/delete routes of their table, and
+writes made by other workers are noticed through the shared table_versions
+rows, checked at most every REFERENCE_CACHE_CHECK_SECONDS.
+"""
+import threading
+import time
+import uuid
+from types import MappingProxyType
+
+
+class ReferenceRecord:
+    """Read-only copy of one row: column attributes plus the model's to_dict()"""
+
+    __slots__ = ('_values', '_data')
+
+    def __init__(self, values, data):
+        object.__setattr__(self, '_values', MappingProxyType(values))
+        object.__setattr__(self, '_data', MappingProxyType(data))
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Reference records are read-only')
+
+    def to_dict(self):
+        return dict(self._data)
+
+    def __repr__(self):
+        return f"<ReferenceRecord {self._values.get('id')}>"
+
+
+class ReferenceSnapshot:
+    """All rows of one table at one version"""
+
+    def __init__(self, records, code_field, version, db_version):
+        self.version = version
+        self.db_version = db_version
+        self.records = tuple(records)
+        self.by_id = {str(record.id): record for record in self.records}
+        self.by_code = {
+            str(getattr(record, code_field)).upper(): record for record in self.records
+        } if code_field else {}
+        self.current = next((r for r in self.records if getattr(r, 'is_current', False)), None)
+
+
+class ReferenceTable:
+    """Cached copy of one reference table"""
+
+    def __init__(self, cache, model_path, table_name, order_by, code_field=None):
+        self.cache = cache
+        self.model_path = model_path
+        self.table_name = table_name
+        self.order_by = order_by
+        self.code_field = code_field
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self):
+        module_name, class_name = self.model_path.rsplit('.', 1)
+        module = __import__(module_name, fromlist=[class_name])
+        return getattr(module, class_name)
+
+    def _load(self, db_version):
+        model = self.model
+        # Taken before the query: an invalidate() during it leaves this snapshot stale, not current
+        version = self._version
+        columns = [column.key for column in model.__table__.columns]
+        rows = model.query.order_by(*[getattr(model, name) for name in self.order_by]).all()
+        records = [
+            ReferenceRecord({name: getattr(row, name) for name in columns}, row.to_dict())
+            for row in rows
+        ]
+        snapshot = ReferenceSnapshot(records, self.code_field, version, db_version)
+        with self._lock:
+            # A slower concurrent load must not replace a snapshot taken after a later invalidate()
+            if self._snapshot is None or self._snapshot.version <= version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self):
+        snapshot = self._snapshot
+        db_version = self.cache.db_version(self.table_name)
+        if snapshot is None or snapshot.version != self._version or snapshot.db_version != db_version:
+            self.misses += 1
+            return self._load(db_version)
+        self.hits += 1
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+
+    # Lookups
+
+    def get(self, record_id):
+        """Record by primary key (UUID or string); None for unknown or malformed ids"""
+        if record_id is None:
+            return None
+        try:
+            key = str(record_id if isinstance(record_id, uuid.UUID) else uuid.UUID(str(record_id)))
+        except ValueError:
+            return None
+        return self.snapshot().by_id.get(key)
+
+    def get_by_code(self, code):
+        if not code:
+            return None
+        return self.snapshot().by_code.get(str(code).upper())
+
+    def current(self):
+        """The row flagged is_current (semesters, academic years)"""
+        return self.snapshot().current
+
+    def first(self):
+        records = self.snapshot().records
+        return records[0] if records else None
+
+    def all(self):
+        return list(self.snapshot().records)
+
+    def get_stats(self):
+        snapshot = self._snapshot
+        return {
+            'rows': len(snapshot.records) if snapshot else None,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class ReferenceDataCache:
+    """The reference tables, sharing one version check against table_versions"""
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        self.departments = ReferenceTable(self, 'models.department.Department', 'departments', ['name'], 'code')
+        self.courses = ReferenceTable(self, 'models.course.Course', 'courses', ['course_code'], 'course_code')
+        self.semesters = ReferenceTable(self, 'models.semester.Semester', 'semesters', ['start_date', 'id'])
+        self.academic_years = ReferenceTable(
+            self, 'models.academic_year.AcademicYear', 'academic_years', ['start_date', 'id'], 'year_name'
+        )
+        self.geofence_areas = ReferenceTable(self, 'models.geofence_area.GeofenceArea', 'geofence_areas', ['name', 'id'])
+        self.tables = {
+            table.table_name: table
+            for table in (self.departments, self.courses, self.semesters, self.academic_years, self.geofence_areas)
+        }
+        self._db_versions = {}
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.check_interval = app.config.get('REFERENCE_CACHE_CHECK_SECONDS', 5)
+        app.extensions['reference_cache'] = self
+
+    def db_version(self, table_name):
+        """Shared data version of a table, re-read for all tables at most every check_interval"""
+        now = time.monotonic()
+        if now - self._checked_at > self.check_interval:
+            from models.table_version import TableVersion
+            versions = TableVersion.get_versions(list(self.tables))
+            with self._lock:
+                self._db_versions = versions
+                self._checked_at = now
+        return self._db_versions.get(table_name, 0)
+
+    def invalidate(self, *table_names):
+        """Call after committing writes to these tables"""
+        for name in table_names:
+            self.tables[name].invalidate()
+
+    def current_semester(self):
+        return self.semesters.current()
+
+    def current_academic_year(self):
+        return self.academic_years.current()
+
+    def get_stats(self):
+        stats = {name: table.get_stats() for name, table in self.tables.items()}
+        hits = sum(s['hits'] for s in stats.values())
+        misses = sum(s['misses'] for s in stats.values())
+        stats['hit_rate'] = round(hits / (hits + misses), 3) if hits + misses else None
+        return stats
+
+
+reference_cache = ReferenceDataCache()
@@ -0,0 +1,363 @@
+"""
+Streaming CSV roster import for AttendEase
+The upload is read row by row and never held in memory. Rows are validated in
+Python with the precompiled UB rules. Every chunk of valid rows is loaded into
+temporary staging tables (COPY on Postgres) and merged set-wise into users,
+students and student_enrollments. Each chunk commits together with the
+RosterImport progress counters, so long uploads can be followed from another
+request.
+
+Columns: email, matricle_number, full_name, department (code or id), gender,
+and optionally level (default 200), enrollment_year (default from the
+matricle), phone_number and courses (codes separated by ';', ',' or spaces).
+Imported accounts get an unusable password and email_verified = false.
+Existing students are matched on email + matricle and left unchanged.
+"""
+import csv
+import io
+import re
+import uuid
+from datetime import datetime
+from sqlalchemy import Table, Column, Integer, String, MetaData, select, update, case, cast, literal, true, false
+from sqlalchemy.dialects.postgresql import UUID
+from app import db
+from models import level_enum, gender_enum, user_type_enum, enrollment_status_enum
+from utils.ub_validators import check_ub_matricle_number, check_email_by_user_type
+
+REQUIRED_COLUMNS = ('email', 'matricle_number', 'full_name', 'department', 'gender')
+VALID_LEVELS = ('200', '300', '400', '500')
+VALID_GENDERS = ('Male', 'Female', 'Other')
+COURSE_SEPARATORS = re.compile(r'[;,\s]+')
+
+# Never matches a bcrypt or werkzeug hash, so imported accounts cannot log in until a password is set
+UNUSABLE_PASSWORD = '!roster-import'
+
+# Per-chunk staging tables; separate metadata keeps them out of db.create_all()
+_staging_metadata = MetaData()
+
+roster_staging = Table(
+    'roster_staging', _staging_metadata,
+    Column('line_number', Integer, primary_key=True, autoincrement=False),
+    Column('user_id', UUID(as_uuid=True), nullable=False),
+    Column('student_id', UUID(as_uuid=True), nullable=False),
+    Column('email', String(255), nullable=False),
+    Column('matricle_number', String(20), nullable=False),
+    Column('full_name', String(255), nullable=False),
+    Column('department_id', UUID(as_uuid=True), nullable=False),
+    Column('level', String(3), nullable=False),
+    Column('gender', String(10), nullable=False),
+    Column('enrollment_year', Integer, nullable=False),
+    Column('phone_number', String(20)),
+    Column('error', String(255)),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP'
+)
+
+roster_enrollment_staging = Table(
+    'roster_enrollment_staging', _staging_metadata,
+    Column('id', UUID(as_uuid=True), primary_key=True),
+    Column('line_number', Integer, nullable=False),
+    Column('course_id', UUID(as_uuid=True), nullable=False),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP'
+)
+
+STAGING_COLUMNS = [column.name for column in roster_staging.columns if column.name != 'error']
+ENROLLMENT_STAGING_COLUMNS = [column.name for column in roster_enrollment_staging.columns]
+
+
+class RosterFormatError(Exception):
+    """The upload as a whole is unusable (empty file, missing columns)"""
+    pass
+
+
+def _dialect_insert():
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+class RosterImporter:
+    """Validates and merges one CSV upload into the RosterImport row `record`"""
+
+    def __init__(self, record, semester=None, created_by=None, chunk_size=1000):
+        self.record = record
+        self.semester = semester
+        self.created_by = created_by
+        self.chunk_size = chunk_size
+        self.errors = []  # first MAX_STORED_ERRORS errors by line
+        self.errors_omitted = 0  # failed rows past that, counted only
+        self._seen_emails = set()
+        self._seen_matricles = set()
+        self._current_year = datetime.now().year % 100
+
+    def _trim_errors(self):
+        """Keep the first MAX_STORED_ERRORS errors by line, so memory stays bounded by one chunk"""
+        limit = self.record.MAX_STORED_ERRORS
+        self.errors.sort(key=lambda e: e['line'])
+        if len(self.errors) > limit:
+            self.errors_omitted += len(self.errors) - limit
+            del self.errors[limit:]
+
+    # Row validation (pure Python, no queries)
+
+    def _fail(self, line_number, row, error):
+        self.errors.append({
+            'line': line_number,
+            'email': (row.get('email') or '').strip() or None,
+            'matricle_number': (row.get('matricle_number') or '').strip() or None,
+            'error': error
+        })
+
+    def parse_row(self, line_number, row):
+        """(staging row, enrollment rows) for a valid CSV row, or None after recording its error"""
+        from utils.reference_cache import reference_cache
+        value = lambda name: (row.get(name) or '').strip()
+
+        email = value('email').lower()
+        matricle_number = value('matricle_number').upper()
+        full_name = value('full_name')
+        level = value('level') or '200'
+        gender = value('gender').capitalize()
+        phone_number = value('phone_number') or None
+
+        error = (
+            check_email_by_user_type(email, 'student')
+            or check_ub_matricle_number(matricle_number, self._current_year)
+        )
+        if not error and len(email) > 255:
+            error = 'Email is too long'
+        if not error and not full_name:
+            error = 'Full name is required'
+        if not error and len(full_name) > 255:
+            error = 'Full name is too long'
+        if not error and level not in VALID_LEVELS:
+            error = f'Invalid level. Must be one of: {", ".join(VALID_LEVELS)}'
+        if not error and gender not in VALID_GENDERS:
+            error = f'Invalid gender. Must be one of: {", ".join(VALID_GENDERS)}'
+        if not error and phone_number and len(phone_number) > 20:
+            error = 'Phone number is too long'
+        if error:
+            self._fail(line_number, row, error)
+            return None
+
+        department_key = value('department')
+        department = reference_cache.departments.get_by_code(department_key) or reference_cache.departments.get(department_key)
+        if not department:
+            self._fail(line_number, row, f"Department '{department_key}' not found")
+            return None
+
+        enrollment_year = value('enrollment_year')
+        if enrollment_year:
+            if not enrollment_year.isdigit():
+                self._fail(line_number, row, 'Enrollment year must be a number')
+                return None
+            enrollment_year = int(enrollment_year)
+        else:
+            enrollment_year = 2000 + int(matricle_number[2:4])
+
+        course_ids = []
+        for code in COURSE_SEPARATORS.split(value('courses')):
+            if not code:
+                continue
+            course = reference_cache.courses.get_by_code(code)
+            if not course or not course.is_active:
+                self._fail(line_number, row, f"Course '{code}' not found or inactive")
+                return None
+            if not self.semester:
+                self._fail(line_number, row, 'No semester selected for course enrollments')
+                return None
+            if course.id not in course_ids:
+                course_ids.append(course.id)
+
+        # Repeats inside the file would silently collapse in the merge, so reject them here
+        if email in self._seen_emails:
+            self._fail(line_number, row, 'Duplicate email in file')
+            return None
+        if matricle_number in self._seen_matricles:
+            self._fail(line_number, row, 'Duplicate matricle number in file')
+            return None
+        self._seen_emails.add(email)
+        self._seen_matricles.add(matricle_number)
+
+        staged = {
+            'line_number': line_number,
+            'user_id': uuid.uuid4(),
+            'student_id': uuid.uuid4(),
+            'email': email,
+            'matricle_number': matricle_number,
+            'full_name': full_name,
+            'department_id': department.id,
+            'level': level,
+            'gender': gender,
+            'enrollment_year': enrollment_year,
+            'phone_number': phone_number
+        }
+        enrollments = [
+            {'id': uuid.uuid4(), 'line_number': line_number, 'course_id': course_id}
+            for course_id in course_ids
+        ]
+        return staged, enrollments
+
+    # Chunk merge (set-wise SQL)
+
+    @staticmethod
+    def _copy_rows(connection, table, columns, rows):
+        """COPY rows into a staging table on psycopg2, else a multi-row INSERT"""
+        cursor = connection.connection.dbapi_connection.cursor()
+        if connection.dialect.name != 'postgresql' or not hasattr(cursor, 'copy_expert'):
+            cursor.close()
+            connection.execute(table.insert(), rows)
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+        buffer.seek(0)
+        try:
+            cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+
+    def merge_chunk(self, staged_rows, enrollment_rows, rows_read, rows_invalid):
+        from models.user import User
+        from models.student import Student
+        from models.student_enrollment import StudentEnrollment
+        users = User.__table__
+        students = Student.__table__
+        enrollments = StudentEnrollment.__table__
+        staging = roster_staging
+        insert = _dialect_insert()
+        now = datetime.utcnow()
+
+        users_created = students_created = enrollments_created = conflicts = 0
+        if staged_rows:
+            connection = db.session.connection()
+            roster_staging.create(connection)
+            roster_enrollment_staging.create(connection)
+            self._copy_rows(connection, roster_staging, STAGING_COLUMNS, staged_rows)
+            if enrollment_rows:
+                self._copy_rows(connection, roster_enrollment_staging, ENROLLMENT_STAGING_COLUMNS, enrollment_rows)
+
+            # 1. Rows that clash with existing accounts are flagged before anything is written
+            account = users.alias('account')
+            profile = students.alias('profile')
+            non_student = select(literal(1)).where(
+                account.c.email == staging.c.email, account.c.user_type != 'student'
+            ).correlate(staging).exists()
+            other_matricle = select(literal(1)).where(
+                account.c.email == staging.c.email,
+                profile.c.user_id == account.c.id,
+                profile.c.matricle_number != staging.c.matricle_number
+            ).correlate(staging).exists()
+            other_email = select(literal(1)).where(
+                profile.c.matricle_number == staging.c.matricle_number,
+                account.c.id == profile.c.user_id,
+                account.c.email != staging.c.email
+            ).correlate(staging).exists()
+            db.session.execute(update(staging).values(error=case(
+                (non_student, 'Email is registered to a non-student account'),
+                (other_matricle, 'Email is registered to a student with another matricle number'),
+                (other_email, 'Matricle number is registered to another email'),
+                else_=None
+            )))
+            accepted = staging.c.error.is_(None)
+
+            # 2. Accounts for new emails
+            users_created = len(db.session.execute(
+                insert(users).from_select(
+                    ['id', 'email', 'password_hash', 'user_type', 'is_active', 'email_verified', 'created_at', 'updated_at'],
+                    select(
+                        staging.c.user_id, staging.c.email, literal(UNUSABLE_PASSWORD), literal('student', user_type_enum),
+                        true(), false(), literal(now), literal(now)
+                    ).where(accepted)
+                ).on_conflict_do_nothing().returning(users.c.id)
+            ).all())
+
+            # 3. Student profiles for accounts that don't have one yet
+            students_created = len(db.session.execute(
+                insert(students).from_select(
+                    ['id', 'user_id', 'matricle_number', 'full_name', 'department_id', 'level', 'gender',
+                     'phone_number', 'is_face_registered', 'enrollment_year', 'created_at', 'updated_at'],
+                    select(
+                        staging.c.student_id, users.c.id, staging.c.matricle_number, staging.c.full_name,
+                        staging.c.department_id, cast(staging.c.level, level_enum), cast(staging.c.gender, gender_enum),
+                        staging.c.phone_number, false(), staging.c.enrollment_year, literal(now), literal(now)
+                    ).select_from(staging.join(users, users.c.email == staging.c.email)).where(accepted)
+                ).on_conflict_do_nothing().returning(students.c.id)
+            ).all())
+
+            # 4. Enrollments for new and existing students alike
+            if enrollment_rows:
+                course_rows = roster_enrollment_staging
+                enrollments_created = len(db.session.execute(
+                    insert(enrollments).from_select(
+                        ['id', 'student_id', 'course_id', 'semester_id', 'enrollment_date', 'enrollment_status', 'enrolled_by'],
+                        select(
+                            course_rows.c.id, students.c.id, course_rows.c.course_id, literal(self.semester.id),
+                            literal(now), literal('enrolled', enrollment_status_enum), literal(self.created_by, UUID(as_uuid=True))
+                        ).select_from(
+                            course_rows.join(staging, staging.c.line_number == course_rows.c.line_number)
+                            .join(students, students.c.matricle_number == staging.c.matricle_number)
+                        ).where(accepted)
+                    ).on_conflict_do_nothing().returning(enrollments.c.id)
+                ).all())
+
+            for line_number, email, matricle_number, error in db.session.execute(
+                select(staging.c.line_number, staging.c.email, staging.c.matricle_number, staging.c.error)
+                .where(staging.c.error.isnot(None)).order_by(staging.c.line_number)
+            ):
+                conflicts += 1
+                self.errors.append({'line': line_number, 'email': email, 'matricle_number': matricle_number, 'error': error})
+
+            if connection.dialect.name != 'postgresql':
+                roster_enrollment_staging.drop(connection)
+                roster_staging.drop(connection)
+
+        record = self.record
+        record.rows_processed += rows_read
+        record.rows_failed += rows_invalid + conflicts
+        record.users_created += users_created
+        record.students_created += students_created
+        record.students_existing += len(staged_rows) - conflicts - students_created
+        record.enrollments_created += enrollments_created
+        # Later chunks only hold later lines, so trimming per chunk keeps the overall first errors
+        self._trim_errors()
+        record.errors = list(self.errors)
+        db.session.commit()
+
+    # Driver
+
+    def run(self, text_stream):
+        """Read the CSV from a text stream, merging every chunk_size rows"""
+        reader = csv.DictReader(text_stream)
+        if not reader.fieldnames:
+            raise RosterFormatError('CSV file is empty')
+        reader.fieldnames = [(name or '').strip().lower() for name in reader.fieldnames]
+        missing = [name for name in REQUIRED_COLUMNS if name not in reader.fieldnames]
+        if missing:
+            raise RosterFormatError(f"Missing required columns: {', '.join(missing)}")
+
+        staged_rows, enrollment_rows = [], []
+        rows_read = rows_invalid = 0
+        for row in reader:
+            rows_read += 1
+            parsed = self.parse_row(reader.line_num, row)
+            if parsed is None:
+                rows_invalid += 1
+            else:
+                staged_rows.append(parsed[0])
+                enrollment_rows.extend(parsed[1])
+            if rows_read >= self.chunk_size:
+                self.merge_chunk(staged_rows, enrollment_rows, rows_read, rows_invalid)
+                staged_rows, enrollment_rows = [], []
+                rows_read = rows_invalid = 0
+        if rows_read:
+            self.merge_chunk(staged_rows, enrollment_rows, rows_read, rows_invalid)
+
+        self.record.status = 'completed'
+        self.record.finished_at = datetime.utcnow()
+        db.session.commit()
+        return self.record
@@ -0,0 +1,77 @@
+"""
+Background job scheduler for AttendEase
+Wraps APScheduler so periodic maintenance jobs run inside a Flask app context.
+"""
+import os
+from apscheduler.schedulers.background import BackgroundScheduler
+
+scheduler = BackgroundScheduler(daemon=True, job_defaults={'coalesce': True, 'max_instances': 1})
+
+
+def add_app_job(app, func, job_id, trigger='interval', **trigger_args):
+    """Schedule func to run inside an app context"""
+    def run_in_app_context():
+        with app.app_context():
+            try:
+                func()
+            except Exception as e:
+                print(f"❌ Scheduled job '{job_id}' failed: {e}")
+
+    scheduler.add_job(
+        run_in_app_context,
+        trigger=trigger,
+        id=job_id,
+        replace_existing=True,
+        **trigger_args
+    )
+
+
+def register_jobs(app):
+    """All periodic jobs, in one place"""
+    from utils.maintenance import run_purge_jobs, auto_end_sessions
+    from utils.dashboard_stats import active_session_counter
+    from utils.token_revocation import token_revocation_store
+    from models.notification_counter import NotificationCounter
+    from utils.read_models import refresh_all
+
+    add_app_job(
+        app, run_purge_jobs, 'purge_expired_rows',
+        minutes=app.config.get('MAINTENANCE_INTERVAL_MINUTES', 60)
+    )
+    add_app_job(
+        app, token_revocation_store.purge_expired, 'purge_revoked_tokens',
+        minutes=app.config.get('MAINTENANCE_INTERVAL_MINUTES', 60)
+    )
+    add_app_job(
+        app, NotificationCounter.reconcile, 'reconcile_notification_counters',
+        minutes=app.config.get('NOTIFICATION_COUNTER_RECONCILE_MINUTES', 15)
+    )
+    add_app_job(
+        app, auto_end_sessions, 'auto_end_sessions',
+        minutes=app.config.get('AUTO_END_INTERVAL_MINUTES', 1)
+    )
+    add_app_job(
+        app, active_session_counter.reconcile, 'reconcile_active_sessions',
+        minutes=app.config.get('ACTIVE_SESSION_RECONCILE_MINUTES', 5)
+    )
+    add_app_job(
+        app, refresh_all, 'refresh_dashboard_read_models',
+        minutes=app.config.get('DASHBOARD_REFRESH_INTERVAL_MINUTES', 30)
+    )
+
+
+def init_scheduler(app):
+    """Register jobs and start the scheduler once per process"""
+    if not app.config.get('SCHEDULER_ENABLED', True):
+        print("ℹ️  Background scheduler disabled")
+        return
+
+    # With the debug reloader only the child process should run jobs
+    if app.debug and os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        return
+
+    register_jobs(app)
+
+    if not scheduler.running:
+        scheduler.start()
+        print("✅ Background scheduler started")
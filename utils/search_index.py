@@ -0,0 +1,322 @@
+"""
+Search helpers and in-memory prefix indexes for AttendEase typeahead
+A small character trie answers "codes starting with CEF3" without touching the
+database. The course-code index follows the reference-data cache: whenever the
+courses snapshot changes it applies only the added, removed and renamed rows.
+The optional student directory keeps one trie per department over matricle
+numbers and name words, rebuilt when the students table version moves.
+"""
+import re
+import threading
+import time
+from itertools import islice
+from sqlalchemy import text
+from app import db
+
+# Anything that can be the start of a UB course code: CEF, CEF3, EEF40, CIV101...
+COURSE_CODE_PREFIX = re.compile(r'^[A-Z]{1,3}\d{0,3}$')
+# Anything that can be the start of a UB FET matricle number: FE, FE22, FE22A2...
+MATRICLE_PREFIX = re.compile(r'^FE(\d{1,2}(A\d{0,3})?)?$')
+
+
+_trigram_available = None
+
+
+def trigram_available():
+    """True when pg_trgm is installed (checked once per process, then remembered)"""
+    global _trigram_available
+    if _trigram_available is not None:
+        return _trigram_available
+    if db.engine.dialect.name != 'postgresql':
+        return False
+    try:
+        _trigram_available = bool(db.session.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar())
+    except Exception:
+        db.session.rollback()
+        _trigram_available = False
+    if not _trigram_available:
+        print("ℹ️  pg_trgm not installed - text search falls back to ILIKE scans")
+    return _trigram_available
+
+
+def escape_like(term):
+    """term with LIKE wildcards escaped for use with escape='\\'"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def text_match(term, columns, prefix_columns=()):
+    """
+    (filter, rank) for a fuzzy match of term against columns.
+
+    With pg_trgm the filter is `col % term OR col ILIKE '%term%'` (both served by
+    the GIN trigram indexes) and rank is the best similarity(); elsewhere it is a
+    plain ILIKE and rank is None. prefix_columns also match `col ILIKE 'term%'`.
+    LIKE wildcards in term are matched literally.
+    """
+    pattern = escape_like(term)
+    conditions = [column.ilike(f'%{pattern}%', escape='\\') for column in columns]
+    conditions += [column.ilike(f'{pattern}%', escape='\\') for column in prefix_columns]
+    if not trigram_available():
+        return db.or_(*conditions), None
+    conditions += [column.op('%')(term) for column in columns]
+    ranks = [db.func.similarity(column, term) for column in columns]
+    rank = db.func.greatest(*ranks) if len(ranks) > 1 else ranks[0]
+    return db.or_(*conditions), rank
+
+
+class PrefixTrie:
+    """Maps string keys to sets of ids; prefix lookups return ids in key order"""
+
+    __slots__ = ('_root', '_size')
+
+    def __init__(self):
+        self._root = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, key, item_id):
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        ids = node.setdefault(None, set())  # None marks "a key ends here"
+        if item_id not in ids:
+            ids.add(item_id)
+            self._size += 1
+
+    def remove(self, key, item_id):
+        path = [self._root]
+        for char in key:
+            node = path[-1].get(char)
+            if node is None:
+                return False
+            path.append(node)
+        ids = path[-1].get(None)
+        if not ids or item_id not in ids:
+            return False
+        ids.discard(item_id)
+        self._size -= 1
+        if not ids:
+            del path[-1][None]
+        # Prune branches that no longer lead to any key
+        for depth in range(len(key), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][key[depth - 1]]
+        return True
+
+    def iter_prefix(self, prefix):
+        """Ids whose key starts with prefix, lazily, ordered by key"""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if None in node:
+                yield from sorted(node[None], key=str)
+            # Push children in reverse so the smallest character is visited first
+            stack.extend(node[char] for char in sorted((c for c in node if c is not None), reverse=True))
+
+    def search(self, prefix, limit=10):
+        """Up to `limit` ids whose key starts with prefix, ordered by key"""
+        return list(islice(self.iter_prefix(prefix), limit))
+
+
+class CourseCodeIndex:
+    """Course-code trie kept in step with reference_cache.courses"""
+
+    def __init__(self):
+        self._trie = PrefixTrie()
+        self._codes = {}  # course id -> indexed code
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.full_builds = 0
+        self.incremental_updates = 0
+
+    def _sync(self):
+        from utils.reference_cache import reference_cache
+        snapshot = reference_cache.courses.snapshot()
+        if snapshot is self._snapshot:
+            return snapshot
+        with self._lock:
+            if snapshot is self._snapshot:
+                return snapshot
+            wanted = {course_id: record.course_code.upper() for course_id, record in snapshot.by_id.items()}
+            if self._snapshot is None:
+                self.full_builds += 1
+            else:
+                self.incremental_updates += 1
+            for course_id, code in list(self._codes.items()):
+                if wanted.get(course_id) != code:
+                    self._trie.remove(code, course_id)
+                    del self._codes[course_id]
+            for course_id, code in wanted.items():
+                if course_id not in self._codes:
+                    self._trie.insert(code, course_id)
+                    self._codes[course_id] = code
+            self._snapshot = snapshot
+        return snapshot
+
+    def autocomplete(self, prefix, limit=10, active_only=True):
+        """Course records whose code starts with prefix (case-insensitive), in code order"""
+        prefix = (prefix or '').strip().upper()
+        snapshot = self._sync()
+        if not prefix:
+            return []
+        # _sync mutates the trie in place, so reads hold the same lock
+        with self._lock:
+            # Over-fetch a little so inactive courses can be skipped
+            ids = self._trie.search(prefix, limit * 2 if active_only else limit)
+        records = [snapshot.by_id[course_id] for course_id in ids if course_id in snapshot.by_id]
+        if active_only:
+            records = [record for record in records if record.is_active]
+        return records[:limit]
+
+    def get_stats(self):
+        return {
+            'codes': len(self._trie),
+            'full_builds': self.full_builds,
+            'incremental_updates': self.incremental_updates
+        }
+
+
+class DepartmentDirectory:
+    """Tries over one department's active students"""
+
+    __slots__ = ('entries', 'matricles', 'names', 'db_version', 'built_at')
+
+    def __init__(self, rows, db_version):
+        self.entries = {}
+        self.matricles = PrefixTrie()
+        self.names = PrefixTrie()
+        self.db_version = db_version
+        self.built_at = time.monotonic()
+        for row in rows:
+            entry = student_directory_entry(row)
+            self.entries[entry['id']] = entry
+            self.matricles.insert(entry['matricle_number'].upper(), entry['id'])
+            for word in set(entry['full_name'].lower().split()):
+                self.names.insert(word, entry['id'])
+
+    def search(self, term, limit):
+        words = term.lower().split()
+        found = []
+        if MATRICLE_PREFIX.match(term.upper()):
+            found.extend(self.matricles.search(term.upper(), limit))
+        if len(found) < limit and words:
+            matched = len(found)
+            seen = set(found)
+            # Candidates come from the first word; every other word must prefix some name word
+            for student_id in self.names.iter_prefix(words[0]):
+                if student_id in seen:
+                    continue
+                seen.add(student_id)
+                name_words = self.entries[student_id]['full_name'].lower().split()
+                if all(any(w.startswith(part) for w in name_words) for part in words[1:]):
+                    found.append(student_id)
+                    if len(found) >= limit:
+                        break
+            found[matched:] = sorted(found[matched:], key=lambda student_id: self.entries[student_id]['full_name'])
+        return [self.entries[student_id] for student_id in found]
+
+
+def student_directory_entry(row):
+    """The light student shape returned by directory search"""
+    return {
+        'id': str(row.id),
+        'matricle_number': row.matricle_number,
+        'full_name': row.full_name,
+        'department_id': str(row.department_id),
+        'level': row.level
+    }
+
+
+class StudentDirectoryIndex:
+    """
+    Optional per-department typeahead over students (STUDENT_SEARCH_INDEX_ENABLED).
+
+    A department's tries are built on first use with one query and dropped when
+    the students table version changes (checked every check_interval), after
+    max_age seconds, or when a route in this process calls invalidate().
+    The students version is only maintained while the directory is enabled.
+    """
+
+    def __init__(self, enabled=False, check_interval=30, max_age=300):
+        self.enabled = enabled
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._departments = {}
+        self._db_version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def init_app(self, app):
+        self.enabled = app.config.get('STUDENT_SEARCH_INDEX_ENABLED', False)
+        self.check_interval = app.config.get('STUDENT_SEARCH_INDEX_CHECK_SECONDS', 30)
+        self.max_age = app.config.get('STUDENT_SEARCH_INDEX_MAX_AGE_SECONDS', 300)
+        if self.enabled:
+            # Versioning students serializes their writes on one table_versions row, so opt in
+            from utils.http_cache import track_tables
+            track_tables('students')
+        app.extensions['student_directory'] = self
+
+    def _current_version(self):
+        now = time.monotonic()
+        if self._db_version is None or now - self._checked_at > self.check_interval:
+            from models.table_version import TableVersion
+            self._db_version = TableVersion.get_versions(['students'])['students']
+            self._checked_at = now
+        return self._db_version
+
+    def _directory(self, department_id):
+        version = self._current_version()
+        directory = self._departments.get(department_id)
+        if (directory is not None and directory.db_version == version
+                and time.monotonic() - directory.built_at <= self.max_age):
+            return directory
+        from models.student import Student
+        from models.user import User
+        rows = db.session.query(
+            Student.id, Student.matricle_number, Student.full_name, Student.department_id, Student.level
+        ).join(User, User.id == Student.user_id).filter(
+            Student.department_id == department_id,
+            User.is_active == True
+        ).all()
+        directory = DepartmentDirectory(rows, version)
+        with self._lock:
+            self._departments[department_id] = directory
+            self.builds += 1
+        return directory
+
+    def search(self, department_id, term, limit=20):
+        """Light student dicts matching term in one department, or None when the index is disabled"""
+        if not self.enabled:
+            return None
+        return self._directory(str(department_id)).search(term.strip(), limit)
+
+    def invalidate(self, department_id=None):
+        """Call after committing student or user-activation changes"""
+        with self._lock:
+            if department_id is None:
+                self._departments.clear()
+            else:
+                self._departments.pop(str(department_id), None)
+
+    def get_stats(self):
+        return {
+            'enabled': self.enabled,
+            'departments': len(self._departments),
+            'students': sum(len(d.entries) for d in self._departments.values()),
+            'builds': self.builds
+        }
+
+
+course_code_index = CourseCodeIndex()
+student_directory = StudentDirectoryIndex()
@@ -0,0 +1,185 @@
+"""
+Set-based semester rollover for AttendEase
+Clones course assignments, and optionally enrollments, from a source semester
+into a target semester. Each table takes one INSERT ... SELECT ... ON CONFLICT
+DO NOTHING, and everything runs in a single transaction. A dry run issues only
+the count queries of the same selections, so its preview matches what a real
+run would insert.
+
+What is copied:
+- active assignments whose lecturer and course are still active. The geofence
+  area is kept only while it is active.
+- 'enrolled' enrollments of active students in active courses.
+Rows already present in the target semester are counted and left alone.
+"""
+from datetime import datetime
+from sqlalchemy import select, func, case, literal, true, null
+from app import db
+from models import enrollment_status_enum
+
+
+def _new_uuid():
+    """Server-side UUID matching how each backend stores UUID columns"""
+    if db.engine.dialect.name == 'postgresql':
+        return func.uuid_generate_v4()
+    return func.lower(func.hex(func.randomblob(16)))
+
+
+def _dialect_insert():
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _count(selection):
+    return db.session.execute(select(func.count()).select_from(selection.subquery())).scalar()
+
+
+def _assignment_selections(source_id, target_id, course_ids=None, assignment_ids=None):
+    """(all matching source rows, eligible rows, eligible rows missing from the target)"""
+    from models.course_assignment import CourseAssignment
+    from models.lecturer import Lecturer
+    from models.course import Course
+    from models.geofence_area import GeofenceArea
+    assignments = CourseAssignment.__table__
+    lecturers = Lecturer.__table__
+    courses = Course.__table__
+    geofences = GeofenceArea.__table__
+    existing = assignments.alias('existing')
+
+    matching = select(assignments.c.id).where(
+        assignments.c.semester_id == source_id,
+        assignments.c.is_active == true()
+    )
+    if course_ids is not None:
+        matching = matching.where(assignments.c.course_id.in_(course_ids))
+    if assignment_ids is not None:
+        matching = matching.where(assignments.c.id.in_(assignment_ids))
+
+    eligible = matching.join(lecturers, lecturers.c.id == assignments.c.lecturer_id).join(
+        courses, courses.c.id == assignments.c.course_id
+    ).where(lecturers.c.is_active == true(), courses.c.is_active == true())
+
+    missing = eligible.outerjoin(geofences, geofences.c.id == assignments.c.geofence_area_id).where(
+        ~select(literal(1)).where(
+            existing.c.lecturer_id == assignments.c.lecturer_id,
+            existing.c.course_id == assignments.c.course_id,
+            existing.c.semester_id == target_id
+        ).exists()
+    ).with_only_columns(
+        assignments.c.lecturer_id,
+        assignments.c.course_id,
+        case((geofences.c.is_active == true(), assignments.c.geofence_area_id), else_=null())
+    )
+    return matching, eligible, missing
+
+
+def _enrollment_selections(source_id, target_id, course_ids=None, assignment_ids=None):
+    """(all matching source rows, eligible rows, eligible rows missing from the target)"""
+    from models.student_enrollment import StudentEnrollment
+    from models.course_assignment import CourseAssignment
+    from models.student import Student
+    from models.user import User
+    from models.course import Course
+    enrollments = StudentEnrollment.__table__
+    students = Student.__table__
+    users = User.__table__
+    courses = Course.__table__
+    existing = enrollments.alias('existing')
+
+    matching = select(enrollments.c.id).where(
+        enrollments.c.semester_id == source_id,
+        enrollments.c.enrollment_status == 'enrolled'
+    )
+    if course_ids is not None:
+        matching = matching.where(enrollments.c.course_id.in_(course_ids))
+    if assignment_ids is not None:
+        # Only the courses of the selected assignments
+        assignments = CourseAssignment.__table__
+        matching = matching.where(enrollments.c.course_id.in_(
+            select(assignments.c.course_id).where(assignments.c.id.in_(assignment_ids))
+        ))
+
+    eligible = matching.join(students, students.c.id == enrollments.c.student_id).join(
+        users, users.c.id == students.c.user_id
+    ).join(courses, courses.c.id == enrollments.c.course_id).where(
+        users.c.is_active == true(), courses.c.is_active == true()
+    )
+
+    missing = eligible.where(
+        ~select(literal(1)).where(
+            existing.c.student_id == enrollments.c.student_id,
+            existing.c.course_id == enrollments.c.course_id,
+            existing.c.semester_id == target_id
+        ).exists()
+    ).with_only_columns(enrollments.c.student_id, enrollments.c.course_id)
+    return matching, eligible, missing
+
+
+def _clone(table, columns, selections, extra_values, dry_run):
+    """INSERT ... SELECT the missing rows (or just count them) and summarise the selection"""
+    matching, eligible, missing = selections
+    if dry_run:
+        created = _count(missing)
+    else:
+        rows = missing.with_only_columns(_new_uuid(), *missing.selected_columns, *extra_values)
+        created = len(db.session.execute(
+            _dialect_insert()(table).from_select(columns, rows).on_conflict_do_nothing().returning(table.c.id)
+        ).all())
+    matching_count, eligible_count = _count(matching), _count(eligible)
+    return {
+        'source_rows': matching_count,
+        'skipped_inactive': matching_count - eligible_count,
+        'already_in_target': eligible_count - created,
+        ('to_create' if dry_run else 'created'): created
+    }
+
+
+def rollover_semester(source, target, assigned_by, enrolled_by=None, course_ids=None,
+                      assignment_ids=None, include_enrollments=False, dry_run=False):
+    """
+    Clone assignments (and enrollments) from `source` into `target` semester.
+
+    assigned_by is the admins.id recorded on new assignments and enrolled_by
+    the users.id recorded on new enrollments. course_ids and assignment_ids
+    narrow the selection; an empty list selects nothing. Commits on success,
+    or rolls back for a dry run or on error. Returns the per-table counts.
+    """
+    from models.course_assignment import CourseAssignment
+    from models.student_enrollment import StudentEnrollment
+    now = datetime.utcnow()
+    source_id, target_id = source.id, target.id
+    result = {
+        'source_semester_id': str(source_id),
+        'target_semester_id': str(target_id),
+        'dry_run': dry_run
+    }
+
+    try:
+        result['course_assignments'] = _clone(
+            CourseAssignment.__table__,
+            ['id', 'lecturer_id', 'course_id', 'geofence_area_id', 'semester_id', 'assigned_by', 'assigned_at', 'is_active'],
+            _assignment_selections(source_id, target_id, course_ids, assignment_ids),
+            [literal(target_id), literal(assigned_by), literal(now), true()],
+            dry_run
+        )
+        if include_enrollments:
+            result['student_enrollments'] = _clone(
+                StudentEnrollment.__table__,
+                ['id', 'student_id', 'course_id', 'semester_id', 'enrollment_date', 'enrollment_status', 'enrolled_by'],
+                _enrollment_selections(source_id, target_id, course_ids, assignment_ids),
+                [literal(target_id), literal(now), literal('enrolled', enrollment_status_enum), literal(enrolled_by)],
+                dry_run
+            )
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return result
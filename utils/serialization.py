@@ -0,0 +1,169 @@
+"""
+Fast serialization for AttendEase
+RowSerializer compiles a column list into one generated function. The function
+turns a plain row tuple from select() straight into a JSON-ready dict, so large
+listings skip ORM hydration, the identity map and per-field to_dict() calls.
+OrjsonProvider swaps Flask's json module for orjson when it is installed. Its
+responses match the default provider's bytes: sorted keys, ensure_ascii
+escapes, HTTP dates for raw datetimes, str for Decimal and UUID. The one
+difference is that NaN and Infinity are written as null instead of the
+non-standard NaN/Infinity tokens.
+"""
+import re
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+from sqlalchemy.sql import sqltypes
+from app import db
+
+
+def _conversion(sqltype, name):
+    """Python expression converting the non-null variable `name` of column type `sqltype`"""
+    if isinstance(sqltype, sqltypes.Uuid):
+        return f'str({name})'
+    if isinstance(sqltype, (sqltypes.DateTime, sqltypes.Date, sqltypes.Time)):
+        return f'{name}.isoformat()'
+    if isinstance(sqltype, sqltypes.Numeric) and not isinstance(sqltype, sqltypes.Float):
+        return f'float({name})'
+    return None
+
+
+def _compile(keys, types):
+    lines = ['def serialize(row):']
+    names = [f'v{i}' for i in range(len(keys))]
+    lines.append(f"    {', '.join(names)}{',' if len(names) == 1 else ''} = row")
+    lines.append('    return {')
+    for key, sqltype, name in zip(keys, types, names):
+        conversion = _conversion(sqltype, name)
+        value = name if conversion is None else f'None if {name} is None else {conversion}'
+        lines.append(f'        {key!r}: {value},')
+    lines.append('    }')
+    source = '\n'.join(lines)
+
+    namespace = {}
+    exec(compile(source, f'<serializer {", ".join(keys)}>', 'exec'), namespace)
+    return source, namespace['serialize']
+
+
+class RowSerializer:
+    """
+    Serializer for rows of `columns` (table columns or labelled expressions).
+
+    Use select() to build the matching statement, add filters and ordering,
+    then all(statement) or many(rows). Output keys are the column keys.
+    """
+
+    def __init__(self, *columns):
+        self.columns = columns
+        self.keys = tuple(column.key for column in columns)
+        self.source, self._serialize = _compile(self.keys, [column.type for column in columns])
+
+    def select(self):
+        return select(*self.columns)
+
+    def __call__(self, row):
+        return self._serialize(row)
+
+    def many(self, rows):
+        return list(map(self._serialize, rows))
+
+    def all(self, statement):
+        """Execute `statement` (from select()) and serialize every row"""
+        return self.many(db.session.execute(statement))
+
+
+_model_serializers = {}
+
+
+def model_serializer(model, exclude=()):
+    """Shared RowSerializer over every column of `model` except `exclude`"""
+    cache_key = (model, tuple(exclude))
+    serializer = _model_serializers.get(cache_key)
+    if serializer is None:
+        serializer = RowSerializer(*[column for column in model.__table__.columns if column.key not in exclude])
+        _model_serializers[cache_key] = serializer
+    return serializer
+
+
+_NON_ASCII = re.compile('[^\x00-\x7f]')
+# 19+ digit runs may not fit 64 bits; orjson would read such integers as floats
+_WIDE_NUMBER = re.compile(r'\d{19,}')
+_WIDE_NUMBER_BYTES = re.compile(rb'\d{19,}')
+
+
+def _escape_non_ascii(match):
+    """\\uXXXX escape (surrogate pair above the BMP), as json.dumps(ensure_ascii=True) writes it"""
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return '\\u{:04x}\\u{:04x}'.format(0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+    return '\\u{:04x}'.format(code)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Calls with json.dumps/json.loads keyword arguments, values orjson
+    rejects (such as integers beyond 64 bits) and documents with 19+ digit
+    numbers, which orjson would load as floats, go through the default
+    provider instead. orjson always writes UTF-8, so with ensure_ascii (the
+    Flask default) non-ASCII characters are escaped afterwards. Only
+    documents that contain them pay for that pass. dumps() output is
+    compact, without the spaces after separators that json.dumps adds.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        import orjson  # Optional dependency, only needed for the fast provider
+        self._orjson = orjson
+
+    def _options(self, indent=False):
+        orjson = self._orjson
+        # Datetimes go through default() so they keep Flask's HTTP date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _encode(self, obj, indent=False):
+        body = self._orjson.dumps(obj, default=self.default, option=self._options(indent))
+        if self.ensure_ascii and not body.isascii():
+            # Non-ASCII bytes only occur inside JSON strings, so escaping the whole document is safe
+            body = _NON_ASCII.sub(_escape_non_ascii, body.decode('utf-8')).encode('ascii')
+        return body
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._encode(obj).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        wide_number = _WIDE_NUMBER if isinstance(s, str) else _WIDE_NUMBER_BYTES
+        if kwargs or wide_number.search(s):
+            return super().loads(s, **kwargs)
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        try:
+            body = self._encode(obj, indent) + b'\n'
+        except TypeError:
+            return super().response(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Install OrjsonProvider when JSON_PROVIDER is 'orjson' and orjson is importable"""
+    if app.config.get('JSON_PROVIDER', 'orjson') != 'orjson':
+        return
+    try:
+        app.json = OrjsonProvider(app)
+        print("✅ orjson JSON provider enabled")
+    except ImportError:
+        print("ℹ️  orjson not installed, using Flask's default JSON provider")
@@ -0,0 +1,136 @@
+"""
+In-process cache of SystemSetting for AttendEase
+The whole settings table is small, so it is loaded in one query into an
+immutable snapshot whose values are already parsed by setting_type. Writes in
+this process bump the local version and drop the snapshot at once; writes made
+by other workers are picked up through the shared table_versions row, checked
+at most every SETTINGS_CACHE_CHECK_SECONDS.
+"""
+import json
+import threading
+import time
+from collections import namedtuple
+
+CachedSetting = namedtuple('CachedSetting', ['key', 'value', 'raw', 'setting_type', 'is_public', 'data'])
+
+
+def parse_setting_value(raw, setting_type):
+    """Typed value for a stored string; unparseable values are returned as-is"""
+    if raw is None:
+        return None
+    try:
+        if setting_type == 'number':
+            number = float(raw)
+            return int(number) if number.is_integer() else number
+        if setting_type == 'boolean':
+            return str(raw).strip().lower() == 'true'
+        if setting_type == 'json':
+            return json.loads(raw)
+    except (ValueError, TypeError):
+        pass
+    return raw
+
+
+class SettingsSnapshot:
+    """One immutable view of the settings table"""
+
+    def __init__(self, rows, version, db_version):
+        self.version = version
+        self.db_version = db_version
+        self.by_key = {
+            row.setting_key: CachedSetting(
+                key=row.setting_key,
+                value=parse_setting_value(row.setting_value, row.setting_type),
+                raw=row.setting_value,
+                setting_type=row.setting_type,
+                is_public=bool(row.is_public),
+                data=row.to_dict()
+            )
+            for row in rows
+        }
+        self.public = tuple(s.data for s in self.by_key.values() if s.is_public)
+        self.all = tuple(s.data for s in self.by_key.values())
+
+
+class SettingsCache:
+    """Typed, versioned settings lookups without a query per call"""
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._version = 0
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def init_app(self, app):
+        self.check_interval = app.config.get('SETTINGS_CACHE_CHECK_SECONDS', 5)
+        app.extensions['settings_cache'] = self
+
+    @staticmethod
+    def _db_version():
+        from models.table_version import TableVersion
+        return TableVersion.get_versions(['system_settings'])['system_settings']
+
+    def _load(self):
+        from models.system_setting import SystemSetting
+        # Taken before the query: a bump() during it leaves this snapshot stale, not current
+        version = self._version
+        db_version = self._db_version()
+        rows = SystemSetting.query.all()
+        snapshot = SettingsSnapshot(rows, version, db_version)
+        with self._lock:
+            # A slower concurrent load must not replace a snapshot taken after a later bump()
+            if self._snapshot is None or self._snapshot.version <= version:
+                self._snapshot = snapshot
+                self._checked_at = time.monotonic()
+            self.loads += 1
+        return snapshot
+
+    def snapshot(self):
+        """Current snapshot, reloading if this process wrote or another worker's write is visible"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._version:
+            return self._load()
+        if time.monotonic() - self._checked_at > self.check_interval:
+            self._checked_at = time.monotonic()
+            if self._db_version() != snapshot.db_version:
+                return self._load()
+        self.hits += 1
+        return snapshot
+
+    @property
+    def version(self):
+        snapshot = self.snapshot()
+        return (snapshot.version, snapshot.db_version)
+
+    def get(self, key, default=None):
+        """Parsed value of a setting (int/float, bool, decoded JSON or str)"""
+        setting = self.snapshot().by_key.get(key)
+        return setting.value if setting is not None else default
+
+    def get_setting(self, key):
+        return self.snapshot().by_key.get(key)
+
+    def get_many(self, keys, defaults=None):
+        by_key = self.snapshot().by_key
+        defaults = defaults or {}
+        return {key: by_key[key].value if key in by_key else defaults.get(key) for key in keys}
+
+    def public_settings(self):
+        return list(self.snapshot().public)
+
+    def all_settings(self):
+        return list(self.snapshot().all)
+
+    def bump(self):
+        """Call after committing a settings write"""
+        with self._lock:
+            self._version += 1
+
+    def get_stats(self):
+        return {'version': self._version, 'hits': self.hits, 'loads': self.loads}
+
+
+settings_cache = SettingsCache()
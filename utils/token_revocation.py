@@ -0,0 +1,185 @@
+"""
+JWT revocation store for AttendEase
+Revoked token ids (jti) are kept until the token would have expired anyway.
+A Bloom filter sits in front of the map so checking a token that was never
+revoked - the common case - touches neither the map nor any shared backend.
+"""
+import hashlib
+import math
+import threading
+import time
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives, tunable false positives)"""
+
+    def __init__(self, capacity=100000, error_rate=0.01):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / self.capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key):
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RedisRevocationBackend:
+    """
+    Shares revocations between workers through Redis.
+
+    `attendease:revoked` maps jti -> expiry, `attendease:revoked_log` orders the
+    same members by revocation time so workers can pull only what is new.
+    """
+
+    def __init__(self, url, prefix='attendease:'):
+        import redis  # Optional dependency, only needed for shared revocation
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.expiry_key = prefix + 'revoked'
+        self.log_key = prefix + 'revoked_log'
+
+    def add(self, jti, expires_at, revoked_at):
+        member = f"{jti}|{expires_at}"
+        pipe = self.client.pipeline()
+        pipe.zadd(self.expiry_key, {member: expires_at})
+        pipe.zadd(self.log_key, {member: revoked_at})
+        pipe.execute()
+
+    def changes_since(self, since):
+        """[(jti, expires_at, revoked_at)] revoked after `since`"""
+        rows = self.client.zrangebyscore(self.log_key, f"({since}", '+inf', withscores=True)
+        changes = []
+        for member, revoked_at in rows:
+            jti, _, expires_at = member.rpartition('|')
+            changes.append((jti, float(expires_at), revoked_at))
+        return changes
+
+    def purge(self, now):
+        expired = self.client.zrangebyscore(self.expiry_key, '-inf', now)
+        if expired:
+            pipe = self.client.pipeline()
+            pipe.zrem(self.expiry_key, *expired)
+            pipe.zrem(self.log_key, *expired)
+            pipe.execute()
+        return len(expired)
+
+
+class TokenRevocationStore:
+    """In-process jti -> expiry map with a Bloom filter front and optional shared backend"""
+
+    def __init__(self, capacity=100000, backend=None, sync_interval=5):
+        self.capacity = capacity
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self._revoked = {}
+        self._bloom = BloomFilter(capacity)
+        self._lock = threading.Lock()
+        self._last_sync = 0.0
+        self._last_sync_check = 0.0
+
+    def init_app(self, app, jwt_manager=None):
+        """Configure from app config and register the flask_jwt_extended blocklist check"""
+        self.capacity = app.config.get('TOKEN_REVOCATION_CAPACITY', 100000)
+        self.sync_interval = app.config.get('TOKEN_REVOCATION_SYNC_SECONDS', 5)
+        self._bloom = BloomFilter(self.capacity)
+
+        backend_url = app.config.get('TOKEN_REVOCATION_BACKEND_URL', '')
+        if backend_url.startswith(('redis://', 'rediss://')):
+            try:
+                self.backend = RedisRevocationBackend(backend_url)
+            except Exception as e:
+                print(f"⚠️  Token revocation backend unavailable ({e}) - using in-process store only")
+
+        if jwt_manager is not None:
+            @jwt_manager.token_in_blocklist_loader
+            def check_if_token_revoked(jwt_header, jwt_payload):
+                return self.is_revoked(jwt_payload.get('jti'))
+
+        app.extensions['token_revocation_store'] = self
+
+    def revoke(self, jti, expires_at):
+        """Revoke a token id until `expires_at` (unix timestamp)"""
+        if not jti:
+            return
+        expires_at = float(expires_at)
+        with self._lock:
+            self._revoked[jti] = expires_at
+            self._bloom.add(jti)
+        if self.backend is not None:
+            try:
+                self.backend.add(jti, expires_at, time.time())
+            except Exception as e:
+                print(f"⚠️  Could not share token revocation: {e}")
+
+    def is_revoked(self, jti):
+        """O(1) revocation check; never-revoked tokens stop at the Bloom filter"""
+        if not jti:
+            return False
+
+        if self.backend is not None:
+            self._maybe_sync()
+
+        if jti not in self._bloom:
+            return False
+
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False  # Bloom false positive
+        if expires_at <= time.time():
+            with self._lock:
+                self._revoked.pop(jti, None)
+            return False
+        return True
+
+    def _maybe_sync(self):
+        """Pull revocations made by other workers, at most every sync_interval seconds"""
+        now = time.monotonic()
+        if now - self._last_sync_check < self.sync_interval:
+            return
+        self._last_sync_check = now
+        try:
+            changes = self.backend.changes_since(self._last_sync)
+        except Exception as e:
+            print(f"⚠️  Token revocation sync failed: {e}")
+            return
+        with self._lock:
+            for jti, expires_at, revoked_at in changes:
+                self._revoked[jti] = expires_at
+                self._bloom.add(jti)
+                self._last_sync = max(self._last_sync, revoked_at)
+
+    def purge_expired(self):
+        """Drop expired entries and rebuild the Bloom filter from what is left"""
+        now = time.time()
+        with self._lock:
+            live = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+            removed = len(self._revoked) - len(live)
+            bloom = BloomFilter(max(self.capacity, len(live) * 2))
+            for jti in live:
+                bloom.add(jti)
+            self._revoked = live
+            self._bloom = bloom
+        if self.backend is not None:
+            try:
+                self.backend.purge(now)
+            except Exception as e:
+                print(f"⚠️  Could not purge shared token revocations: {e}")
+        return removed
+
+    def size(self):
+        return len(self._revoked)
+
+
+token_revocation_store = TokenRevocationStore()
@@ -6,37 +6,42 @@ import re
 from datetime import datetime
 from utils.validators import ValidationError
 
-def validate_ub_matricle_number(matricle_number):
+# Compiled once at import; bulk imports validate thousands of rows against these
+UB_MATRICLE_PATTERN = re.compile(r'^FE\d{2}A\d{3}$')
+UB_LECTURER_EMAIL_PATTERN = re.compile(r'^[a-zA-Z]+\.[a-zA-Z]+@ubuea\.cm$')
+UB_COURSE_CODE_PATTERN = re.compile(r'^(CEF|EEF|CIV|MEF)(\d{3})$')
+GENERAL_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+def check_ub_matricle_number(matricle_number, current_year=None):
     """
-    Validate UB FET matricle number format: FE22A220
-    Format: FE + 2-digit year + A + 3-digit number
+    Error message for an invalid UB FET matricle number, or None if it is valid.
+    Same rules as validate_ub_matricle_number without raising, for row-by-row imports.
     """
     if not matricle_number:
-        raise ValidationError("Matricle number is required", "matricle_number")
+        return "Matricle number is required"
     
     # UB FET matricle pattern: FE + 2 digits + A + 3 digits
-    pattern = r'^FE\d{2}A\d{3}$'
-    
-    if not re.match(pattern, matricle_number.upper()):
-        raise ValidationError(
-            "Invalid matricle number format. Expected format: FE22A220 (FE + 2-digit year + A + 3-digit number)",
-            "matricle_number"
-        )
+    if not UB_MATRICLE_PATTERN.match(matricle_number.upper()):
+        return "Invalid matricle number format. Expected format: FE22A220 (FE + 2-digit year + A + 3-digit number)"
     
-    # Extract year from matricle number
+    # Validate year is reasonable (not more than 10 years in future or 20 years in past)
     year_part = matricle_number[2:4]
-    try:
-        year = int(year_part)
+    year = int(year_part)
+    if current_year is None:
         current_year = datetime.now().year % 100  # Get last 2 digits of current year
-        
-        # Validate year is reasonable (not more than 10 years in future or 20 years in past)
-        if year > current_year + 10 or year < current_year - 20:
-            raise ValidationError(
-                f"Invalid year in matricle number. Year '{year_part}' seems unrealistic",
-                "matricle_number"
-            )
-    except ValueError:
-        raise ValidationError("Invalid year format in matricle number", "matricle_number")
+    if year > current_year + 10 or year < current_year - 20:
+        return f"Invalid year in matricle number. Year '{year_part}' seems unrealistic"
+    
+    return None
+
+def validate_ub_matricle_number(matricle_number):
+    """
+    Validate UB FET matricle number format: FE22A220
+    Format: FE + 2-digit year + A + 3-digit number
+    """
+    error = check_ub_matricle_number(matricle_number)
+    if error:
+        raise ValidationError(error, "matricle_number")
 
 def validate_ub_course_code(course_code, department_code=None):
     """
@@ -51,8 +56,7 @@ def validate_ub_course_code(course_code, department_code=None):
     valid_prefixes = ['CEF', 'EEF', 'CIV', 'MEF']
     
     # Course code pattern: 3-letter prefix + 3-digit number
-    pattern = r'^(CEF|EEF|CIV|MEF)(\d{3})$'
-    match = re.match(pattern, course_code.upper())
+    match = UB_COURSE_CODE_PATTERN.match(course_code.upper())
     
     if not match:
         raise ValidationError(
@@ -84,22 +88,39 @@ def validate_ub_course_code(course_code, department_code=None):
         'level': str((number_int // 100) * 100)  # 200, 300, 400, 500
     }
 
-def validate_ub_lecturer_email(email):
+def check_email_by_user_type(email, user_type):
     """
-    Validate University of Buea lecturer institutional email
-    LECTURERS ONLY: Must use firstname.lastname@ubuea.cm format
+    Error message for an email that is invalid for the user type, or None if it is valid.
+    Same rules as validate_email_by_user_type without raising, for row-by-row imports.
     """
     if not email:
-        raise ValidationError("Email is required", "email")
+        return "Email is required"
     
-    # UB institutional email pattern for LECTURERS
-    ub_pattern = r'^[a-zA-Z]+\.[a-zA-Z]+@ubuea\.cm$'
+    email = email.lower()
+    if user_type == 'lecturer':
+        # UB institutional email pattern for LECTURERS
+        if not UB_LECTURER_EMAIL_PATTERN.match(email):
+            return "Invalid UB lecturer email format. Expected: firstname.lastname@ubuea.cm"
+        return None
     
-    if not re.match(ub_pattern, email.lower()):
-        raise ValidationError(
-            "Invalid UB lecturer email format. Expected: firstname.lastname@ubuea.cm",
-            "email"
-        )
+    # General email validation for students, admins and others
+    if not GENERAL_EMAIL_PATTERN.match(email):
+        return "Invalid email format"
+    
+    # Students use personal emails since institutional emails are not active
+    if user_type == 'student' and '@ubuea.cm' in email:
+        return "Students should use personal emails. UB institutional emails are not active for students."
+    
+    return None
+
+def validate_ub_lecturer_email(email):
+    """
+    Validate University of Buea lecturer institutional email
+    LECTURERS ONLY: Must use firstname.lastname@ubuea.cm format
+    """
+    error = check_email_by_user_type(email, 'lecturer')
+    if error:
+        raise ValidationError(error, "email")
     
     return True
 
@@ -108,21 +129,9 @@ def validate_ub_student_email(email):
     Validate student email - can be any valid email format
     STUDENTS: Use personal emails since institutional emails are not active
     """
-    if not email:
-        raise ValidationError("Email is required", "email")
-    
-    # General email validation for students
-    general_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(general_pattern, email.lower()):
-        raise ValidationError("Invalid email format", "email")
-    
-    # Optional: Warn if student tries to use institutional email
-    if '@ubuea.cm' in email.lower():
-        raise ValidationError(
-            "Students should use personal emails. UB institutional emails are not active for students.",
-            "email"
-        )
+    error = check_email_by_user_type(email, 'student')
+    if error:
+        raise ValidationError(error, "email")
     
     return True
 
@@ -133,16 +142,10 @@ def validate_email_by_user_type(email, user_type):
     - Students: Must use personal email (not @ubuea.cm)
     - Admins: Any valid email format
     """
-    if user_type == 'lecturer':
-        return validate_ub_lecturer_email(email)
-    elif user_type == 'student':
-        return validate_ub_student_email(email)
-    else:  # admin or other
-        # General email validation
-        general_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(general_pattern, email.lower()):
-            raise ValidationError("Invalid email format", "email")
-        return True
+    error = check_email_by_user_type(email, user_type)
+    if error:
+        raise ValidationError(error, "email")
+    return True
 
 def get_department_from_course_code(course_code):
     """
@@ -32,7 +32,7 @@ def initialize_database():
             # Create default admin user if it doesn't exist
             from models.user import User
             from models.admin import Admin
-            from app import bcrypt
+            from utils.password_hasher import password_hasher
             
             admin_user = User.query.filter_by(email='admin@attendease.com').first()
             
@@ -40,7 +40,7 @@ def initialize_database():
                 # Create admin user
                 admin_user = User(
                     email='admin@attendease.com',
-                    password_hash=bcrypt.generate_password_hash('AdminPass123').decode('utf-8'),
+                    password_hash=password_hasher.hash_password('AdminPass123'),
                     user_type='admin',
                     email_verified=True
                 )